@@ -0,0 +1,212 @@
+"""
+Streaming export service for cards and item listings.
+
+Rows are written to disk one at a time from a snapshot of the cards being exported, so
+exports can run on a worker thread without building the full output in memory. Output can
+be gzip or zstd compressed (picked from the file extension), and JSON can be written
+pretty-printed, compact, or as newline-delimited JSON (one card per line).
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# zstd output needs the optional zstandard package
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+JSON_MODES = ('pretty', 'compact', 'ndjson')
+
+# How often (in rows) progress is reported and cancellation is checked
+PROGRESS_INTERVAL = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when the caller asked it to stop."""
+
+
+@dataclass
+class ExportStats:
+    """Outcome of a finished export."""
+    path: str
+    rows: int
+    bytes_written: int
+    seconds: float
+    compression: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    @property
+    def megabytes_per_second(self) -> float:
+        mb = self.bytes_written / (1024 * 1024)
+        return mb / self.seconds if self.seconds > 0 else mb
+
+    def summary(self) -> str:
+        return (f"{self.rows} rows, {self.bytes_written / 1024:.0f} KiB in {self.seconds:.2f}s "
+                f"({self.rows_per_second:,.0f} rows/s)")
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Return 'gzip', 'zstd' or None based on the file extension."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def base_extension(path: str) -> str:
+    """Return the extension of `path` ignoring any compression suffix, e.g. '.csv' for 'cards.csv.gz'."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION_EXTENSIONS:
+        root, ext = os.path.splitext(root)
+    return ext.lower()
+
+
+def _open_text_output(path: str, compression: Optional[str]):
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd export requires the 'zstandard' package (pip install zstandard).")
+        raw = open(path, 'wb')
+        writer = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding='utf-8', newline='')
+    if compression is not None:
+        raise ValueError(f"Unknown compression: {compression}")
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _run_export(path: str, total: int, write: Callable[[Any, Callable[[int], None]], int],
+                compression: Optional[str] = None,
+                progress: Optional[Callable[[int, int], None]] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> ExportStats:
+    """
+    Open `path` (via a temp file that is renamed into place on success), call
+    write(fp, tick) and return ExportStats. tick(rows_done) reports progress and raises
+    ExportCancelled when the caller has asked to stop.
+    """
+    if compression is None:
+        compression = detect_compression(path)
+    start = time.perf_counter()
+    tmp_path = path + '.part'
+
+    def tick(done):
+        if is_cancelled is not None and is_cancelled():
+            raise ExportCancelled()
+        if progress is not None:
+            progress(done, total)
+
+    try:
+        with _open_text_output(tmp_path, compression) as fp:
+            rows = write(fp, tick)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if progress is not None:
+        progress(total, total)
+    return ExportStats(path=path, rows=rows, bytes_written=os.path.getsize(path),
+                       seconds=time.perf_counter() - start, compression=compression)
+
+
+def export_cards_csv(path: str, cards: List[Dict[str, Any]], columns: List[str], **kwargs) -> ExportStats:
+    """Stream cards to CSV with the given columns, in order."""
+    cards = list(cards)
+
+    def write(fp, tick):
+        writer = csv.writer(fp)
+        writer.writerow(columns)
+        for i, card in enumerate(cards, 1):
+            writer.writerow([card.get(col, "") for col in columns])
+            if i % PROGRESS_INTERVAL == 0:
+                tick(i)
+        return len(cards)
+
+    return _run_export(path, len(cards), write, **kwargs)
+
+
+def export_cards_json(path: str, cards: List[Dict[str, Any]], mode: str = 'pretty', **kwargs) -> ExportStats:
+    """
+    Stream cards to JSON. mode is 'pretty' (indent=2, as saved inventories), 'compact'
+    (a single-line array) or 'ndjson' (one card object per line).
+    """
+    if mode not in JSON_MODES:
+        raise ValueError(f"Unknown JSON mode: {mode}")
+    cards = list(cards)
+    if mode == 'pretty':
+        encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def write(fp, tick):
+        if mode == 'ndjson':
+            for i, card in enumerate(cards, 1):
+                fp.write(encode(dict(card)))
+                fp.write('\n')
+                if i % PROGRESS_INTERVAL == 0:
+                    tick(i)
+            return len(cards)
+        sep = ',\n' if mode == 'pretty' else ','
+        fp.write('[\n' if mode == 'pretty' and cards else '[')
+        for i, card in enumerate(cards, 1):
+            if i > 1:
+                fp.write(sep)
+            text = encode(dict(card))
+            if mode == 'pretty':
+                text = '  ' + text.replace('\n', '\n  ')
+            fp.write(text)
+            if i % PROGRESS_INTERVAL == 0:
+                tick(i)
+        fp.write('\n]' if mode == 'pretty' and cards else ']')
+        return len(cards)
+
+    return _run_export(path, len(cards), write, **kwargs)
+
+
+def export_listings(path: str, cards: List[Dict[str, Any]],
+                    make_listing: Callable[[Dict[str, Any]], Tuple[str, str]],
+                    filetype: str = 'csv', **kwargs) -> ExportStats:
+    """Stream Title/Description item listings, built per card by make_listing(card)."""
+    cards = list(cards)
+
+    def write(fp, tick):
+        if filetype == 'csv':
+            writer = csv.writer(fp)
+            writer.writerow(["Title", "Description"])
+        for i, card in enumerate(cards, 1):
+            title, desc = make_listing(card)
+            if filetype == 'csv':
+                writer.writerow([title, desc])
+            else:
+                fp.write(f"Listing {i}: {title}\n{desc}\n\n")
+            if i % PROGRESS_INTERVAL == 0:
+                tick(i)
+        return len(cards)
+
+    return _run_export(path, len(cards), write, **kwargs)
+
+
+def export_rows_csv(path: str, header: List[str], rows: Iterable[List[Any]], total: int = 0, **kwargs) -> ExportStats:
+    """Stream pre-built CSV rows (e.g. marketplace template rows) under the given header."""
+
+    def write(fp, tick):
+        writer = csv.writer(fp)
+        writer.writerow(header)
+        count = 0
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if count % PROGRESS_INTERVAL == 0:
+                tick(count)
+        return count
+
+    return _run_export(path, total, write, **kwargs)
@@ -0,0 +1,107 @@
+"""
+Bulk card image sync.
+
+Downloads the images behind a set of image URLs (the inventory's, or every card's in the
+local Scryfall mirror) into the ImageLibrary, so previews and listings work offline.
+Images the library already has are skipped, which also makes an interrupted sync
+resumable: running it again only fetches what is still missing. Downloads run
+concurrently on one aiohttp session under their own token-bucket rate limit (image
+hosts are not subject to the API limit, but are still asked politely), with the
+Scryfall client's retry and backoff policy.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from FoS_DeckPro.models.image_library import ImageLibrary
+from FoS_DeckPro.models.scryfall_client import AsyncScryfallClient, ScryfallClient
+
+IMAGE_SYNC_CONCURRENCY = 8
+IMAGE_SYNC_RATE = 20.0
+
+
+@dataclass
+class ImageSyncStats:
+    """Progress and throughput of one sync run."""
+    total: int = 0
+    skipped: int = 0
+    downloaded: int = 0
+    failed: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        return self.skipped + self.downloaded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started, 1e-6)
+
+    @property
+    def images_per_second(self) -> float:
+        return self.downloaded / self.elapsed
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed
+
+    def summary(self) -> str:
+        return (f"{self.downloaded} downloaded, {self.skipped} already present, {self.failed} failed "
+                f"of {self.total} images; {self.bytes / 2**20:.1f} MiB in {self.elapsed:.0f}s "
+                f"({self.images_per_second:.1f} images/s, {self.bytes_per_second / 2**20:.2f} MiB/s)")
+
+
+def image_sync_urls(cards: Iterable[dict]) -> list:
+    """Unique http(s) image URLs of inventory cards, in order."""
+    urls = (str(card.get("image_url", "") or "") for card in cards)
+    return list(dict.fromkeys(url for url in urls if url.startswith(("http://", "https://"))))
+
+
+async def sync_images(urls: Iterable[str], library: ImageLibrary, concurrency: int = IMAGE_SYNC_CONCURRENCY,
+                      rate: float = IMAGE_SYNC_RATE,
+                      on_progress: Optional[Callable[[ImageSyncStats], None]] = None) -> ImageSyncStats:
+    """
+    Download every URL the library does not have yet, at most `concurrency` at a time
+    and `rate` per second. on_progress is called after each image. Cancelling the task
+    stops promptly; images stored so far are kept.
+    """
+    urls = list(dict.fromkeys(urls))
+    missing = library.missing(urls)
+    stats = ImageSyncStats(total=len(urls), skipped=len(urls) - len(missing))
+    if on_progress:
+        on_progress(stats)
+    if not missing:
+        return stats
+    queue = iter(missing)
+    transport = ScryfallClient(rate=rate, burst=concurrency)
+    client = AsyncScryfallClient(transport, concurrency)
+
+    async def download():
+        for url in queue:
+            try:
+                data = await client.get_bytes(url, headers={'Accept': 'image/*'})
+                await asyncio.to_thread(library.add, url, data)
+                stats.downloaded += 1
+                stats.bytes += len(data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Image download failed for {url}: {e}")
+                stats.failed += 1
+            if on_progress:
+                on_progress(stats)
+
+    try:
+        async with client:
+            tasks = [asyncio.ensure_future(download()) for _ in range(min(concurrency, len(missing)))]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        transport.close()
+    return stats
@@ -0,0 +1,123 @@
+"""
+Streaming card import pipeline.
+
+CSV files are read in batches instead of all at once. The column mapping chosen in
+ImportColumnMappingDialog is compiled once into a row transformer that turns a raw
+csv row into a normalized card dict, so each row is touched exactly once on its way
+into the inventory merge. Quantities arrive as ints and prices as floats; a value
+that does not parse is kept as the text it was.
+"""
+import csv
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from FoS_DeckPro.models.card import parse_price, parse_quantity
+
+# Fields offered in the import column mapping dialog
+IMPORT_APP_FIELDS = [
+    "Name", "Set name", "Set code", "Collector number", "Rarity",
+    "Condition", "Foil", "Language", "Purchase price", "Whatnot price",
+    "ManaBox ID", "Scryfall ID", "Misprint", "Altered", "Purchase price currency",
+    "Quantity", "cmc", "color_identity", "colors", "legal_commander", "legal_pauper",
+    "mana_cost", "type_line", "oracle_text"
+]
+
+# Blanks and a bare '0.0' in price fields import as empty
+PRICE_FIELDS = ("Purchase price", "Whatnot price")
+QUANTITY_FIELDS = ("Quantity",)
+
+# How compile_row_transformer() treats a field
+_TEXT, _PRICE, _QUANTITY = range(3)
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def read_csv_header(path: str) -> List[str]:
+    """Return the header row of a CSV file without reading the rest of it."""
+    with open(path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+    if header and header[0].startswith('\ufeff'):
+        header[0] = header[0][1:]
+    return header
+
+
+def compile_row_transformer(fieldnames: List[str], mapping: Dict[str, Optional[str]]) -> Callable[[List[str]], Dict[str, Any]]:
+    """
+    Compile a {csv_column: app_field or None} mapping into a function that converts a
+    csv.reader row (list of strings) into a card dict.
+    Column lookups are resolved to indexes once, up front. Price fields become floats
+    and quantities ints; blank or unparseable values are kept as (stripped) text.
+    """
+    # Last occurrence wins for duplicate headers, matching csv.DictReader
+    positions = {name: i for i, name in enumerate(fieldnames)}
+    plan = []
+    for csv_col, app_field in mapping.items():
+        if not app_field or csv_col not in positions:
+            continue
+        field = app_field.strip()
+        kind = _PRICE if field in PRICE_FIELDS else _QUANTITY if field in QUANTITY_FIELDS else _TEXT
+        plan.append((positions[csv_col], field, kind))
+
+    def transform(row: List[str]) -> Dict[str, Any]:
+        card = {}
+        n = len(row)
+        for idx, field, kind in plan:
+            val = row[idx] if idx < n else ""
+            if kind == _PRICE:
+                stripped = val.strip()
+                if stripped == "" or stripped == "0.0":
+                    val = ""
+                else:
+                    price = parse_price(stripped, None)
+                    val = price if price is not None else stripped
+            elif kind == _QUANTITY:
+                stripped = val.strip()
+                quantity = parse_quantity(stripped, None) if stripped else None
+                val = quantity if quantity is not None else stripped
+            card[field] = val
+        return card
+
+    return transform
+
+
+def _iter_decoded_lines(f, counter: List[int]) -> Iterator[str]:
+    # Decode line by line so the number of bytes consumed is known for progress reporting
+    for raw in f:
+        counter[0] += len(raw)
+        yield raw.decode('utf-8')
+
+
+def iter_csv_batches(path: str, mapping: Dict[str, Optional[str]], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[List[Dict[str, Any]], int, int]]:
+    """
+    Stream a CSV file as batches of mapped cards.
+    Yields (cards, bytes_read, total_bytes); rows that map to no fields are skipped.
+    """
+    total = os.path.getsize(path)
+    consumed = [0]
+    with open(path, 'rb') as f:
+        reader = csv.reader(_iter_decoded_lines(f, consumed))
+        header = next(reader, None)
+        if not header:
+            return
+        if header[0].startswith('\ufeff'):
+            header[0] = header[0][1:]
+        transform = compile_row_transformer(header, mapping)
+        batch = []
+        for row in reader:
+            if not row:
+                continue
+            card = transform(row)
+            if card:
+                batch.append(card)
+            if len(batch) >= batch_size:
+                yield batch, consumed[0], total
+                batch = []
+        yield batch, consumed[0], total
+
+
+def normalize_import_keys(card: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip surrounding whitespace from field names in place."""
+    for k in list(card.keys()):
+        if k != k.strip():
+            card[k.strip()] = card.pop(k)
+    return card
@@ -0,0 +1,250 @@
+"""
+Columnar sales ledger for sell-through and velocity analytics.
+
+Every sale processed from a packing slip is appended as a row of a month partition,
+one NumPy array per column. Each append() is a batch written to files of its own
+(sales_ledger/sales_YYYY-MM.<batch>.npz), so appending never rewrites earlier sales
+and remove_batch() can take a batch back out, e.g. when a packing-slip run is
+undone. A month is read as all of its files (sales_YYYY-MM.npz holds sales from
+before batches). Queries only read the partitions in their date range, keep loaded
+files cached until they change, and aggregate with pandas, so repricing and break
+planning can ask questions such as revenue by set/rarity, sell-through rate or
+days-to-sell without touching buyers data.
+"""
+import os
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from FoS_DeckPro.models.card import parse_price, parse_quantity
+
+SALES_LEDGER_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sales_ledger')
+
+# Ledger column -> storage kind
+LEDGER_COLUMNS = {
+    'name': 'str',
+    'set_code': 'str',
+    'set_name': 'str',
+    'collector_number': 'str',
+    'rarity': 'str',
+    'foil': 'str',
+    'language': 'str',
+    'condition': 'str',
+    'price': 'float',
+    'quantity': 'int',
+    'show_title': 'str',
+    'show_date': 'str',
+    'sold_on': 'date',
+    'acquired_on': 'date',
+    'buyer': 'str',
+    'lot': 'str',
+}
+
+# Ledger identity columns and the card fields they are taken from
+CARD_SOURCE_FIELDS = {
+    'name': 'Name',
+    'set_code': 'Set code',
+    'set_name': 'Set name',
+    'collector_number': 'Collector number',
+    'rarity': 'Rarity',
+    'foil': 'Foil',
+    'language': 'Language',
+    'condition': 'Condition',
+}
+
+# Card fields that may hold the date a card entered the inventory (first non-empty wins)
+ACQUIRED_FIELDS = ('Date added', 'Added', 'Purchase date', 'acquired_on')
+
+UNDATED_PARTITION = 'undated'
+
+
+def ledger_record(sale: Dict[str, Any], show: Optional[Dict[str, Any]], buyer: Optional[Dict[str, Any]],
+                  match: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build a ledger row for one packing-slip sale. Card identity comes from the inventory
+    card the sale was matched to when there is one, otherwise from the sale itself.
+    """
+    show = show or {}
+    buyer = buyer or {}
+    source = match or {}
+    record = {}
+    for column, field in CARD_SOURCE_FIELDS.items():
+        value = source.get(field) or sale.get(field)
+        if value is None and field == 'Set code':
+            value = sale.get('Set')
+        record[column] = str(value or '')
+    price = sale.get('Price')
+    if price in (None, '') and match:
+        price = match.get('Whatnot price')
+    record['price'] = parse_price(price)
+    record['quantity'] = parse_quantity(sale.get('Quantity', 1))
+    record['show_title'] = str(show.get('title') or '')
+    record['show_date'] = str(show.get('date') or '')
+    record['acquired_on'] = next((str(source[f]) for f in ACQUIRED_FIELDS if source.get(f)), '')
+    record['buyer'] = str(buyer.get('username') or buyer.get('name') or '')
+    record['lot'] = str(sale.get('Break') or '')
+    return record
+
+
+def _to_dates(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, errors='coerce', format='mixed').dt.normalize()
+
+
+class SalesLedger:
+    """Append-only, month-partitioned sales ledger with vectorized aggregations."""
+
+    def __init__(self, root: str = SALES_LEDGER_DIR):
+        self.root = root
+        self._cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
+
+    # --- Storage ---
+
+    def _batch_path(self, key: str, batch: str) -> str:
+        return os.path.join(self.root, f"sales_{key}.{batch}.npz")
+
+    def _files(self) -> Dict[str, List[str]]:
+        # Partition key -> its files ('sales_KEY.npz' and 'sales_KEY.BATCH.npz'), sorted
+        files: Dict[str, List[str]] = {}
+        if not os.path.isdir(self.root):
+            return files
+        for name in sorted(os.listdir(self.root)):
+            if name.startswith('sales_') and name.endswith('.npz'):
+                key = name[len('sales_'):-len('.npz')].split('.', 1)[0]
+                files.setdefault(key, []).append(os.path.join(self.root, name))
+        return files
+
+    def partitions(self) -> List[str]:
+        """Partition keys on disk ('YYYY-MM' or 'undated'), sorted."""
+        return sorted(self._files())
+
+    def _read_file(self, path: str) -> pd.DataFrame:
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with np.load(path, allow_pickle=False) as data:
+            df = pd.DataFrame({col: data[col] for col in LEDGER_COLUMNS if col in data.files})
+        self._cache[path] = (mtime, df)
+        return df
+
+    def _read_partition(self, key: str) -> pd.DataFrame:
+        frames = [self._read_file(path) for path in self._files().get(key, [])]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _write_batch(self, key: str, batch: str, df: pd.DataFrame):
+        arrays = {}
+        for col, kind in LEDGER_COLUMNS.items():
+            if kind == 'str':
+                arrays[col] = np.asarray(df[col].astype(str).to_numpy(), dtype=str)
+            elif kind == 'date':
+                arrays[col] = df[col].to_numpy(dtype='datetime64[D]')
+            elif kind == 'float':
+                arrays[col] = df[col].to_numpy(dtype=np.float64)
+            else:
+                arrays[col] = df[col].to_numpy(dtype=np.int64)
+        os.makedirs(self.root, exist_ok=True)
+        path = self._batch_path(key, batch)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+    def append(self, records: Iterable[Dict[str, Any]], batch: Optional[str] = None) -> Optional[str]:
+        """
+        Append ledger rows (see ledger_record) as a new batch, one file per month the
+        sales fall in; existing files are not touched. batch names the batch (a new id by
+        default). Returns the batch id for remove_batch(), or None if there were no rows.
+        """
+        new = pd.DataFrame(list(records), columns=[c for c in LEDGER_COLUMNS if c != 'sold_on'])
+        if new.empty:
+            return None
+        new['sold_on'] = _to_dates(new['show_date'])
+        new['acquired_on'] = _to_dates(new['acquired_on'].replace('', None))
+        keys = new['sold_on'].dt.strftime('%Y-%m').fillna(UNDATED_PARTITION)
+        batch = batch or uuid.uuid4().hex
+        for key, part in new.groupby(keys, sort=False):
+            self._write_batch(key, batch, part[list(LEDGER_COLUMNS)])
+        return batch
+
+    def remove_batch(self, batch: str) -> int:
+        """Delete the rows of one append() batch; returns the number of rows removed."""
+        removed = 0
+        for paths in self._files().values():
+            for path in paths:
+                if path.endswith(f".{batch}.npz"):
+                    removed += len(self._read_file(path))
+                    os.remove(path)
+                    self._cache.pop(path, None)
+        return removed
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Ledger rows sold between start and end (inclusive dates, e.g. '2025-01-31'), reading
+        only the partitions that overlap the range. Undated sales are only included when
+        no range is given. Adds a revenue column (price * quantity).
+        """
+        keys = self.partitions()
+        if start or end:
+            lo = start[:7] if start else '0000-00'
+            hi = end[:7] if end else '9999-99'
+            keys = [k for k in keys if k != UNDATED_PARTITION and lo <= k <= hi]
+        frames = [self._read_partition(k) for k in keys]
+        if not frames:
+            df = pd.DataFrame({col: pd.Series(dtype={'str': object, 'float': 'float64', 'int': 'int64',
+                                                     'date': 'datetime64[s]'}[kind])
+                               for col, kind in LEDGER_COLUMNS.items()})
+        else:
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].copy()
+        if start:
+            df = df[df['sold_on'] >= pd.Timestamp(start)]
+        if end:
+            df = df[df['sold_on'] <= pd.Timestamp(end)]
+        return df.assign(revenue=df['price'] * df['quantity'])
+
+    # --- Aggregations ---
+
+    @staticmethod
+    def _group_keys(df: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
+        # Group case-insensitively so 'tsr' and 'TSR' land together
+        return df.assign(**{col: df[col].astype(str).str.strip().str.lower() for col in by})
+
+    def revenue_by(self, by: Sequence[str] = ('set_code', 'rarity'), start: Optional[str] = None,
+                   end: Optional[str] = None) -> pd.DataFrame:
+        """Revenue, units and number of sales per group, highest revenue first."""
+        by = list(by)
+        df = self._group_keys(self.load(start, end), by)
+        result = df.groupby(by, sort=False).agg(revenue=('revenue', 'sum'), units=('quantity', 'sum'),
+                                                 sales=('quantity', 'size'))
+        return result.sort_values('revenue', ascending=False)
+
+    def days_to_sell(self, by: Sequence[str] = ('set_code', 'rarity'), start: Optional[str] = None,
+                     end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Median and mean days between acquisition and sale per group, over sales whose card
+        had an acquisition date (see ACQUIRED_FIELDS).
+        """
+        by = list(by)
+        df = self.load(start, end)
+        df = self._group_keys(df.assign(days=(df['sold_on'] - df['acquired_on']).dt.days), by)
+        df = df[df['days'].notna()]
+        return df.groupby(by, sort=False)['days'].agg(median_days='median', mean_days='mean', sales='size')
+
+    def sell_through(self, inventory_cards: List[Dict[str, Any]], by: Sequence[str] = ('set_code', 'rarity'),
+                     start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Sell-through per group: units sold / (units sold + units still in inventory).
+        `by` uses ledger column names; inventory cards are grouped on the matching card fields.
+        """
+        by = list(by)
+        sold = self._group_keys(self.load(start, end), by).groupby(by)['quantity'].sum().rename('sold')
+        inv = pd.DataFrame({col: [card.get(CARD_SOURCE_FIELDS[col], '') for card in inventory_cards] for col in by})
+        quantities = pd.to_numeric(pd.Series([card.get('Quantity', 1) for card in inventory_cards], dtype=object),
+                                   errors='coerce').fillna(1)
+        stock = self._group_keys(inv.assign(quantity=quantities.to_numpy()), by).groupby(by)['quantity'].sum().rename('in_stock')
+        result = pd.concat([sold, stock], axis=1).fillna(0)
+        result['sell_through'] = result['sold'] / (result['sold'] + result['in_stock']).where(lambda t: t > 0)
+        return result.fillna({'sell_through': 0.0}).sort_values('sell_through', ascending=False)
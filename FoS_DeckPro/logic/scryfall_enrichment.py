@@ -0,0 +1,152 @@
+"""
+Background Scryfall enrichment.
+
+Inventory cards are grouped by printing (Scryfall ID, or set and collector number) so each
+printing is resolved once however many copies are owned. Printings are answered from the
+local bulk-data mirror first, then from the response cache, and only the rest are
+requested from Scryfall, several /cards/collection batches at a time under the shared
+rate limit. Results are yielded batch by batch so the GUI can apply them as they arrive.
+
+Each enriched card records when and from where it was enriched in a hidden
+ENRICHMENT_META_FIELD, so later runs only refresh what is stale: cards whose oracle data
+is missing, outdated or from an older ENRICHMENT_VERSION get a full refresh, recently
+enriched cards only get new prices, and fresh cards are skipped. Printings that fail or
+are not found leave their cards untouched.
+"""
+import datetime
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from FoS_DeckPro.models.scryfall_api import (
+    aiter_scryfall_collection, card_fields_from_scryfall, collection_identifier, identifier_key)
+from FoS_DeckPro.models.scryfall_bulk import SCRYFALL_BULK_DB_PATH, open_bulk_store
+
+# /cards/collection requests in flight at once (the rate limiter still caps requests per second)
+ENRICH_CONCURRENCY = 4
+
+# Hidden card field holding the enrichment metadata (see enrichment_fields)
+ENRICHMENT_META_FIELD = "_enrichment"
+# Bump when card_fields_from_scryfall changes, so every card gets one full refresh
+ENRICHMENT_VERSION = 1
+
+ORACLE_FIELDS = ("type_line", "mana_cost", "colors", "color_identity", "oracle_text", "cmc", "image_url",
+                 "legal_commander", "legal_pauper")
+PRICE_FIELDS = ("usd", "usd_foil", "usd_etched", "eur", "eur_foil", "eur_etched", "tix",
+                "tcgplayer_url", "cardmarket_url", "cardhoarder_url")
+
+ORACLE_MAX_AGE = datetime.timedelta(days=30)
+# Scryfall updates prices once a day
+PRICE_MAX_AGE = datetime.timedelta(hours=20)
+
+SCOPE_FULL = "full"
+SCOPE_PRICES = "prices"
+
+SOURCE_API = "scryfall-api"
+SOURCE_BULK = "scryfall-bulk"
+
+Printing = Tuple[str, ...]
+
+
+def _parse_time(value: Any) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def refresh_scope(card: Dict[str, Any], now: Optional[datetime.datetime] = None) -> Optional[str]:
+    """SCOPE_FULL, SCOPE_PRICES or None (up to date) for one card, from its enrichment metadata."""
+    now = now or datetime.datetime.now()
+    meta = card.get(ENRICHMENT_META_FIELD)
+    if not isinstance(meta, dict) or meta.get("version") != ENRICHMENT_VERSION:
+        return SCOPE_FULL
+    enriched_at = _parse_time(meta.get("at"))
+    if enriched_at is None or now - enriched_at > ORACLE_MAX_AGE or any(f not in card for f in ORACLE_FIELDS):
+        return SCOPE_FULL
+    prices_at = _parse_time(meta.get("prices_at"))
+    if prices_at is None or now - prices_at > PRICE_MAX_AGE or any(f not in card for f in PRICE_FIELDS):
+        return SCOPE_PRICES
+    return None
+
+
+def plan_enrichment(cards: Iterable[Dict[str, Any]], force: bool = False, now: Optional[datetime.datetime] = None
+                    ) -> Tuple[Dict[Printing, Tuple[Dict[str, str], List[Dict[str, Any]]]], Dict[Printing, str]]:
+    """
+    Group the cards that need refreshing by printing. Returns (groups, scopes), scopes
+    mapping each printing to SCOPE_FULL if any of its cards needs a full refresh, else
+    SCOPE_PRICES. With force every identifiable card gets a full refresh.
+    """
+    now = now or datetime.datetime.now()
+    groups, scopes = {}, {}
+    for card in cards:
+        scope = SCOPE_FULL if force else refresh_scope(card, now)
+        if scope is None:
+            continue
+        identifier = collection_identifier(card)
+        if not identifier:
+            continue
+        key = identifier_key(identifier)
+        groups.setdefault(key, (identifier, []))[1].append(card)
+        if scopes.get(key) != SCOPE_FULL:
+            scopes[key] = scope
+    return groups, scopes
+
+
+def enrichment_fields(card: Dict[str, Any], data: Dict[str, Any], scope: str, source: str,
+                      as_of: str, source_version: str = "") -> Dict[str, Any]:
+    """
+    The fields to update on `card` from a Scryfall card object: everything for SCOPE_FULL,
+    prices and purchase links only for SCOPE_PRICES, plus refreshed enrichment metadata
+    (timestamps, source, source version, fields written). as_of is when the source data
+    was current and dates the prices; oracle data is dated now. The card is not modified.
+    """
+    fields = card_fields_from_scryfall(data, PRICE_FIELDS if scope == SCOPE_PRICES else None)
+    meta = dict(card.get(ENRICHMENT_META_FIELD) or {})
+    if scope == SCOPE_FULL:
+        meta.update(version=ENRICHMENT_VERSION, at=datetime.datetime.now().isoformat(timespec="seconds"))
+    meta.update(prices_at=as_of, source=source, source_version=source_version, fields=sorted(fields))
+    if not card.get("Scryfall ID") and data.get("id"):
+        fields["Scryfall ID"] = data["id"]
+    fields[ENRICHMENT_META_FIELD] = meta
+    return fields
+
+
+async def resolve_printings(identifiers: Iterable[Dict[str, str]], concurrency: int = ENRICH_CONCURRENCY,
+                            bulk_db_path: str = SCRYFALL_BULK_DB_PATH, mirror_keys: Optional[Set[Printing]] = None,
+                            mirror_max_age: Optional[datetime.timedelta] = None
+                            ) -> AsyncIterator[Tuple[Dict[Printing, Dict[str, Any]], List[Dict[str, str]], int, int, Tuple[str, str, str]]]:
+    """
+    Resolve unique collection identifiers to Scryfall card objects, yielding
+    (found by identifier_key, not_found, done, total, (source, source_version, as_of)) per
+    batch: the bulk mirror's answers first, then the cached and fetched ones. as_of is
+    when the data was current (the mirror's import time, or now for API data).
+    The mirror answers every identifier while it is younger than mirror_max_age, and
+    only those in mirror_keys (e.g. printings needing oracle data) once it is older.
+    Close the iterator (e.g. with contextlib.aclosing) to stop early and cancel
+    outstanding requests.
+    """
+    identifiers = list(identifiers)
+    total = len(identifiers)
+    done = 0
+    store = open_bulk_store(bulk_db_path)
+    if store is not None:
+        try:
+            imported_at = store.info().get("imported_at", "")
+            imported = _parse_time(imported_at)
+            if mirror_max_age is not None and (imported is None or datetime.datetime.now() - imported > mirror_max_age):
+                local = [i for i in identifiers if mirror_keys is not None and identifier_key(i) in mirror_keys]
+            else:
+                local = identifiers
+            found, missed = store.lookup_many(local)
+        finally:
+            store.close()
+        if found:
+            identifiers = [i for i in identifiers if identifier_key(i) not in found]
+            done = total - len(identifiers)
+            yield found, [], done, total, (SOURCE_BULK, imported_at, imported_at)
+    if not identifiers:
+        return
+    async with aclosing(aiter_scryfall_collection(identifiers, concurrency=concurrency)) as results:
+        async for found, not_found, remote_done, _ in results:
+            as_of = datetime.datetime.now().isoformat(timespec="seconds")
+            yield found, not_found, done + remote_done, total, (SOURCE_API, "", as_of)
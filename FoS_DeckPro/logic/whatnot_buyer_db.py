@@ -1,35 +1,295 @@
 import json
 import os
-from typing import Dict, Any, List
+import sqlite3
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from FoS_DeckPro.models.card import parse_price, parse_quantity
 
 BUYERS_DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'buyers.json')
+BUYERS_SQLITE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'buyers.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buyers (
+    key TEXT PRIMARY KEY,
+    name TEXT,
+    username TEXT,
+    address TEXT,
+    first_purchase TEXT,
+    last_purchase TEXT,
+    total_spent REAL NOT NULL DEFAULT 0,
+    total_cards INTEGER NOT NULL DEFAULT 0,
+    shows INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS purchases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    buyer_key TEXT NOT NULL REFERENCES buyers(key),
+    show_title TEXT,
+    show_date TEXT,
+    card_name TEXT,
+    quantity INTEGER,
+    price REAL,
+    show_json TEXT,
+    sale_json TEXT,
+    batch TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_buyers_username ON buyers(username);
+CREATE INDEX IF NOT EXISTS idx_purchases_buyer ON purchases(buyer_key);
+CREATE INDEX IF NOT EXISTS idx_purchases_show_date ON purchases(show_date);
+CREATE INDEX IF NOT EXISTS idx_purchases_card_name ON purchases(card_name);
+"""
+
+# Aggregates maintained by triggers as purchases are inserted (and deleted, see
+# remove_batch), so reports never rescan purchase history. Top-N lookups walk an index
+# instead of sorting.
+_AGGREGATES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS show_stats (
+    show_title TEXT NOT NULL,
+    show_date TEXT NOT NULL,
+    revenue REAL NOT NULL DEFAULT 0,
+    units INTEGER NOT NULL DEFAULT 0,
+    sales INTEGER NOT NULL DEFAULT 0,
+    buyers INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (show_title, show_date)
+);
+CREATE TABLE IF NOT EXISTS show_buyers (
+    show_title TEXT NOT NULL,
+    show_date TEXT NOT NULL,
+    buyer_key TEXT NOT NULL,
+    PRIMARY KEY (show_title, show_date, buyer_key)
+);
+CREATE TABLE IF NOT EXISTS card_stats (
+    card_name TEXT PRIMARY KEY,
+    revenue REAL NOT NULL DEFAULT 0,
+    units INTEGER NOT NULL DEFAULT 0,
+    sales INTEGER NOT NULL DEFAULT 0,
+    buyers INTEGER NOT NULL DEFAULT 0,
+    repeat_buyers INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS card_buyers (
+    card_name TEXT NOT NULL,
+    buyer_key TEXT NOT NULL,
+    purchases INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (card_name, buyer_key)
+);
+CREATE INDEX IF NOT EXISTS idx_buyers_total_spent ON buyers(total_spent);
+CREATE INDEX IF NOT EXISTS idx_buyers_shows ON buyers(shows);
+CREATE INDEX IF NOT EXISTS idx_show_stats_date ON show_stats(show_date);
+CREATE INDEX IF NOT EXISTS idx_show_stats_revenue ON show_stats(revenue);
+CREATE INDEX IF NOT EXISTS idx_card_stats_units ON card_stats(units);
+CREATE INDEX IF NOT EXISTS idx_card_stats_revenue ON card_stats(revenue);
+
+CREATE TRIGGER IF NOT EXISTS trg_purchases_aggregate AFTER INSERT ON purchases BEGIN
+    INSERT INTO show_stats (show_title, show_date, revenue, units, sales)
+    VALUES (COALESCE(NEW.show_title, ''), COALESCE(NEW.show_date, ''), NEW.price * NEW.quantity, NEW.quantity, 1)
+    ON CONFLICT(show_title, show_date) DO UPDATE SET
+        revenue = revenue + excluded.revenue, units = units + excluded.units, sales = sales + 1;
+    INSERT OR IGNORE INTO show_buyers (show_title, show_date, buyer_key)
+    VALUES (COALESCE(NEW.show_title, ''), COALESCE(NEW.show_date, ''), NEW.buyer_key);
+    INSERT INTO card_stats (card_name, revenue, units, sales)
+    VALUES (COALESCE(NEW.card_name, ''), NEW.price * NEW.quantity, NEW.quantity, 1)
+    ON CONFLICT(card_name) DO UPDATE SET
+        revenue = revenue + excluded.revenue, units = units + excluded.units, sales = sales + 1;
+    INSERT INTO card_buyers (card_name, buyer_key, purchases)
+    VALUES (COALESCE(NEW.card_name, ''), NEW.buyer_key, 1)
+    ON CONFLICT(card_name, buyer_key) DO UPDATE SET purchases = purchases + 1;
+END;
+-- First purchase by a buyer in a show / of a card
+CREATE TRIGGER IF NOT EXISTS trg_show_buyers_new AFTER INSERT ON show_buyers BEGIN
+    UPDATE show_stats SET buyers = buyers + 1
+    WHERE show_title = NEW.show_title AND show_date = NEW.show_date;
+    UPDATE buyers SET shows = shows + 1 WHERE key = NEW.buyer_key;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_card_buyers_new AFTER INSERT ON card_buyers BEGIN
+    UPDATE card_stats SET buyers = buyers + 1 WHERE card_name = NEW.card_name;
+END;
+-- Second purchase of the same card by the same buyer
+CREATE TRIGGER IF NOT EXISTS trg_card_buyers_repeat AFTER UPDATE OF purchases ON card_buyers
+WHEN OLD.purchases = 1 AND NEW.purchases >= 2 BEGIN
+    UPDATE card_stats SET repeat_buyers = repeat_buyers + 1 WHERE card_name = NEW.card_name;
+END;
+
+-- Deleting purchases rolls the aggregates back; rows left with no purchases are dropped
+CREATE TRIGGER IF NOT EXISTS trg_purchases_unaggregate AFTER DELETE ON purchases BEGIN
+    DELETE FROM show_buyers
+    WHERE show_title = COALESCE(OLD.show_title, '') AND show_date = COALESCE(OLD.show_date, '')
+      AND buyer_key = OLD.buyer_key
+      AND NOT EXISTS (SELECT 1 FROM purchases WHERE buyer_key = OLD.buyer_key
+                      AND COALESCE(show_title, '') = COALESCE(OLD.show_title, '')
+                      AND COALESCE(show_date, '') = COALESCE(OLD.show_date, ''));
+    UPDATE show_stats SET
+        revenue = revenue - OLD.price * OLD.quantity, units = units - OLD.quantity, sales = sales - 1
+    WHERE show_title = COALESCE(OLD.show_title, '') AND show_date = COALESCE(OLD.show_date, '');
+    DELETE FROM show_stats
+    WHERE show_title = COALESCE(OLD.show_title, '') AND show_date = COALESCE(OLD.show_date, '') AND sales <= 0;
+    UPDATE card_buyers SET purchases = purchases - 1
+    WHERE card_name = COALESCE(OLD.card_name, '') AND buyer_key = OLD.buyer_key;
+    DELETE FROM card_buyers
+    WHERE card_name = COALESCE(OLD.card_name, '') AND buyer_key = OLD.buyer_key AND purchases <= 0;
+    UPDATE card_stats SET
+        revenue = revenue - OLD.price * OLD.quantity, units = units - OLD.quantity, sales = sales - 1
+    WHERE card_name = COALESCE(OLD.card_name, '');
+    DELETE FROM card_stats WHERE card_name = COALESCE(OLD.card_name, '') AND sales <= 0;
+    UPDATE buyers SET
+        total_spent = total_spent - OLD.price * OLD.quantity,
+        total_cards = total_cards - OLD.quantity,
+        first_purchase = (SELECT show_date FROM purchases WHERE buyer_key = OLD.buyer_key ORDER BY id LIMIT 1),
+        last_purchase = (SELECT show_date FROM purchases WHERE buyer_key = OLD.buyer_key ORDER BY id DESC LIMIT 1)
+    WHERE key = OLD.buyer_key;
+    DELETE FROM buyers
+    WHERE key = OLD.buyer_key AND NOT EXISTS (SELECT 1 FROM purchases WHERE buyer_key = OLD.buyer_key);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_show_buyers_gone AFTER DELETE ON show_buyers BEGIN
+    UPDATE show_stats SET buyers = buyers - 1
+    WHERE show_title = OLD.show_title AND show_date = OLD.show_date;
+    UPDATE buyers SET shows = shows - 1 WHERE key = OLD.buyer_key;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_card_buyers_gone AFTER DELETE ON card_buyers BEGIN
+    UPDATE card_stats SET buyers = buyers - 1 WHERE card_name = OLD.card_name;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_card_buyers_unrepeat AFTER UPDATE OF purchases ON card_buyers
+WHEN OLD.purchases >= 2 AND NEW.purchases = 1 BEGIN
+    UPDATE card_stats SET repeat_buyers = repeat_buyers - 1 WHERE card_name = NEW.card_name;
+END;
+"""
+
+# PRAGMA user_version of a database with the current schema
+_SCHEMA_VERSION = 3
+
+# One purchase as passed to bulk_add_purchases: (buyer, sale, show)
+Purchase = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]
+
+# meta key set, in the same transaction as the imported rows, once buyers.json has been imported
+_LEGACY_IMPORTED = 'legacy_json_imported'
+
 
 class WhatnotBuyerDB:
     """
-    Manages buyers and their purchase history for Whatnot sales, stored in a JSON file.
-    Supports analytics and future CRM features.
+    Manages buyers and their purchase history for Whatnot sales, stored in SQLite.
+    Purchases are written in transactions (see bulk_add_purchases), with indexes on buyer
+    username, show date and card name. Per-buyer, per-show and per-card aggregates are kept
+    up to date by triggers on insert and delete, so the analytics queries and report() are
+    index lookups.
+    An existing buyers.json is imported once; the meta table records that it was.
     """
-    def __init__(self, db_path: str = BUYERS_DB_PATH):
+    def __init__(self, db_path: str = BUYERS_SQLITE_PATH, legacy_json_path: str = BUYERS_DB_PATH):
         self.db_path = db_path
-        self._load()
-
-    def _load(self):
-        if os.path.exists(self.db_path):
-            try:
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if not content:
-                        self.buyers = {}
-                    else:
-                        self.buyers = json.loads(content)
-            except Exception:
-                self.buyers = {}
-        else:
-            self.buyers = {}
-
-    def _save(self):
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(self.buyers, f, indent=2)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._upgrade_schema()
+        if legacy_json_path and self._get_meta(_LEGACY_IMPORTED) is None:
+            if self.conn.execute("SELECT 1 FROM purchases LIMIT 1").fetchone():
+                # Databases from before the meta table already hold their import
+                with self.conn:
+                    self._set_meta(_LEGACY_IMPORTED, legacy_json_path)
+            elif os.path.exists(legacy_json_path):
+                self._import_legacy_json(legacy_json_path)
+
+    def _get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _upgrade_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        with self.conn:
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(buyers)")}
+            if 'shows' not in columns:
+                self.conn.execute("ALTER TABLE buyers ADD COLUMN shows INTEGER NOT NULL DEFAULT 0")
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(purchases)")}
+            if 'batch' not in columns:
+                self.conn.execute("ALTER TABLE purchases ADD COLUMN batch TEXT")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_purchases_batch ON purchases(batch)")
+        self.conn.executescript(_AGGREGATES_SCHEMA)
+        self.rebuild_aggregates()
+        self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def rebuild_aggregates(self):
+        """Recompute every aggregate table from the purchase history (used when upgrading older databases)."""
+        with self.conn:
+            # Clearing the helper tables must not fire their delete triggers
+            self.conn.execute("DROP TRIGGER IF EXISTS trg_show_buyers_gone")
+            self.conn.execute("DROP TRIGGER IF EXISTS trg_card_buyers_gone")
+            for table in ("show_stats", "show_buyers", "card_stats", "card_buyers"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute("""
+                INSERT INTO show_stats (show_title, show_date, revenue, units, sales, buyers)
+                SELECT COALESCE(show_title, ''), COALESCE(show_date, ''), SUM(price * quantity), SUM(quantity),
+                       COUNT(*), COUNT(DISTINCT buyer_key)
+                FROM purchases GROUP BY COALESCE(show_title, ''), COALESCE(show_date, '')""")
+            # Triggers on the helper tables would double count, so they are filled directly
+            self.conn.execute("""
+                INSERT INTO card_stats (card_name, revenue, units, sales)
+                SELECT COALESCE(card_name, ''), SUM(price * quantity), SUM(quantity), COUNT(*)
+                FROM purchases GROUP BY COALESCE(card_name, '')""")
+            self.conn.execute("DROP TRIGGER IF EXISTS trg_show_buyers_new")
+            self.conn.execute("DROP TRIGGER IF EXISTS trg_card_buyers_new")
+            self.conn.execute("""
+                INSERT INTO show_buyers (show_title, show_date, buyer_key)
+                SELECT DISTINCT COALESCE(show_title, ''), COALESCE(show_date, ''), buyer_key FROM purchases""")
+            self.conn.execute("""
+                INSERT INTO card_buyers (card_name, buyer_key, purchases)
+                SELECT COALESCE(card_name, ''), buyer_key, COUNT(*) FROM purchases
+                GROUP BY COALESCE(card_name, ''), buyer_key""")
+            self.conn.execute("""
+                UPDATE card_stats SET
+                    buyers = (SELECT COUNT(*) FROM card_buyers cb WHERE cb.card_name = card_stats.card_name),
+                    repeat_buyers = (SELECT COUNT(*) FROM card_buyers cb
+                                     WHERE cb.card_name = card_stats.card_name AND cb.purchases >= 2)""")
+            self.conn.execute("""
+                UPDATE buyers SET shows = (SELECT COUNT(*) FROM show_buyers sb WHERE sb.buyer_key = buyers.key)""")
+        # Restore the dropped triggers
+        self.conn.executescript(_AGGREGATES_SCHEMA)
+
+    def _import_legacy_json(self, path: str):
+        """
+        Copy buyers and purchases from the old buyers.json (left in place) into the database.
+        The rows and the meta record of the import are written in one transaction, so an
+        import that fails is retried on the next start. Malformed buyers and purchases are
+        skipped with a warning.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            buyers = json.loads(content) if content else {}
+        except Exception as e:
+            print(f"WARNING: Could not read {path}, buyers not imported: {e}")
+            return
+        if not isinstance(buyers, dict):
+            print(f"WARNING: {path} does not hold a buyers object, buyers not imported.")
+            return
+        purchases = []
+        for key, entry in buyers.items():
+            if not isinstance(entry, dict) or not isinstance(entry.get('purchases', []), list):
+                print(f"WARNING: Skipping malformed buyer {key!r} in {path}")
+                continue
+            # buyers.json is keyed by username, or by name for buyers without one
+            username = str(entry.get('username') or '')
+            buyer = {'name': str(entry.get('name') or ('' if username else key)), 'username': username,
+                     'address': str(entry.get('address') or '')}
+            for i, p in enumerate(entry.get('purchases', [])):
+                sale = p.get('sale') if isinstance(p, dict) else None
+                show = p.get('show') if isinstance(p, dict) else None
+                if (not isinstance(sale, dict) or not isinstance(show or {}, dict)
+                        or parse_quantity(sale.get('Quantity', 1), None) is None
+                        or parse_price(sale.get('Price', 0.0), None) is None):
+                    print(f"WARNING: Skipping malformed purchase {i} of buyer {key!r} in {path}")
+                    continue
+                purchases.append((buyer, sale, show or {}))
+        with self.conn:
+            self._insert_purchases(purchases)
+            self._set_meta(_LEGACY_IMPORTED, path)
+
+    def close(self):
+        self.conn.close()
 
     def add_purchase(self, buyer: Dict[str, Any], sale: Dict[str, Any], show: Dict[str, Any]):
         """
@@ -37,37 +297,174 @@ class WhatnotBuyerDB:
         buyer: dict with keys 'name', 'username', 'address'
         sale: dict with card sale info (Name, Quantity, etc)
         show: dict with 'title', 'date'
+        Prefer bulk_add_purchases when recording more than one sale.
         """
-        key = buyer['username'] or buyer['name']
-        if key not in self.buyers:
-            self.buyers[key] = {
-                'name': buyer['name'],
-                'username': buyer['username'],
-                'address': buyer['address'],
-                'purchases': [],
-                'first_purchase': show['date'],
-                'last_purchase': show['date'],
-                'total_spent': 0.0,
-                'total_cards': 0
-            }
-        entry = self.buyers[key]
-        entry['last_purchase'] = show['date']
-        entry['purchases'].append({
-            'show': show,
-            'sale': sale
-        })
-        # Analytics: update totals
-        qty = sale.get('Quantity', 1)
-        price = float(sale.get('Price', 0.0))
-        entry['total_cards'] += qty
-        entry['total_spent'] += price * qty
-        self._save()
+        self.bulk_add_purchases([(buyer, sale, show)])
+
+    def bulk_add_purchases(self, purchases: Iterable[Purchase], batch: Optional[str] = None) -> int:
+        """
+        Record many (buyer, sale, show) purchases in a single transaction.
+        Buyer totals are accumulated in memory and written once per buyer.
+        Purchases tagged with a batch id can be taken back out with remove_batch().
+        Returns the number of purchases added.
+        """
+        with self.conn:
+            return self._insert_purchases(purchases, batch)
+
+    def remove_batch(self, batch: str) -> int:
+        """
+        Delete the purchases recorded with a batch id (e.g. an undone packing-slip run);
+        the triggers roll the buyer, show and card aggregates back. Returns the number removed.
+        """
+        with self.conn:
+            return self.conn.execute("DELETE FROM purchases WHERE batch = ?", (batch,)).rowcount
+
+    def _insert_purchases(self, purchases: Iterable[Purchase], batch: Optional[str] = None) -> int:
+        # bulk_add_purchases without the transaction, for callers that write more with it
+        rows = []
+        buyers: Dict[str, Dict[str, Any]] = {}
+        for buyer, sale, show in purchases:
+            show = show or {}
+            key = buyer['username'] or buyer['name']
+            # Packing slips give quantities and prices as strings
+            qty = parse_quantity(sale.get('Quantity', 1))
+            price = parse_price(sale.get('Price', 0.0))
+            date = show.get('date')
+            agg = buyers.get(key)
+            if agg is None:
+                agg = buyers[key] = {'name': buyer['name'], 'username': buyer['username'],
+                                     'address': buyer['address'], 'first_purchase': date,
+                                     'last_purchase': date, 'total_spent': 0.0, 'total_cards': 0}
+            agg['last_purchase'] = date
+            # Analytics: update totals
+            agg['total_cards'] += qty
+            agg['total_spent'] += price * qty
+            rows.append((key, show.get('title'), date, sale.get('Name'), qty, price,
+                         json.dumps(show, ensure_ascii=False), json.dumps(sale, ensure_ascii=False), batch))
+        if not rows:
+            return 0
+        self.conn.executemany(
+            """INSERT INTO buyers (key, name, username, address, first_purchase, last_purchase, total_spent, total_cards)
+               VALUES (:key, :name, :username, :address, :first_purchase, :last_purchase, :total_spent, :total_cards)
+               ON CONFLICT(key) DO UPDATE SET
+                   last_purchase = excluded.last_purchase,
+                   total_spent = total_spent + excluded.total_spent,
+                   total_cards = total_cards + excluded.total_cards""",
+            [dict(agg, key=key) for key, agg in buyers.items()])
+        self.conn.executemany(
+            """INSERT INTO purchases (buyer_key, show_title, show_date, card_name, quantity, price, show_json, sale_json, batch)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+        return len(rows)
+
+    def _buyer_dict(self, row: sqlite3.Row, with_purchases: bool = True) -> Dict[str, Any]:
+        entry = {
+            'name': row['name'],
+            'username': row['username'],
+            'address': row['address'],
+            'purchases': [],
+            'first_purchase': row['first_purchase'],
+            'last_purchase': row['last_purchase'],
+            'total_spent': row['total_spent'],
+            'total_cards': row['total_cards'],
+            'shows': row['shows'],
+        }
+        if with_purchases:
+            cur = self.conn.execute(
+                "SELECT show_json, sale_json FROM purchases WHERE buyer_key = ? ORDER BY id", (row['key'],))
+            entry['purchases'] = [{'show': json.loads(s), 'sale': json.loads(p)} for s, p in cur]
+        return entry
 
     def get_buyer(self, username_or_name: str) -> Dict[str, Any]:
-        return self.buyers.get(username_or_name, {})
+        row = self.conn.execute("SELECT * FROM buyers WHERE key = ?", (username_or_name,)).fetchone()
+        return self._buyer_dict(row) if row else {}
 
     def get_all_buyers(self) -> List[Dict[str, Any]]:
-        return list(self.buyers.values())
+        return [self._buyer_dict(row) for row in self.conn.execute("SELECT * FROM buyers ORDER BY rowid")]
+
+    def get_top_buyers(self, n=10, with_purchases: bool = True) -> List[Dict[str, Any]]:
+        rows = self.conn.execute("SELECT * FROM buyers ORDER BY total_spent DESC LIMIT ?", (n,)).fetchall()
+        return [self._buyer_dict(row, with_purchases) for row in rows]
+
+    # --- Aggregate queries (index lookups on the trigger-maintained tables) ---
+
+    def get_show_stats(self, show_title: str, show_date: str) -> Dict[str, Any]:
+        """Revenue, units, sales and distinct buyers for one show."""
+        row = self.conn.execute("SELECT * FROM show_stats WHERE show_title = ? AND show_date = ?",
+                                (show_title or '', show_date or '')).fetchone()
+        return dict(row) if row else {}
+
+    def get_shows_by_date(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Stats for shows dated within [start_date, end_date], by date (dates compare as stored strings)."""
+        cur = self.conn.execute("SELECT * FROM show_stats WHERE show_date BETWEEN ? AND ? ORDER BY show_date",
+                                (start_date, end_date))
+        return [dict(row) for row in cur]
+
+    def get_top_shows(self, n=10) -> List[Dict[str, Any]]:
+        cur = self.conn.execute("SELECT * FROM show_stats ORDER BY revenue DESC LIMIT ?", (n,))
+        return [dict(row) for row in cur]
+
+    @staticmethod
+    def _card_stats_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        stats = dict(row)
+        stats['repeat_buyer_rate'] = stats['repeat_buyers'] / stats['buyers'] if stats['buyers'] else 0.0
+        return stats
+
+    def get_card_stats(self, card_name: str) -> Dict[str, Any]:
+        """
+        Sell-through for one card name: units and revenue sold, number of sales, distinct
+        buyers, buyers who bought it more than once and their share (repeat_buyer_rate).
+        """
+        row = self.conn.execute("SELECT * FROM card_stats WHERE card_name = ?", (card_name,)).fetchone()
+        return self._card_stats_dict(row) if row else {}
+
+    def get_top_cards(self, n=10, by: str = 'units') -> List[Dict[str, Any]]:
+        """Best-selling cards by 'units' or 'revenue'."""
+        if by not in ('units', 'revenue'):
+            raise ValueError(f"Unknown ordering: {by}")
+        cur = self.conn.execute(f"SELECT * FROM card_stats ORDER BY {by} DESC LIMIT ?", (n,))
+        return [self._card_stats_dict(row) for row in cur]
+
+    def get_repeat_buyer_rate(self) -> float:
+        """Share of buyers who have bought in more than one show."""
+        total = self.conn.execute("SELECT COUNT(*) FROM buyers").fetchone()[0]
+        if not total:
+            return 0.0
+        repeat = self.conn.execute("SELECT COUNT(*) FROM buyers WHERE shows >= 2").fetchone()[0]
+        return repeat / total
+
+    def report(self, top_n: int = 10) -> Dict[str, Any]:
+        """Plain-dict summary of buyer analytics, suitable for JSON output or scripts."""
+        totals = self.conn.execute(
+            "SELECT COUNT(*) AS buyers, COALESCE(SUM(total_spent), 0) AS revenue, "
+            "COALESCE(SUM(total_cards), 0) AS units FROM buyers").fetchone()
+        return {
+            'buyers': totals['buyers'],
+            'revenue': totals['revenue'],
+            'units': totals['units'],
+            'repeat_buyer_rate': self.get_repeat_buyer_rate(),
+            'top_buyers': [{k: b[k] for k in ('name', 'username', 'total_spent', 'total_cards', 'first_purchase', 'last_purchase')}
+                           for b in self.get_top_buyers(top_n, with_purchases=False)],
+            'top_shows': self.get_top_shows(top_n),
+            'top_cards': self.get_top_cards(top_n),
+        }
+
+    def get_purchases_for_card(self, card_name: str) -> List[Dict[str, Any]]:
+        """All purchases of a card by name, oldest first."""
+        cur = self.conn.execute(
+            "SELECT buyer_key, show_json, sale_json FROM purchases WHERE card_name = ? ORDER BY id", (card_name,))
+        return [{'buyer': key, 'show': json.loads(s), 'sale': json.loads(p)} for key, s, p in cur]
+
+    def get_purchases_for_show_date(self, show_date: str) -> List[Dict[str, Any]]:
+        """All purchases from shows on the given date, in insertion order."""
+        cur = self.conn.execute(
+            "SELECT buyer_key, show_json, sale_json FROM purchases WHERE show_date = ? ORDER BY id", (show_date,))
+        return [{'buyer': key, 'show': json.loads(s), 'sale': json.loads(p)} for key, s, p in cur]
+
 
-    def get_top_buyers(self, n=10) -> List[Dict[str, Any]]:
-        return sorted(self.get_all_buyers(), key=lambda b: b['total_spent'], reverse=True)[:n] 
\ No newline at end of file
+def buyer_report(top_n: int = 10, db_path: str = BUYERS_SQLITE_PATH) -> Dict[str, Any]:
+    """Open the buyer database, build its report() and close it again."""
+    db = WhatnotBuyerDB(db_path)
+    try:
+        return db.report(top_n)
+    finally:
+        db.close()
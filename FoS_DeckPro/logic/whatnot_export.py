@@ -0,0 +1,325 @@
+"""
+Whatnot CSV export with change tracking.
+
+Every export records a content hash per card in an export state file. A delta export
+compares the inventory against that state and only templates and writes the cards that
+are new or changed since the last upload, plus a file of listings that were removed.
+A full export writes every card and resets the state.
+"""
+import csv
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from FoS_DeckPro.logic.export_service import ExportStats, export_rows_csv
+from FoS_DeckPro.models.inventory import KEY_FIELDS, card_key
+
+WHATNOT_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Whatnot Card Inventory - Template (3).csv')
+WHATNOT_EXPORT_STATE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'whatnot_export_state.json')
+
+# Built-in columns and defaults, used when the template file is missing
+WHATNOT_DEFAULT_COLUMNS = [
+    "Category", "Sub Category", "Title", "Description", "Quantity", "Type", "Price", "Shipping Profile", "Offerable", "Hazmat", "Condition", "Cost Per Item", "SKU", "Image URL 1", "Image URL 2", "Image URL 3", "Image URL 4", "Image URL 5", "Image URL 6", "Image URL 7", "Image URL 8"
+]
+WHATNOT_DEFAULT_VALUES = [
+    "Trading Card Games", "Magic: The Gathering", "", "", "1", "Buy it Now", "1", "0-1 oz", "No", "Not Hazmat", "Near Mint", "", "", "", "", "", "", ""
+]
+
+# Static columns and their default values
+STATIC_DEFAULTS = {
+    "Category": "Trading Card Games",
+    "Sub Category": "Magic: The Gathering",
+    "Type": "Buy it Now",
+    "Shipping Profile": "0-1 oz",
+    "Offerable": "No",
+    "Hazmat": "Not Hazmat",
+    "Condition": "Near Mint",
+}
+
+# Columns filled from specific card fields rather than copied by name
+_COMPUTED_COLUMNS = ("Title", "Description", "Quantity", "Price", "Cost Per Item", "Image URL 1")
+
+# (builder signature, {id(card): (card, field values, key, hash)}) from the most recent export.
+# Entries hold the card itself, so its id is not reused for another card while memoized;
+# lookups still check the card with `is`.
+_fingerprint_memo: Tuple[Optional[str], Dict[int, tuple]] = (None, {})
+
+
+def load_whatnot_template(path: str = WHATNOT_TEMPLATE_PATH) -> Tuple[List[str], List[str], bool]:
+    """
+    Return (columns, defaults, found) from the Whatnot template CSV, falling back to the
+    built-in columns when the file does not exist.
+    """
+    if os.path.exists(path):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            columns = next(reader)
+            defaults = next(reader, [])
+        return columns, defaults, True
+    return list(WHATNOT_DEFAULT_COLUMNS), list(WHATNOT_DEFAULT_VALUES), False
+
+
+def whatnot_price(value: Any) -> str:
+    """Whatnot price minimum rule: 0 always exports as 1 (see README)."""
+    if str(value).strip() in ("0", "0.0"):
+        return "1"
+    return str(value)
+
+
+class WhatnotRowBuilder:
+    """
+    Turns cards into Whatnot template rows. Column positions are resolved once, and
+    the content hash in fingerprints() covers exactly the card fields that can change
+    a card's row.
+    """
+
+    def __init__(self, columns: List[str], defaults: List[str], title_fields: List[str], desc_fields: List[str]):
+        self.columns = list(columns)
+        self.title_fields = list(title_fields)
+        self.desc_fields = list(desc_fields)
+        base = list(defaults)[:len(self.columns)]
+        base += [""] * (len(self.columns) - len(base))
+        positions = {col: i for i, col in enumerate(self.columns)}
+        for col, val in STATIC_DEFAULTS.items():
+            if col in positions:
+                base[positions[col]] = val
+        self._base = base
+        self._pos = {col: positions.get(col) for col in _COMPUTED_COLUMNS}
+        self._passthrough = [(i, col) for i, col in enumerate(self.columns)
+                             if col not in STATIC_DEFAULTS and col not in _COMPUTED_COLUMNS]
+        hashed = set(self.title_fields) | set(self.desc_fields) | {col for _, col in self._passthrough}
+        hashed.update(("Quantity", "Whatnot price", "Purchase price", "image_url", "Image URL 1"))
+        self.hashed_fields = sorted(hashed)
+        self._memo_fields = tuple(self.hashed_fields) + KEY_FIELDS
+        settings = json.dumps([self.columns, base, self.title_fields, self.desc_fields])
+        self.signature = hashlib.blake2b(settings.encode('utf-8'), digest_size=12).hexdigest()
+
+    def title(self, card: Dict[str, Any]) -> str:
+        return " ".join(str(card.get(f, "")) for f in self.title_fields if f in card).strip()
+
+    def build(self, card: Dict[str, Any]) -> List[str]:
+        """Build the template row for one card."""
+        row = list(self._base)
+        pos = self._pos
+        if pos["Title"] is not None:
+            row[pos["Title"]] = self.title(card)
+        if pos["Description"] is not None:
+            desc = "\n".join(f"{f}: {card.get(f, '')}" for f in self.desc_fields if f in card)
+            row[pos["Description"]] = desc.strip()
+        if pos["Quantity"] is not None:
+            row[pos["Quantity"]] = str(card.get("Quantity", ""))
+        if pos["Price"] is not None:
+            row[pos["Price"]] = whatnot_price(card.get("Whatnot price", ""))
+        if pos["Cost Per Item"] is not None:
+            row[pos["Cost Per Item"]] = str(card.get("Purchase price", ""))
+        if pos["Image URL 1"] is not None:
+            row[pos["Image URL 1"]] = card.get("image_url", card.get("Image URL 1", ""))
+        # Fill other columns with card data if present
+        for i, col in self._passthrough:
+            value = card.get(col, None)
+            if value is not None and value != '':
+                row[i] = str(value)
+        return row
+
+    @staticmethod
+    def _hash_values(values: tuple) -> str:
+        # A missing field hashes like None
+        return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=12).hexdigest()
+
+    def fingerprints(self, cards: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """
+        Return (listing ID, content hash) for each card. The listing ID is the card's
+        inventory key, with a #n suffix for repeated keys so separate rows of the same
+        printing are tracked separately.
+        Results are memoized per card object for this process and reused while the card's
+        values are unchanged, so repeat exports only hash the cards that were edited.
+        """
+        global _fingerprint_memo
+        memo = _fingerprint_memo if _fingerprint_memo[0] == self.signature else (self.signature, {})
+        old, new = memo[1], {}
+        fields = self._memo_fields
+        seen: Dict[str, int] = {}
+        result = []
+        for card in cards:
+            values = tuple(map(card.get, fields))
+            cached = old.get(id(card))
+            if cached is None or cached[0] is not card or cached[1] != values:
+                cached = (card, values, '|'.join(card_key(card)), self._hash_values(values[:len(self.hashed_fields)]))
+            new[id(card)] = cached
+            base = cached[2]
+            n = seen.get(base, 0) + 1
+            seen[base] = n
+            result.append((base if n == 1 else f"{base}#{n}", cached[3]))
+        _fingerprint_memo = (self.signature, new)
+        return result
+
+    def removed_row(self, entry: Dict[str, Any]) -> List[str]:
+        """Row that takes a previously exported listing down (quantity 0)."""
+        row = list(self._base)
+        if self._pos["Title"] is not None:
+            row[self._pos["Title"]] = entry.get("title", "")
+        if self._pos["Price"] is not None:
+            row[self._pos["Price"]] = entry.get("price", "")
+        if self._pos["Quantity"] is not None:
+            row[self._pos["Quantity"]] = "0"
+        return row
+
+
+class WhatnotExportState:
+    """
+    What was last uploaded to Whatnot: the export settings signature and, per listing ID,
+    the content hash, title and price that were exported.
+    """
+
+    def __init__(self, path: str = WHATNOT_EXPORT_STATE_PATH):
+        self.path = path
+        self.signature: Optional[str] = None
+        self.exported_at: Optional[str] = None
+        self.listings: Dict[str, Dict[str, str]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.signature = data.get("signature")
+            self.exported_at = data.get("exported_at")
+            self.listings = data.get("listings", {})
+        except Exception:
+            self.signature = None
+            self.listings = {}
+
+    def matches(self, builder: WhatnotRowBuilder) -> bool:
+        """True if a previous export exists that used the same template and fields."""
+        return self.signature == builder.signature and bool(self.listings)
+
+    def save(self, signature: str, listings: Dict[str, Dict[str, str]]):
+        self.signature = signature
+        self.listings = listings
+        self.exported_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        tmp_path = self.path + '.tmp'
+        # json.dumps uses the C encoder in one pass, much faster than json.dump for large states
+        text = json.dumps({"signature": signature, "exported_at": self.exported_at, "listings": listings},
+                          ensure_ascii=False, separators=(',', ':'))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class WhatnotDelta:
+    """Cards grouped by how they differ from the last export."""
+    new: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)      # (id, hash, card)
+    changed: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)  # (id, hash, card)
+    removed: List[Tuple[str, Dict[str, str]]] = field(default_factory=list)      # (id, previous entry)
+    unchanged: Dict[str, Dict[str, str]] = field(default_factory=dict)           # id -> previous entry
+    price_changed: int = 0
+
+
+def compute_delta(cards: List[Dict[str, Any]], builder: WhatnotRowBuilder, previous: Dict[str, Dict[str, str]]) -> WhatnotDelta:
+    """Compare cards against the previously exported listings by content hash; no templating happens here."""
+    delta = WhatnotDelta()
+    seen = set()
+    for (listing_id, digest), card in zip(builder.fingerprints(cards), cards):
+        seen.add(listing_id)
+        entry = previous.get(listing_id)
+        if entry is None:
+            delta.new.append((listing_id, digest, card))
+        elif entry.get("hash") != digest:
+            delta.changed.append((listing_id, digest, card))
+            if entry.get("price") != whatnot_price(card.get("Whatnot price", "")):
+                delta.price_changed += 1
+        else:
+            delta.unchanged[listing_id] = entry
+    delta.removed = [(listing_id, entry) for listing_id, entry in previous.items() if listing_id not in seen]
+    return delta
+
+
+@dataclass
+class WhatnotExportResult:
+    """Summary of a Whatnot export."""
+    full: bool
+    files: List[ExportStats]
+    new: int = 0
+    changed: int = 0
+    price_changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        if self.full:
+            lines = [f"Exported {self.new} cards (full export)."]
+        else:
+            lines = [f"New: {self.new}, Changed: {self.changed} ({self.price_changed} price changes), "
+                     f"Removed: {self.removed}, Unchanged: {self.unchanged}."]
+        if self.files:
+            lines += [os.path.basename(stats.path) for stats in self.files]
+        else:
+            lines.append("Nothing has changed since the last export; no files written.")
+        lines.append(f"Took {self.seconds * 1000:.0f} ms.")
+        return "\n".join(lines)
+
+
+def _delta_path(path: str, suffix: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}_{suffix}{ext or '.csv'}"
+
+
+def export_whatnot(path: str, cards: List[Dict[str, Any]], builder: WhatnotRowBuilder, full: bool = False,
+                   state: Optional[WhatnotExportState] = None,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   is_cancelled: Optional[Callable[[], bool]] = None) -> WhatnotExportResult:
+    """
+    Write a Whatnot export and record it in the export state.
+    Full mode writes every card to `path`. Delta mode writes <name>_new, <name>_changed and
+    <name>_removed files next to `path`, each only when it has rows; it falls back to a full
+    export when there is no previous export made with the same template and fields.
+    The state is only updated once all files have been written.
+    """
+    start = time.perf_counter()
+    cards = list(cards)
+    if state is None:
+        state = WhatnotExportState()
+    hooks = {"progress": progress, "is_cancelled": is_cancelled}
+    listings: Dict[str, Dict[str, str]] = {}
+
+    def rows_for(items):
+        # Template only the cards being written, recording what was exported as we go
+        for listing_id, digest, card in items:
+            row = builder.build(card)
+            listings[listing_id] = {"hash": digest, "title": builder.title(card),
+                                    "price": whatnot_price(card.get("Whatnot price", ""))}
+            yield row
+
+    full = full or not state.matches(builder)
+    if full:
+        items = [(listing_id, digest, card) for (listing_id, digest), card in zip(builder.fingerprints(cards), cards)]
+        stats = export_rows_csv(path, builder.columns, rows_for(items), total=len(items), **hooks)
+        result = WhatnotExportResult(full=True, files=[stats], new=len(items))
+    else:
+        delta = compute_delta(cards, builder, state.listings)
+        listings.update(delta.unchanged)
+        files = []
+        if delta.new:
+            files.append(export_rows_csv(_delta_path(path, "new"), builder.columns,
+                                         rows_for(delta.new), total=len(delta.new), **hooks))
+        if delta.changed:
+            files.append(export_rows_csv(_delta_path(path, "changed"), builder.columns,
+                                         rows_for(delta.changed), total=len(delta.changed), **hooks))
+        if delta.removed:
+            removed_rows = (builder.removed_row(entry) for _, entry in delta.removed)
+            files.append(export_rows_csv(_delta_path(path, "removed"), builder.columns,
+                                         removed_rows, total=len(delta.removed), **hooks))
+        result = WhatnotExportResult(full=False, files=files, new=len(delta.new), changed=len(delta.changed),
+                                     price_changed=delta.price_changed, removed=len(delta.removed),
+                                     unchanged=len(delta.unchanged))
+    if result.files:
+        state.save(builder.signature, listings)
+    result.seconds = time.perf_counter() - start
+    return result
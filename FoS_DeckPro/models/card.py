@@ -38,4 +38,37 @@ CARD_FIELDS = [
     "Whatnot price"
 ]
 
+
+def normalize_card_fields(card, fields):
+    """
+    Ensure every field in `fields` is present on the card, replacing None and NaN with "".
+    Returns the same card dict for convenience.
+    """
+    for col in fields:
+        val = card.get(col)
+        if val is None or (isinstance(val, float) and val != val):
+            card[col] = ""
+    return card
+
+
+def parse_price(value, default=0.0):
+    """Parse a price such as 2, "2.50", "$1,200.00" or "" into a float (default when unparseable)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value or "").strip().replace("$", "").replace(",", "")
+    try:
+        return float(text)
+    except ValueError:
+        return default
+
+
+def parse_quantity(value, default=1):
+    """Parse a quantity such as 3 or "3" into an int (default when missing or unparseable)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(float(str(value).strip()))
+    except (TypeError, ValueError):
+        return default
+
 # Optionally, a Card class could be implemented if needed by the modular app.
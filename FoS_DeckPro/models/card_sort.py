@@ -0,0 +1,141 @@
+"""
+Multi-column sorting of card lists.
+
+Sort keys are type-aware: price and count columns compare as numbers, collector
+numbers naturally ("2" < "10" < "10a"), everything else as case-insensitive text.
+Blank or unparseable values go last whichever direction a column is sorted in.
+SortKeyCache remembers each column's keys as ranks per value, so re-sorting (the
+other direction, another filter result, an extra sort column) only looks ranks up
+and sorts ints.
+"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from FoS_DeckPro.models.inventory import NUMERIC_COLUMNS
+
+# Compared as runs of text and numbers rather than as plain numbers
+NATURAL_COLUMNS = {"Collector number"}
+
+# (column, descending) pairs, most significant first
+SortSpec = List[Tuple[str, bool]]
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+def natural_key(text: str) -> tuple:
+    """'10a' -> ('', 10, 'a'): text parts compare as text, digit runs as numbers."""
+    parts = _DIGITS.split(text.casefold())
+    parts[1::2] = [int(part) for part in parts[1::2]]
+    return tuple(parts)
+
+
+def sort_key(column: str, value):
+    """The sort key of a card's value in column, or None for a blank value."""
+    text = str(value).strip() if value is not None else ""
+    if not text:
+        return None
+    if column in NATURAL_COLUMNS:
+        return natural_key(text)
+    if column in NUMERIC_COLUMNS:
+        try:
+            number = float(text.replace("$", "").replace(",", ""))
+        except ValueError:
+            return None
+        return number if number == number else None  # NaN does not order
+    return text.casefold()
+
+
+def _hashable(value):
+    # List fields (from Scryfall data) sort by their text, which is what sort_key() uses anyway
+    return value if not isinstance(value, (list, dict, set)) else str(value)
+
+
+class SortKeyCache:
+    """
+    Per-column sort ranks of card values: each distinct value of a column gets the
+    position of its sort key among all keys seen in that column, so sorting compares
+    small ints instead of strings, floats or tuples. Keys and ranks are computed on
+    first use and only redone for a column when values it has not seen turn up.
+    They depend only on the value, so edited cards simply look up their new value.
+    Not thread-safe: a cache must only be used from one thread.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, dict] = {}  # column -> {value: sort key}
+        self._ranks: Dict[str, dict] = {}  # column -> {value: rank, or None for blanks}
+        self._counts: Dict[str, int] = {}  # column -> number of distinct non-blank keys
+
+    def ranks(self, column: str, cards: Sequence[dict]) -> Tuple[list, int]:
+        """
+        The rank of column's value for each of cards (ints ordering like the sort keys,
+        None for blanks), and how many ranks the column has.
+        """
+        ranks = self._ranks.get(column)
+        if ranks is not None:
+            try:
+                return [ranks[card.get(column, "")] for card in cards], self._counts[column]
+            except (KeyError, TypeError):
+                pass
+        ranks = self._rank_column(column, cards)
+        return [ranks[_hashable(card.get(column, ""))] for card in cards], self._counts[column]
+
+    def _rank_column(self, column, cards):
+        keys = self._keys.setdefault(column, {})
+        for card in cards:
+            value = _hashable(card.get(column, ""))
+            if value not in keys:
+                keys[value] = sort_key(column, value)
+        ordered = sorted({key for key in keys.values() if key is not None})
+        position = {key: rank for rank, key in enumerate(ordered)}
+        ranks = {value: None if key is None else position[key] for value, key in keys.items()}
+        self._ranks[column] = ranks
+        self._counts[column] = len(ordered)
+        return ranks
+
+    def clear(self, column: Optional[str] = None):
+        """Forget the keys of one column, or all of them."""
+        for table in (self._keys, self._ranks, self._counts):
+            if column is None:
+                table.clear()
+            else:
+                table.pop(column, None)
+
+
+def sort_cards(cards: Sequence[dict], spec: SortSpec, keys: Optional[SortKeyCache] = None) -> list:
+    """
+    Return cards sorted by spec. The sort is stable: cards that compare equal on
+    every sort column keep their relative order.
+    """
+    if keys is None:
+        keys = SortKeyCache()
+    # Fold the columns' ranks into one int per card, most significant column first,
+    # so a single sort handles every column and direction
+    combined = [0] * len(cards)
+    for column, descending in spec:
+        ranks, count = keys.ranks(column, cards)
+        base = count + 1
+        # Blanks take rank `count`: after every value in either direction
+        if descending:
+            combined = [c * base + (count if r is None else count - 1 - r) for c, r in zip(combined, ranks)]
+        else:
+            combined = [c * base + (count if r is None else r) for c, r in zip(combined, ranks)]
+    return [cards[i] for i in _sorted_indexes(combined)]
+
+
+def _sorted_indexes(keys: list, run: int = 16384) -> list:
+    """Indexes of keys in stable sorted order."""
+    # One list.sort() of a big list holds the GIL from start to end, stalling the GUI
+    # thread while a worker sorts. Sorting short runs and merging them pairwise keeps
+    # each stretch short; each merge is a single pass, as Timsort spots the two runs.
+    key = keys.__getitem__
+    runs = [sorted(range(start, min(start + run, len(keys))), key=key) for start in range(0, len(keys), run)]
+    while len(runs) > 1:
+        merged = []
+        for i in range(0, len(runs) - 1, 2):
+            pair = runs[i] + runs[i + 1]
+            pair.sort(key=key)
+            merged.append(pair)
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0] if runs else []
@@ -0,0 +1,122 @@
+"""
+Local card image library.
+
+Images downloaded by the bulk image sync are stored content-addressed: each file lives
+under image_library/objects/ at a path derived from the SHA-256 of its bytes, so an
+image served under several URLs is stored once and a file's name tells whether it is
+intact. A SQLite index (image_library.sqlite3) maps every image URL to its object, which
+is how lookups for a Scryfall image URL are rewritten to a local path. Unlike the image
+cache, nothing is ever evicted from the library.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+IMAGE_LIBRARY_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'image_library')
+IMAGE_LIBRARY_DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'image_library.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_images_sha256 ON images(sha256);
+"""
+
+
+class ImageLibrary:
+    """
+    Content-addressed image store with a URL index. Thread-safe: the download worker
+    adds images while the GUI looks them up.
+    """
+
+    def __init__(self, directory: str = IMAGE_LIBRARY_DIR, db_path: str = IMAGE_LIBRARY_DB_PATH):
+        self.directory = directory
+        self.db_path = db_path
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def object_path(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.directory, 'objects', sha256[:2], sha256 + ext)
+
+    def local_path(self, url: str) -> Optional[str]:
+        """The local file for an image URL, or None if the library does not have it."""
+        with self._lock:
+            row = self.conn.execute("SELECT sha256, ext FROM images WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        path = self.object_path(*row)
+        return path if os.path.exists(path) else None
+
+    def missing(self, urls: Iterable[str]) -> list:
+        """The URLs (deduplicated, in order) the library has no image for yet."""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        present = set()
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT url, sha256, ext FROM images WHERE url IN ({','.join('?' * len(chunk))})", chunk)
+                present.update(url for url, sha256, ext in rows if os.path.exists(self.object_path(sha256, ext)))
+        return [url for url in urls if url not in present]
+
+    def add(self, url: str, data: bytes) -> str:
+        """Store an image downloaded from url and return its local path."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        ext = os.path.splitext(urlsplit(url).path)[1].lower() or '.img'
+        path = self.object_path(sha256, ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO images (url, sha256, ext, size, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, sha256, ext, len(data), time.time()))
+        return path
+
+    def info(self) -> Dict[str, int]:
+        """URL count, distinct stored images and their total size in bytes."""
+        with self._lock:
+            urls, objects, size = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha256), "
+                "COALESCE((SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM images GROUP BY sha256)), 0) "
+                "FROM images").fetchone()
+        return {'urls': urls, 'images': objects, 'bytes': size}
+
+
+_shared_library: Optional[ImageLibrary] = None
+_shared_lock = threading.Lock()
+
+
+def get_image_library() -> ImageLibrary:
+    """The process-wide image library, opened on first use."""
+    global _shared_library
+    with _shared_lock:
+        if _shared_library is None:
+            _shared_library = ImageLibrary()
+        return _shared_library
+
+
+def open_image_library() -> Optional[ImageLibrary]:
+    """The shared library if one has been created on disk, else None (lookups stay cheap without one)."""
+    if _shared_library is None and not os.path.exists(IMAGE_LIBRARY_DB_PATH):
+        return None
+    return get_image_library()
@@ -1,102 +1,312 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Fields that identify a printing for merge/dedupe purposes
+KEY_FIELDS = ("Name", "Set code", "Collector number")
+
+
+def card_key(card):
+    """Return the normalized (Name, Set code, Collector number) identity of a card."""
+    return tuple(str(card.get(f, "") or "").strip().lower() for f in KEY_FIELDS)
+
+
+def is_hidden_field(field):
+    """Fields starting with '_' are bookkeeping (e.g. enrichment metadata), not card data to show or export."""
+    return field.startswith('_')
+
+
+def visible_fields(cards):
+    """Return the set of non-hidden field names used by any of cards."""
+    fields = set()
+    for card in cards:
+        fields.update(card.keys())
+    return {f for f in fields if not is_hidden_field(f)}
+
+
+NUMERIC_COLUMNS = {
+    "Purchase price", "Whatnot price", "Quantity", "cmc", "ManaBox ID", "Collector number",
+    # Scryfall price fields
+    "usd", "usd_foil", "usd_etched", "eur", "eur_foil", "eur_etched", "tix"
+}
+
+
+def _is_float(val):
+    try:
+        float(val)
+        return True
+    except Exception:
+        return False
+
+
+def _parse_range(val):
+    # Supports '>0.10', '<1.00', '0.10-0.20', '>=0.10', '<=1.00'
+    val = val.strip()
+    if re.match(r'^>=?\s*\d*\.?\d+$', val):
+        op = '>=' if val.startswith('>=') else '>'
+        num = float(val.lstrip('>=').strip())
+        return ('gt', op, num)
+    elif re.match(r'^<=?\s*\d*\.?\d+$', val):
+        op = '<=' if val.startswith('<=') else '<'
+        num = float(val.lstrip('<=').strip())
+        return ('lt', op, num)
+    elif '-' in val:
+        parts = val.split('-')
+        try:
+            low = float(parts[0].strip())
+            high = float(parts[1].strip())
+            return ('range', low, high)
+        except Exception:
+            return None
+    elif _is_float(val):
+        return ('eq', float(val))
+    else:
+        return None
+
+
+def _numeric_test(rng):
+    if rng[0] == 'eq':
+        return lambda num: num == rng[1]
+    if rng[0] == 'gt':
+        return (lambda num: num >= rng[2]) if rng[1] == '>=' else (lambda num: num > rng[2])
+    if rng[0] == 'lt':
+        return (lambda num: num <= rng[2]) if rng[1] == '<=' else (lambda num: num < rng[2])
+    return lambda num: rng[1] <= num <= rng[2]
+
+
+def card_matcher(filters):
+    """
+    Return a predicate card -> bool for filters ({column: text}, empty texts ignored).
+    Numeric columns accept '>0.10', '<=1', '0.10-0.20' or a number, falling back to a
+    substring test; a card whose value in a filtered numeric column is not a number never
+    matches. Other columns match case-insensitively by substring. The filter texts are
+    parsed once here rather than once per card.
+    """
+    checks = []
+    for key, value in filters.items():
+        if not value:
+            continue
+        needle = value.lower()
+        if key in NUMERIC_COLUMNS:
+            rng = _parse_range(value)
+            checks.append((key, True, _numeric_test(rng) if rng else None, needle))
+        else:
+            checks.append((key, False, None, needle))
+
+    def matches(card):
+        for key, numeric, test, needle in checks:
+            card_val = card.get(key, "")
+            if numeric:
+                # Remove $ if present, handle both string and float
+                try:
+                    card_num = float(str(card_val).replace("$", "").strip())
+                except Exception:
+                    return False
+                if test is not None:
+                    if not test(card_num):
+                        return False
+                    continue
+            # Substring match (also the fallback when a numeric filter isn't a valid range)
+            if needle not in str(card_val).lower():
+                return False
+        return True
+    return matches
+
+
+@dataclass
+class InventoryChange:
+    """
+    What changed in a CardInventory, as passed to its listeners:
+    RESET (everything may have changed), ADDED, REMOVED or UPDATED `cards`.
+    For UPDATED, `fields` names the fields that changed, or is None if any may have.
+    """
+    RESET = "reset"
+    ADDED = "added"
+    REMOVED = "removed"
+    UPDATED = "updated"
+
+    kind: str
+    cards: list
+    fields: Optional[set] = None
+
+
 class CardInventory:
     def __init__(self):
         self.cards = []
+        self._key_index = None
+        self._field_names = None
+        self._indexed_count = 0
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Call listener(InventoryChange) after each change, on the thread that made it."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, kind, cards=(), fields=None):
+        if self._listeners and (cards or kind == InventoryChange.RESET):
+            change = InventoryChange(kind, list(cards), fields)
+            for listener in list(self._listeners):
+                listener(change)
+
+    def notify_updated(self, cards, fields=None):
+        """Tell listeners that cards were edited in place by the caller."""
+        self._notify(InventoryChange.UPDATED, cards, set(fields) if fields is not None else None)
 
     def load_cards(self, cards):
         self.cards = cards.copy()
+        self._invalidate_indexes()
+        self._notify(InventoryChange.RESET)
+
+    def extend_cards(self, cards):
+        """Bulk-append cards, keeping any built indexes up to date."""
+        self.cards.extend(cards)
+        if self._key_index is not None and self._indexed_count + len(cards) == len(self.cards):
+            for card in cards:
+                self._key_index[card_key(card)] = card
+                self._field_names.update(card.keys())
+            self._indexed_count = len(self.cards)
+        self._notify(InventoryChange.ADDED, cards)
 
     def get_all_cards(self):
         return self.cards
 
+    def _invalidate_indexes(self):
+        self._key_index = None
+        self._field_names = None
+        self._indexed_count = 0
+
+    def build_indexes(self):
+        """
+        Build the key and field-name indexes over the current cards.
+        Called after bulk loads so later lookups and merges don't rescan the inventory.
+        """
+        key_index = {}
+        field_names = set()
+        for card in self.cards:
+            key_index[card_key(card)] = card
+            field_names.update(card.keys())
+        self._key_index = key_index
+        self._field_names = field_names
+        self._indexed_count = len(self.cards)
+
+    def _ensure_indexes(self):
+        # Callers sometimes append to get_all_cards() directly; a length mismatch means the index is stale
+        if self._key_index is None or self._indexed_count != len(self.cards):
+            self.build_indexes()
+
+    def find_by_key(self, key):
+        """Return the card with the given card_key() tuple, or None."""
+        self._ensure_indexes()
+        return self._key_index.get(key)
+
+    def key_index_snapshot(self):
+        """Return a shallow copy of the key -> card index (used to pin merge targets for one import)."""
+        self._ensure_indexes()
+        return dict(self._key_index)
+
+    def merge_by_key(self, new_cards, existing_index=None):
+        """
+        Merge cards by card_key(): non-empty fields of a matching card overwrite the existing
+        card, unmatched cards are appended.
+        existing_index: key -> card map to match against (defaults to the live index). Passing a
+        snapshot taken before an import keeps rows of the same file from merging into each other.
+        Returns (added, updated).
+        """
+        self._ensure_indexes()
+        targets = self._key_index if existing_index is None else existing_index
+        appended, merged, merged_fields = [], [], set()
+        for new_card in new_cards:
+            k = card_key(new_card)
+            existing = targets.get(k)
+            if existing is not None:
+                for field, value in new_card.items():
+                    if value not in (None, ""):
+                        existing[field] = value
+                        merged_fields.add(field)
+                merged.append(existing)
+            else:
+                self.cards.append(new_card)
+                self._key_index[k] = new_card
+                appended.append(new_card)
+            self._field_names.update(new_card.keys())
+        self._indexed_count = len(self.cards)
+        self._notify(InventoryChange.ADDED, appended)
+        self._notify(InventoryChange.UPDATED, merged, merged_fields)
+        return len(appended), len(merged)
+
+    def get_unique_fields(self):
+        """Return the set of all field names used by any card."""
+        self._ensure_indexes()
+        return set(self._field_names)
+
+    def get_visible_fields(self):
+        """Return the set of field names to show or export: get_unique_fields() without hidden fields."""
+        return {f for f in self.get_unique_fields() if not is_hidden_field(f)}
+
     def filter_cards(self, filters):
         # filters: dict of {column: value}
-        import re
-        NUMERIC_COLUMNS = {
-            "Purchase price", "Whatnot price", "Quantity", "cmc", "ManaBox ID", "Collector number",
-            # Scryfall price fields
-            "usd", "usd_foil", "usd_etched", "eur", "eur_foil", "eur_etched", "tix"
-        }
-        def is_float(val):
-            try:
-                float(val)
-                return True
-            except Exception:
-                return False
-        def parse_range(val):
-            # Supports '>0.10', '<1.00', '0.10-0.20', '>=0.10', '<=1.00'
-            val = val.strip()
-            if re.match(r'^>=?\s*\d*\.?\d+$', val):
-                op = '>=' if val.startswith('>=') else '>'
-                num = float(val.lstrip('>=').strip())
-                return ('gt', op, num)
-            elif re.match(r'^<=?\s*\d*\.?\d+$', val):
-                op = '<=' if val.startswith('<=') else '<'
-                num = float(val.lstrip('<=') .strip())
-                return ('lt', op, num)
-            elif '-' in val:
-                parts = val.split('-')
-                try:
-                    low = float(parts[0].strip())
-                    high = float(parts[1].strip())
-                    return ('range', low, high)
-                except Exception:
-                    return None
-            elif is_float(val):
-                return ('eq', float(val))
-            else:
-                return None
-        def matches(card):
-            for key, value in filters.items():
-                if not value:
-                    continue
-                card_val = card.get(key, "")
-                # Numeric/range filtering for numeric columns
-                if key in NUMERIC_COLUMNS:
-                    # Remove $ if present, handle both string and float
-                    try:
-                        card_num = float(str(card_val).replace("$", "").strip())
-                    except Exception:
-                        return False
-                    rng = parse_range(value)
-                    if rng:
-                        if rng[0] == 'eq':
-                            if card_num != rng[1]:
-                                return False
-                        elif rng[0] == 'gt':
-                            if rng[1] == '>=':
-                                if not (card_num >= rng[2]):
-                                    return False
-                            else:
-                                if not (card_num > rng[2]):
-                                    return False
-                        elif rng[0] == 'lt':
-                            if rng[1] == '<=':
-                                if not (card_num <= rng[2]):
-                                    return False
-                            else:
-                                if not (card_num < rng[2]):
-                                    return False
-                        elif rng[0] == 'range':
-                            if not (rng[1] <= card_num <= rng[2]):
-                                return False
-                        else:
-                            return False
-                    else:
-                        # Fallback to substring if not a valid numeric filter
-                        if value.lower() not in str(card_val).lower():
-                            return False
-                else:
-                    if value.lower() not in str(card_val).lower():
-                        return False
-            return True
+        matches = card_matcher(filters)
         return [card for card in self.cards if matches(card)]
 
     def remove_cards(self, cards_to_remove):
         """Remove all cards in cards_to_remove from the inventory."""
-        # Remove by identity or dict equality
-        new_cards = [c for c in self.cards if c not in cards_to_remove]
+        # Remove by identity, or by dict equality for cards that are not the inventory's own
+        doomed = {id(c) for c in cards_to_remove}
+        new_cards, removed = [], []
+        for c in self.cards:
+            (removed if id(c) in doomed else new_cards).append(c)
+        found = {id(c) for c in removed}
+        copies = [c for c in cards_to_remove if id(c) not in found]
+        if copies:
+            kept = []
+            for c in new_cards:
+                (removed if c in copies else kept).append(c)
+            new_cards = kept
         self.cards = new_cards
+        # Rebuilt on next use: another copy of a removed printing may still be in the inventory
+        self._invalidate_indexes()
+        self._notify(InventoryChange.REMOVED, removed)
+
+    def update_fields(self, updates):
+        """
+        Apply (card, fields) updates in place, e.g. a batch of enrichment results.
+        Fields must not include the key fields; returns the number of cards updated.
+        """
+        count = 0
+        cards, changed = [], set()
+        for card, fields in updates:
+            card.update(fields)
+            if self._field_names is not None:
+                self._field_names.update(fields)
+            cards.append(card)
+            changed.update(fields)
+            count += 1
+        self._notify(InventoryChange.UPDATED, cards, changed)
+        return count
+
+    def replace_card(self, card, new_card):
+        """
+        Give card the contents of new_card, keeping the card object (and its place).
+        Hidden fields that new_card does not set are kept, as editors only know the visible ones.
+        """
+        old_key = card_key(card)
+        hidden = {f: v for f, v in card.items() if is_hidden_field(f) and f not in new_card}
+        card.clear()
+        card.update(new_card)
+        card.update(hidden)
+        if self._key_index is not None:
+            if card_key(card) != old_key:
+                # Other copies of the old printing may be in the inventory; rebuild on next use
+                self._invalidate_indexes()
+            else:
+                self._field_names.update(card.keys())
+        self._notify(InventoryChange.UPDATED, [card])
 
     def add_card(self, card):
         """Add a single card to the inventory."""
         self.cards.append(card.copy() if isinstance(card, dict) else card)
+        self._notify(InventoryChange.ADDED, self.cards[-1:])
@@ -15,6 +15,8 @@ import threading
 import queue
 import hashlib
 
+from FoS_DeckPro.models.scryfall_api import AsyncScryfallAPI
+
 # Import unified system for optimization
 try:
     from aptpt_pyside6_kit.unified_system_manager import unified_manager
@@ -179,11 +181,13 @@ class PriceTracker:
     
     async def _update_prices_batch(self, cards: List[Tuple[str, str]]):
         """Update prices for a batch of cards"""
-        async with aiohttp.ClientSession() as session:
+        # Scryfall lookups go through the shared client, so they respect the app-wide rate limit and cache
+        async with aiohttp.ClientSession() as session, \
+                AsyncScryfallAPI(concurrency=self.max_concurrent_requests) as scryfall:
             # Create tasks for concurrent price updates
             tasks = []
             for card_name, set_code in cards:
-                task = self._update_card_price(session, card_name, set_code)
+                task = self._update_card_price(session, scryfall, card_name, set_code)
                 tasks.append(task)
             
             # Execute tasks with concurrency limit
@@ -200,11 +204,11 @@ class PriceTracker:
                 if isinstance(result, Exception):
                     self._log_error(f"Price update failed: {result}")
     
-    async def _update_card_price(self, session: aiohttp.ClientSession, card_name: str, set_code: str):
+    async def _update_card_price(self, session: aiohttp.ClientSession, scryfall: AsyncScryfallAPI, card_name: str, set_code: str):
         """Update price for a single card"""
         try:
             # Get price from Scryfall (primary source)
-            scryfall_price = await self._get_scryfall_price(session, card_name, set_code)
+            scryfall_price = await self._get_scryfall_price(scryfall, card_name, set_code)
             
             # Get price from TCGPlayer (secondary source)
             tcgplayer_price = await self._get_tcgplayer_price(session, card_name, set_code)
@@ -227,26 +231,20 @@ class PriceTracker:
         except Exception as e:
             self._log_error(f"Failed to update price for {card_name} ({set_code}): {e}")
     
-    async def _get_scryfall_price(self, session: aiohttp.ClientSession, card_name: str, set_code: str) -> Optional[PriceData]:
+    async def _get_scryfall_price(self, scryfall: AsyncScryfallAPI, card_name: str, set_code: str) -> Optional[PriceData]:
         """Get price from Scryfall API"""
         try:
-            # Use existing Scryfall integration
-            from models.scryfall_api import fetch_scryfall_data
-            
-            # Search for the card
-            search_query = f'name:"{card_name}" set:{set_code}'
-            card_data = await fetch_scryfall_data(search_query)
+            card = await scryfall.card_named(card_name, set_code)
             
-            if card_data and len(card_data) > 0:
-                card = card_data[0]
+            if card is not None:
                 return PriceData(
                     card_name=card_name,
                     set_code=set_code,
-                    price_usd=float(card.get('usd', 0)) if card.get('usd') else 0,
-                    price_usd_foil=float(card.get('usd_foil', 0)) if card.get('usd_foil') else None,
-                    price_usd_etched=float(card.get('usd_etched', 0)) if card.get('usd_etched') else None,
-                    price_eur=float(card.get('eur', 0)) if card.get('eur') else None,
-                    price_eur_foil=float(card.get('eur_foil', 0)) if card.get('eur_foil') else None,
+                    price_usd=card.price('usd') or 0,
+                    price_usd_foil=card.price('usd_foil'),
+                    price_usd_etched=card.price('usd_etched'),
+                    price_eur=card.price('eur'),
+                    price_eur_foil=card.price('eur_foil'),
                     source=PriceSource.SCRYFALL,
                     timestamp=datetime.utcnow(),
                     confidence=0.9
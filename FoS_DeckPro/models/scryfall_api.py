@@ -1,106 +1,433 @@
+"""
+Scryfall card API.
+
+ScryfallCard is a typed view of a Scryfall card object, and CARD_FIELDS says how each
+inventory field is extracted from one, so callers can project a response onto just the
+fields they store. ScryfallAPI and AsyncScryfallAPI look cards up through the shared
+client (pooled transport, rate limiter, response cache); the collection iterators below
+batch many printings per request.
+"""
+import asyncio
+import json
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import aiohttp
 import requests
-from typing import Dict, Any
-
-def fetch_scryfall_data(scryfall_id: str) -> Dict[str, Any]:
-    """
-    Fetch card data from Scryfall API including all price fields and purchase URIs.
-    
-    Args:
-        scryfall_id: The Scryfall ID of the card to fetch
-        
-    Returns:
-        Dict containing all card data including:
-        - Basic card info (type_line, mana_cost, etc.)
-        - Price fields (usd, usd_foil, usd_etched, eur, eur_foil, eur_etched, tix)
-        - Purchase URIs (tcgplayer_url, cardmarket_url, cardhoarder_url)
-        - Image URL
-        - Legality info
-    """
-    url = f"https://api.scryfall.com/cards/{scryfall_id}"
+
+from FoS_DeckPro.models.scryfall_client import (
+    SCRYFALL_API_URL, AsyncScryfallClient, ScryfallClient, get_scryfall_client)
+from FoS_DeckPro.utils.http_cache import ResponseCache
+
+# Maximum number of identifiers Scryfall accepts per /cards/collection request
+COLLECTION_BATCH_SIZE = 75
+
+
+@dataclass(frozen=True)
+class ScryfallCard:
+    """
+    Typed, read-only view of a Scryfall card object. Attributes are read from the raw
+    JSON (`data`) on access, so wrapping a response costs nothing until a field is used.
+    """
+    data: Dict[str, Any]
+
+    @property
+    def id(self) -> str:
+        return str(self.data.get("id", ""))
+
+    @property
+    def name(self) -> str:
+        return self.data.get("name", "")
+
+    @property
+    def set_code(self) -> str:
+        return str(self.data.get("set", "")).upper()
+
+    @property
+    def set_name(self) -> str:
+        return self.data.get("set_name", "")
+
+    @property
+    def collector_number(self) -> str:
+        return self.data.get("collector_number", "")
+
+    @property
+    def rarity(self) -> str:
+        return self.data.get("rarity", "")
+
+    @property
+    def lang(self) -> str:
+        return self.data.get("lang", "")
+
+    @property
+    def type_line(self) -> str:
+        return self.data.get("type_line", "")
+
+    @property
+    def mana_cost(self) -> str:
+        return self.data.get("mana_cost", "")
+
+    @property
+    def oracle_text(self) -> str:
+        return self.data.get("oracle_text", "")
+
+    @property
+    def cmc(self) -> Optional[float]:
+        return self.data.get("cmc")
+
+    @property
+    def colors(self) -> List[str]:
+        return self.data.get("colors", [])
+
+    @property
+    def color_identity(self) -> List[str]:
+        return self.data.get("color_identity", [])
+
+    @property
+    def image_url(self) -> str:
+        """The 'normal' image, or the front face's for double-faced cards."""
+        if "image_uris" in self.data:
+            return self.data["image_uris"].get("normal", "")
+        faces = self.data.get("card_faces") or []
+        if faces:
+            return faces[0].get("image_uris", {}).get("normal", "")
+        return ""
+
+    def legality(self, format_name: str) -> str:
+        return self.data.get("legalities", {}).get(format_name, "unknown")
+
+    def price(self, kind: str = "usd") -> Optional[float]:
+        """A price such as 'usd', 'usd_foil' or 'eur' as a float, None if Scryfall has none."""
+        value = (self.data.get("prices") or {}).get(kind)
+        try:
+            return float(value) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    def purchase_url(self, store: str) -> str:
+        return self.data.get("purchase_uris", {}).get(store, "")
+
+    def fields(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """The inventory fields in CARD_FIELDS, or only `names` if given."""
+        names = CARD_FIELDS if names is None else names
+        return {name: CARD_FIELDS[name](self) for name in names}
+
+    def inventory_card(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """A new inventory card: the identity fields plus fields() (all, or only `fields`)."""
+        card = {name: extract(self) for name, extract in IDENTITY_FIELDS.items()}
+        card.update(self.fields(fields))
+        return card
+
+
+def _raw_price(kind: str) -> Callable[[ScryfallCard], Any]:
+    # Inventory prices keep Scryfall's string form
+    return lambda card: card.data.get("prices", {}).get(kind, "")
+
+
+# Identity fields of a new inventory card
+IDENTITY_FIELDS: Dict[str, Callable[[ScryfallCard], Any]] = {
+    "Name": lambda card: card.name,
+    "Set name": lambda card: card.set_name,
+    "Set code": lambda card: card.set_code,
+    "Collector number": lambda card: card.collector_number,
+    "Rarity": lambda card: card.rarity,
+    "Language": lambda card: card.lang,
+    "Scryfall ID": lambda card: card.id,
+}
+
+# Inventory fields enrichment takes from Scryfall, in column order
+CARD_FIELDS: Dict[str, Callable[[ScryfallCard], Any]] = {
+    # Basic card info
+    "type_line": lambda card: card.type_line,
+    "mana_cost": lambda card: card.mana_cost,
+    "colors": lambda card: ", ".join(card.colors),
+    "color_identity": lambda card: ", ".join(card.color_identity),
+    "oracle_text": lambda card: card.oracle_text,
+    "cmc": lambda card: str(card.data.get("cmc", "")),
+    "image_url": lambda card: card.image_url,
+    # Legality info
+    "legal_commander": lambda card: card.legality("commander"),
+    "legal_pauper": lambda card: card.legality("pauper"),
+    # Price fields
+    "usd": _raw_price("usd"),
+    "usd_foil": _raw_price("usd_foil"),
+    "usd_etched": _raw_price("usd_etched"),
+    "eur": _raw_price("eur"),
+    "eur_foil": _raw_price("eur_foil"),
+    "eur_etched": _raw_price("eur_etched"),
+    "tix": _raw_price("tix"),
+    # Purchase URIs
+    "tcgplayer_url": lambda card: card.purchase_url("tcgplayer"),
+    "cardmarket_url": lambda card: card.purchase_url("cardmarket"),
+    "cardhoarder_url": lambda card: card.purchase_url("cardhoarder"),
+}
+
+
+def card_fields_from_scryfall(data: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Extract the inventory fields (card info, legality, prices and purchase URLs) from a
+    Scryfall card object; only `fields` if given.
+    """
+    return ScryfallCard(data).fields(fields)
+
+
+def inventory_card_from_scryfall(data: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Build a new inventory card (identity fields plus card_fields_from_scryfall) from a Scryfall card object."""
+    return ScryfallCard(data).inventory_card(fields)
+
+
+def _named_params(name: str, set_code: str, exact: bool) -> Dict[str, str]:
+    params = {"exact" if exact else "fuzzy": name}
+    if set_code:
+        params["set"] = set_code.lower()
+    return params
+
+
+class ScryfallAPI:
+    """
+    Card lookups through a ScryfallClient (default: the shared one). Lookups return a
+    ScryfallCard, or None when Scryfall has no such card; other HTTP and connection
+    errors raise requests.RequestException. data_class picks the cache freshness.
+    """
+
+    def __init__(self, client: Optional[ScryfallClient] = None):
+        self.client = client or get_scryfall_client()
+
+    def card(self, identifier: Dict[str, str], data_class: str = 'prices') -> Optional[ScryfallCard]:
+        """Look up a collection identifier (Scryfall ID, or set and collector number)."""
+        return self._card(card_url(identifier, self.client.base_url), data_class)
+
+    def card_by_id(self, scryfall_id: str, data_class: str = 'prices') -> Optional[ScryfallCard]:
+        return self.card({"id": scryfall_id.strip()}, data_class)
+
+    def card_named(self, name: str, set_code: str = "", exact: bool = True,
+                   data_class: str = 'prices') -> Optional[ScryfallCard]:
+        """Look up a card by exact (or fuzzy) name, optionally within a set."""
+        return self._card("/cards/named", data_class, _named_params(name, set_code, exact))
+
+    def collection(self, identifiers: Iterable[Dict[str, str]], data_class: str = 'prices'):
+        """iter_scryfall_collection() through this client."""
+        return iter_scryfall_collection(identifiers, self.client, data_class=data_class)
+
+    def _card(self, url: str, data_class: str, params: Optional[dict] = None) -> Optional[ScryfallCard]:
+        try:
+            return ScryfallCard(self.client.get_json(url, data_class, params))
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+
+class AsyncScryfallAPI:
+    """
+    Async ScryfallAPI over an AsyncScryfallClient, sharing the sync client's transport
+    settings, rate limiter and response cache. Use as an async context manager inside
+    the event loop that makes the requests; errors other than 404 raise aiohttp.ClientError.
+    """
+
+    def __init__(self, client: Optional[ScryfallClient] = None, concurrency: int = 4):
+        self.client = AsyncScryfallClient(client, concurrency)
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.__aexit__(*exc)
+
+    async def card(self, identifier: Dict[str, str], data_class: str = 'prices') -> Optional[ScryfallCard]:
+        return await self._card(card_url(identifier, self.client.base_url), data_class)
+
+    async def card_by_id(self, scryfall_id: str, data_class: str = 'prices') -> Optional[ScryfallCard]:
+        return await self.card({"id": scryfall_id.strip()}, data_class)
+
+    async def card_named(self, name: str, set_code: str = "", exact: bool = True,
+                         data_class: str = 'prices') -> Optional[ScryfallCard]:
+        return await self._card("/cards/named", data_class, _named_params(name, set_code, exact))
+
+    def collection(self, identifiers: Iterable[Dict[str, str]], data_class: str = 'prices',
+                   concurrency: Optional[int] = None):
+        """aiter_scryfall_collection() through this client."""
+        return aiter_scryfall_collection(identifiers, self.client, data_class=data_class,
+                                         concurrency=concurrency or self.client.concurrency)
+
+    async def _card(self, url: str, data_class: str, params: Optional[dict] = None) -> Optional[ScryfallCard]:
+        try:
+            return ScryfallCard(await self.client.get_json(url, data_class, params))
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                return None
+            raise
+
+
+def fetch_scryfall_data(scryfall_id: str, data_class: str = 'prices',
+                        fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Fetch a card's inventory fields (card info, legality, prices and purchase URLs, or
+    only `fields`) by Scryfall ID. Returns an empty dict if the card is not found or
+    the lookup fails, so callers can merge the result into cards without losing data.
+    """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Get the image URL from the card data
-        image_url = ""
-        if "image_uris" in data:
-            image_url = data["image_uris"].get("normal", "")
-        elif "card_faces" in data and len(data["card_faces"]) > 0:
-            # Handle double-faced cards
-            image_url = data["card_faces"][0]["image_uris"].get("normal", "")
-            
-        # Extract price fields from the prices object
-        prices = data.get("prices", {})
-        usd = prices.get("usd", "")
-        usd_foil = prices.get("usd_foil", "")
-        usd_etched = prices.get("usd_etched", "")
-        eur = prices.get("eur", "")
-        eur_foil = prices.get("eur_foil", "")
-        eur_etched = prices.get("eur_etched", "")
-        tix = prices.get("tix", "")
-        
-        # Extract purchase URIs
-        purchase_uris = data.get("purchase_uris", {})
-        tcgplayer_url = purchase_uris.get("tcgplayer", "")
-        cardmarket_url = purchase_uris.get("cardmarket", "")
-        cardhoarder_url = purchase_uris.get("cardhoarder", "")
-        
-        return {
-            # Basic card info
-            "type_line": data.get("type_line", ""),
-            "mana_cost": data.get("mana_cost", ""),
-            "colors": ", ".join(data.get("colors", [])),
-            "color_identity": ", ".join(data.get("color_identity", [])),
-            "oracle_text": data.get("oracle_text", ""),
-            "cmc": str(data.get("cmc", "")),
-            "image_url": image_url,
-            
-            # Legality info
-            "legal_commander": data.get("legalities", {}).get("commander", "unknown"),
-            "legal_pauper": data.get("legalities", {}).get("pauper", "unknown"),
-            
-            # Price fields
-            "usd": usd,
-            "usd_foil": usd_foil,
-            "usd_etched": usd_etched,
-            "eur": eur,
-            "eur_foil": eur_foil,
-            "eur_etched": eur_etched,
-            "tix": tix,
-            
-            # Purchase URIs
-            "tcgplayer_url": tcgplayer_url,
-            "cardmarket_url": cardmarket_url,
-            "cardhoarder_url": cardhoarder_url
-        }
+        card = ScryfallAPI().card_by_id(scryfall_id, data_class)
     except Exception as e:
         print(f"❌ Error fetching {scryfall_id}: {e}")
-        return {
-            # Basic card info
-            "type_line": "ERROR",
-            "mana_cost": "",
-            "colors": "",
-            "color_identity": "",
-            "oracle_text": "",
-            "cmc": "",
-            "image_url": "",
-            
-            # Legality info
-            "legal_commander": "unknown",
-            "legal_pauper": "unknown",
-            
-            # Price fields
-            "usd": "",
-            "usd_foil": "",
-            "usd_etched": "",
-            "eur": "",
-            "eur_foil": "",
-            "eur_etched": "",
-            "tix": "",
-            
-            # Purchase URIs
-            "tcgplayer_url": "",
-            "cardmarket_url": "",
-            "cardhoarder_url": ""
-        }
+        return {}
+    return card.fields(fields) if card is not None else {}
+
+
+def get_card_price(card_name: str, foil: bool = False) -> Optional[float]:
+    """The USD (or foil USD) price of a card looked up by fuzzy name, None if unavailable."""
+    try:
+        card = ScryfallAPI().card_named(card_name, exact=False)
+    except Exception as e:
+        print(f"Error fetching price for {card_name}: {e}")
+        return None
+    if card is None:
+        return None
+    return card.price("usd_foil" if foil else "usd")
+
+
+def collection_identifier(card: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Return the /cards/collection identifier for an inventory card: its Scryfall ID, or
+    else its set code and collector number. None if the card has neither.
+    """
+    scryfall_id = str(card.get("Scryfall ID", "") or "").strip()
+    if scryfall_id:
+        return {"id": scryfall_id}
+    set_code = str(card.get("Set code", "") or "").strip()
+    number = str(card.get("Collector number", "") or "").strip()
+    if set_code and number:
+        return {"set": set_code, "collector_number": number}
+    return None
+
+
+def identifier_key(identifier: Dict[str, str]) -> Tuple[str, ...]:
+    """Hashable, case-insensitive key for a collection identifier."""
+    if "id" in identifier:
+        return ("id", identifier["id"].lower())
+    return ("set", identifier["set"].lower(), identifier["collector_number"].lower())
+
+
+def card_url(identifier: Dict[str, str], base_url: str = SCRYFALL_API_URL) -> str:
+    """The single-card endpoint for a collection identifier; also its response cache key."""
+    if "id" in identifier:
+        return f"{base_url}/cards/{identifier['id'].lower()}"
+    return f"{base_url}/cards/{identifier['set'].lower()}/{identifier['collector_number'].lower()}"
+
+
+def _result_keys(data: Dict[str, Any]) -> List[Tuple[str, ...]]:
+    # Every identifier key a returned card object can answer
+    keys = [("id", str(data.get("id", "")).lower())]
+    if data.get("set") and data.get("collector_number"):
+        keys.append(("set", str(data["set"]).lower(), str(data["collector_number"]).lower()))
+    return keys
+
+
+def _split_cached(identifiers: Iterable[Dict[str, str]], cache: ResponseCache, base_url: str, data_class: str):
+    # Deduplicate identifiers and answer what the cache holds fresh; returns (found, pending, total)
+    unique = {}
+    for identifier in identifiers:
+        unique.setdefault(identifier_key(identifier), identifier)
+    urls = {key: card_url(ident, base_url) for key, ident in unique.items()}
+    cached = cache.get_many_json(urls.values(), data_class)
+    found = {key: cached[url] for key, url in urls.items() if url in cached}
+    pending = [ident for key, ident in unique.items() if key not in found]
+    return found, pending, len(unique)
+
+
+def _collection_results(batch: List[Dict[str, str]], payload: Dict[str, Any], cache: ResponseCache, base_url: str):
+    # Map a /cards/collection response to identifier keys, caching each card under the
+    # URL it was asked for and under its ID; returns (found, not_found)
+    found = {}
+    for data in payload.get("data", []):
+        for key in _result_keys(data):
+            found[key] = data
+    entries = {}
+    for ident in batch:
+        data = found.get(identifier_key(ident))
+        if data is not None:
+            body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            entries[card_url(ident, base_url)] = body
+            entries[card_url({"id": str(data.get("id", ""))}, base_url)] = body
+    cache.put_many((url, body, None, None) for url, body in entries.items())
+    return found, payload.get("not_found", [])
+
+
+def iter_scryfall_collection(identifiers: Iterable[Dict[str, str]], client: Optional[ScryfallClient] = None,
+                             cache: Optional[ResponseCache] = None,
+                             data_class: str = 'prices') -> Iterator[Tuple[Dict[Tuple[str, ...], Dict[str, Any]], List[Dict[str, str]], int, int]]:
+    """
+    Look up cards through /cards/collection, COLLECTION_BATCH_SIZE identifiers per request,
+    using the shared rate-limited client unless one is given.
+    Identifiers are deduplicated first, so each printing is requested once, and printings
+    the client's response cache holds fresh for data_class are not requested at all;
+    fetched cards are cached under their card_url().
+    Yields (found, not_found, identifiers_done, identifiers_total) after each request, where
+    found maps identifier_key() to the Scryfall card object.
+    """
+    if client is None:
+        client = get_scryfall_client()
+    if cache is None:
+        cache = client.cache
+    found, pending, total = _split_cached(identifiers, cache, client.base_url, data_class)
+    if found:
+        yield found, [], len(found), total
+    done = len(found)
+    for start in range(0, len(pending), COLLECTION_BATCH_SIZE):
+        batch = pending[start:start + COLLECTION_BATCH_SIZE]
+        response = client.post("/cards/collection", json={"identifiers": batch})
+        response.raise_for_status()
+        found, not_found = _collection_results(batch, response.json(), cache, client.base_url)
+        done += len(batch)
+        yield found, not_found, done, total
+
+
+async def aiter_scryfall_collection(identifiers: Iterable[Dict[str, str]], client: Optional[AsyncScryfallClient] = None,
+                                    cache: Optional[ResponseCache] = None, data_class: str = 'prices',
+                                    concurrency: int = 4) -> AsyncIterator[Tuple[Dict[Tuple[str, ...], Dict[str, Any]], List[Dict[str, str]], int, int]]:
+    """
+    Async iter_scryfall_collection: up to `concurrency` /cards/collection requests are in
+    flight at once (all under the shared rate limit) and batches are yielded as they
+    complete, not in request order. Closing the iterator early cancels outstanding requests.
+    """
+    if client is None:
+        async with AsyncScryfallClient(concurrency=concurrency) as client:
+            async with aclosing(aiter_scryfall_collection(identifiers, client, cache, data_class, concurrency)) as results:
+                async for result in results:
+                    yield result
+        return
+    if cache is None:
+        cache = client.cache
+    found, pending, total = _split_cached(identifiers, cache, client.base_url, data_class)
+    if found:
+        yield found, [], len(found), total
+    done = len(found)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch(batch):
+        async with slots:
+            return batch, await client.post_json("/cards/collection", {"identifiers": batch})
+
+    tasks = [asyncio.ensure_future(fetch(pending[start:start + COLLECTION_BATCH_SIZE]))
+             for start in range(0, len(pending), COLLECTION_BATCH_SIZE)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            batch, payload = await next_done
+            found, not_found = _collection_results(batch, payload, cache, client.base_url)
+            done += len(batch)
+            yield found, not_found, done, total
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_scryfall_collection(identifiers: Iterable[Dict[str, str]], **kwargs) -> Tuple[Dict[Tuple[str, ...], Dict[str, Any]], List[Dict[str, str]]]:
+    """Fetch all identifiers via /cards/collection. Returns (found by identifier_key, not_found)."""
+    found, not_found = {}, []
+    for batch_found, batch_missing, _, _ in iter_scryfall_collection(identifiers, **kwargs):
+        found.update(batch_found)
+        not_found.extend(batch_missing)
+    return found, not_found
@@ -0,0 +1,234 @@
+"""
+Offline mirror of Scryfall bulk data.
+
+Scryfall publishes daily JSON dumps of every card (default_cards, all_cards, ...). This
+module streams such a file into a local SQLite store, one card at a time, and indexes it
+by Scryfall ID, by (set, collector number) and by normalized card name so enrichment and
+lookups can be answered locally without any network requests. Importing a newer dump
+over an existing store refreshes it in place.
+"""
+import gzip
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from FoS_DeckPro.models.scryfall_api import ScryfallCard, identifier_key
+from FoS_DeckPro.utils.json_stream import JsonArrayReader
+
+SCRYFALL_BULK_DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'scryfall_bulk.sqlite3')
+
+# Scryfall card keys kept in the mirror (enough for every field the app extracts)
+STORED_KEYS = (
+    "id", "name", "lang", "released_at", "set", "set_name", "collector_number", "rarity",
+    "type_line", "mana_cost", "cmc", "colors", "color_identity", "oracle_text", "power", "toughness",
+    "artist", "image_uris", "card_faces", "legalities", "prices", "purchase_uris",
+)
+_FACE_KEYS = ("name", "mana_cost", "type_line", "oracle_text", "image_uris")
+
+IMPORT_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    set_code TEXT NOT NULL,
+    collector_number TEXT NOT NULL,
+    lang TEXT,
+    released_at TEXT,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS card_names (
+    name_norm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (name_norm, id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cards_set_number ON cards(set_code, collector_number);
+CREATE INDEX IF NOT EXISTS idx_card_names_id ON card_names(id);
+"""
+
+
+def normalize_card_name(name: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace, so 'Jace, the Mind Sculptor' == 'jace the mind sculptor'."""
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", str(name).lower()).split())
+
+
+def _trim(card: Dict[str, Any]) -> Dict[str, Any]:
+    trimmed = {k: card[k] for k in STORED_KEYS if k in card}
+    if "card_faces" in trimmed:
+        trimmed["card_faces"] = [{k: face[k] for k in _FACE_KEYS if k in face} for face in trimmed["card_faces"]]
+    return trimmed
+
+
+def _names(card: Dict[str, Any]) -> List[str]:
+    # Full name plus each face name, so 'Delver of Secrets' finds 'Delver of Secrets // Insectile Aberration'
+    names = {normalize_card_name(card.get("name", ""))}
+    for face in card.get("card_faces", []) or []:
+        names.add(normalize_card_name(face.get("name", "")))
+    names.discard("")
+    return list(names)
+
+
+def _open_binary(path: str):
+    if path.lower().endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+class ScryfallBulkStore:
+    """
+    Local, indexed store of Scryfall card objects imported from a bulk-data file.
+    Create one instance per thread (SQLite connections are not shared across threads).
+    """
+
+    def __init__(self, db_path: str = SCRYFALL_BULK_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- Import ---
+
+    def import_file(self, path: str, progress: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Stream a Scryfall bulk-data JSON file (optionally .gz) into the store, replacing
+        cards that are already present. Everything is committed in one transaction, so a
+        cancelled or failed import leaves the previous data intact.
+        progress(kib_read, kib_total) is called after each batch. Returns the number of cards imported.
+        """
+        total = os.path.getsize(path) // 1024
+        count = 0
+        cards, names = [], []
+        with _open_binary(path) as f:
+            raw = f.fileobj if isinstance(f, gzip.GzipFile) else f
+            reader = JsonArrayReader(f)
+            with self.conn:
+                for card in reader:
+                    if not isinstance(card, dict) or card.get("object", "card") != "card" or not card.get("id"):
+                        continue
+                    card_id = card["id"]
+                    data = zlib.compress(json.dumps(_trim(card), ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                    cards.append((card_id, str(card.get("set", "")).lower(), str(card.get("collector_number", "")).lower(),
+                                  card.get("lang"), card.get("released_at"), data))
+                    names.extend((name, card_id) for name in _names(card))
+                    if len(cards) >= IMPORT_BATCH_SIZE:
+                        count += self._write_batch(cards, names)
+                        cards, names = [], []
+                        if is_cancelled is not None and is_cancelled():
+                            raise InterruptedError("Import cancelled.")
+                        if progress is not None:
+                            progress(raw.tell() // 1024, total)
+                count += self._write_batch(cards, names)
+                self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                    ("source_file", os.path.basename(path)),
+                    ("imported_at", time.strftime('%Y-%m-%dT%H:%M:%S')),
+                    ("card_count", str(self.card_count())),
+                ])
+        if progress is not None:
+            progress(total, total)
+        return count
+
+    def _write_batch(self, cards, names) -> int:
+        if not cards:
+            return 0
+        self.conn.executemany("DELETE FROM card_names WHERE id = ?", [(c[0],) for c in cards])
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cards (id, set_code, collector_number, lang, released_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+            cards)
+        self.conn.executemany("INSERT OR IGNORE INTO card_names (name_norm, id) VALUES (?, ?)", names)
+        return len(cards)
+
+    # --- Lookups ---
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(blob))
+
+    def card_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    def has_data(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM cards LIMIT 1").fetchone() is not None
+
+    def info(self) -> Dict[str, str]:
+        """Metadata about the last import (source_file, imported_at, card_count)."""
+        return dict(self.conn.execute("SELECT key, value FROM meta"))
+
+    def iter_image_urls(self, lang: Optional[str] = 'en') -> Iterator[str]:
+        """The image URL of every printing in the mirror (only those in `lang` unless it is None)."""
+        if lang is None:
+            rows = self.conn.execute("SELECT data FROM cards")
+        else:
+            rows = self.conn.execute("SELECT data FROM cards WHERE lang = ?", (lang,))
+        for (blob,) in rows:
+            url = ScryfallCard(self._decode(blob)).image_url
+            if url:
+                yield url
+
+    def get_by_id(self, scryfall_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT data FROM cards WHERE id = ?", (scryfall_id.strip().lower(),)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_by_set_number(self, set_code: str, collector_number: str, lang: str = 'en') -> Optional[Dict[str, Any]]:
+        """The printing with this set and collector number, preferring the given language."""
+        row = self.conn.execute(
+            "SELECT data FROM cards WHERE set_code = ? AND collector_number = ? ORDER BY lang = ? DESC LIMIT 1",
+            (set_code.strip().lower(), collector_number.strip().lower(), lang)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def find_by_name(self, name: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Printings whose (face) name matches after normalization, English and newest first."""
+        rows = self.conn.execute(
+            """SELECT c.data FROM card_names n JOIN cards c ON c.id = n.id WHERE n.name_norm = ?
+               ORDER BY c.lang = 'en' DESC, c.released_at DESC LIMIT ?""",
+            (normalize_card_name(name), limit)).fetchall()
+        return [self._decode(row[0]) for row in rows]
+
+    def lookup(self, identifier: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Resolve a /cards/collection style identifier (id, set + collector_number, or name)."""
+        if "id" in identifier:
+            return self.get_by_id(identifier["id"])
+        if "set" in identifier and "collector_number" in identifier:
+            return self.get_by_set_number(identifier["set"], identifier["collector_number"])
+        if "name" in identifier:
+            matches = self.find_by_name(identifier["name"], limit=1)
+            return matches[0] if matches else None
+        return None
+
+    def lookup_many(self, identifiers: Iterable[Dict[str, str]]) -> Tuple[Dict[Tuple[str, ...], Dict[str, Any]], List[Dict[str, str]]]:
+        """
+        Local equivalent of fetch_scryfall_collection for id and set/collector number
+        identifiers: returns (found by identifier_key, not_found).
+        """
+        found, not_found = {}, []
+        for identifier in identifiers:
+            key = identifier_key(identifier)
+            if key in found:
+                continue
+            data = self.lookup(identifier)
+            if data is None:
+                not_found.append(identifier)
+            else:
+                found[key] = data
+        return found, not_found
+
+
+def open_bulk_store(db_path: str = SCRYFALL_BULK_DB_PATH) -> Optional[ScryfallBulkStore]:
+    """Open the local mirror if one has been imported, else None (no file is created)."""
+    if not os.path.exists(db_path):
+        return None
+    store = ScryfallBulkStore(db_path)
+    if not store.has_data():
+        store.close()
+        return None
+    return store
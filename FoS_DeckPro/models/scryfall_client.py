@@ -0,0 +1,276 @@
+"""
+Shared, thread-safe Scryfall HTTP client.
+
+All Scryfall traffic (enrichment, add-card, price tracking) goes through one client so
+that it shares a keep-alive connection pool and a single token-bucket rate limiter,
+and the app as a whole stays within Scryfall's published limit of about 10 requests
+per second however many threads are making calls. Requests get a timeout and are
+retried with jittered exponential backoff on 429/5xx responses and connection errors,
+honouring Retry-After when Scryfall sends it.
+
+AsyncScryfallClient is the asyncio counterpart for concurrent work such as background
+enrichment; it draws from the same rate limiter and response cache.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Mapping, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from FoS_DeckPro.utils.config import APP_VERSION
+from FoS_DeckPro.utils.http_cache import ResponseCache, get_response_cache
+
+SCRYFALL_API_URL = "https://api.scryfall.com"
+
+# Scryfall asks for 50-100 ms between requests, i.e. at most ~10 requests per second
+SCRYFALL_RATE_LIMIT = 10.0
+SCRYFALL_BURST = 2
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (5, 30)
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+USER_AGENT = f"FoS-DeckPro/{APP_VERSION}"
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available and return 0, else return the seconds until one is."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Hold back every caller for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class ScryfallClient:
+    """
+    Pooled, rate-limited Scryfall client. One instance is meant to be shared by every
+    thread; use get_scryfall_client() for the process-wide one.
+    """
+
+    def __init__(self, base_url: str = SCRYFALL_API_URL, rate: float = SCRYFALL_RATE_LIMIT,
+                 burst: float = SCRYFALL_BURST, timeout=REQUEST_TIMEOUT, max_retries: int = MAX_RETRIES,
+                 cache: Optional[ResponseCache] = None, pool_size: int = 10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate, burst)
+        self._cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self._cache if self._cache is not None else get_response_cache()
+
+    def close(self):
+        self.session.close()
+
+    def url(self, path: str, params: Optional[dict] = None) -> str:
+        """
+        Absolute URL for an API path such as '/cards/collection' (absolute URLs pass
+        through), with params encoded into the query string.
+        """
+        if not (path.startswith('http://') or path.startswith('https://')):
+            path = f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            path = requests.Request('GET', path, params=params).prepare().url
+        return path
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), BACKOFF_MAX)
+                except ValueError:
+                    pass
+        # Full jitter, so threads that failed together do not retry together
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        """
+        Rate-limited request with retries. Returns the final response (which may still be an
+        error status once retries run out); raises requests.RequestException if the last
+        attempt could not connect.
+        """
+        url = self.url(url)
+        timeout = timeout if timeout is not None else self.timeout
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt, None))
+                attempt += 1
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            delay = self._backoff(attempt, response)
+            if response.status_code == 429:
+                # Everyone sharing the client backs off, not just this thread
+                self.limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def get_json(self, url: str, data_class: str = 'default', params: Optional[dict] = None) -> Any:
+        """GET a JSON payload through the response cache. HTTP errors raise requests.HTTPError."""
+        return self.cache.fetch_json(self, self.url(url, params), data_class=data_class)
+
+
+class AsyncScryfallClient:
+    """
+    aiohttp facade over a ScryfallClient (default: the shared one), using its base URL,
+    headers, rate limiter, retry policy and response cache. Use as an async context
+    manager inside the event loop that makes the requests; `concurrency` caps the number
+    of open connections.
+    """
+
+    def __init__(self, client: Optional[ScryfallClient] = None, concurrency: int = 4):
+        self.client = client or get_scryfall_client()
+        self.base_url = self.client.base_url
+        self.limiter = self.client.limiter
+        self.concurrency = concurrency
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self.client.cache
+
+    async def __aenter__(self):
+        connect, read = self.client.timeout
+        self._session = aiohttp.ClientSession(
+            headers=dict(self.client.session.headers),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            connector=aiohttp.TCPConnector(limit=self.concurrency))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> Tuple[int, Mapping[str, str], bytes]:
+        # Rate-limited request with the same retry policy as ScryfallClient.request();
+        # returns (status, headers, body) and raises aiohttp.ClientResponseError on HTTP errors
+        url = self.client.url(url)
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    if response.status not in RETRY_STATUSES or attempt >= self.client.max_retries:
+                        response.raise_for_status()
+                        return response.status, response.headers, await response.read()
+                    delay = self.client._backoff(attempt, response)
+                    status = response.status
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= self.client.max_retries:
+                    raise
+                delay, status = self.client._backoff(attempt), None
+            if status == 429:
+                self.limiter.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def request_json(self, method: str, url: str, **kwargs) -> Any:
+        """
+        Rate-limited request with the same retry policy as ScryfallClient.request().
+        Returns the decoded JSON body; HTTP errors raise aiohttp.ClientResponseError.
+        """
+        _, _, body = await self._request(method, url, **kwargs)
+        return json.loads(body)
+
+    async def get_bytes(self, url: str, **kwargs) -> bytes:
+        """Rate-limited GET of a raw body (e.g. an image), with retries; bypasses the response cache."""
+        _, _, body = await self._request('GET', url, **kwargs)
+        return body
+
+    async def get_json(self, url: str, data_class: str = 'default', params: Optional[dict] = None) -> Any:
+        """Async ScryfallClient.get_json(): a GET through the same response cache, with revalidation."""
+        url = self.client.url(url, params)
+        cache = self.cache
+        key = cache.cache_key(url)
+        entry, fresh = cache.check(key, data_class)
+        if fresh:
+            return entry.json()
+        status, headers, body = await self._request('GET', url, headers=cache.validators(entry))
+        if status == 304 and entry is not None:
+            cache.revalidated(key)
+            return entry.json()
+        cache.store_response(key, body, headers.get('ETag'), headers.get('Last-Modified'))
+        return json.loads(body)
+
+    async def post_json(self, url: str, payload: Any) -> Any:
+        return await self.request_json('POST', url, json=payload)
+
+
+_shared_client: Optional[ScryfallClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_scryfall_client() -> ScryfallClient:
+    """The process-wide Scryfall client, created on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = ScryfallClient()
+        return _shared_client
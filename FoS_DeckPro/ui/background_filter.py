@@ -0,0 +1,154 @@
+"""
+Background filtering and sorting for the card tables.
+
+Typing in a FilterOverlay box calls BackgroundFilter.request(), which only (re)starts
+a short timer; the query runs once typing pauses, on a FilterWorker thread, so the GUI
+thread never scans the inventory. Large sorts run the same way on a SortWorker
+(BackgroundSort). Every query gets a new generation number. Starting one supersedes
+the query before it (the worker abandons it as soon as it notices), and results that
+arrive with an older generation are dropped, so a slow query can never overwrite the
+result of a newer one.
+"""
+import queue
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+
+from FoS_DeckPro.models.card_sort import SortKeyCache, SortSpec
+from FoS_DeckPro.ui.workers import FilterWorker, QueryWorker, SortWorker, start_worker
+
+FILTER_DEBOUNCE_MS = 150
+
+
+class BackgroundQuery(QObject):
+    """
+    Runs queries on one QueryWorker thread (started on first use) and emits
+    results_ready with the result of the newest one. Create and use it on the GUI thread.
+    """
+    results_ready = Signal(object)
+    worker_class = QueryWorker
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self._jobs: queue.Queue = queue.Queue()
+        self._worker: Optional[QueryWorker] = None
+        self._thread = None
+        self._pending = False
+
+    def submit(self, *args) -> int:
+        """Queue a query for the worker, superseding any earlier one; returns its generation."""
+        self.generation += 1
+        if self._worker is None:
+            self._start_worker()
+        self._worker.supersede(self.generation)
+        self._jobs.put((self.generation,) + args)
+        self._pending = True
+        return self.generation
+
+    def is_pending(self) -> bool:
+        """Whether a query's results are still to come (and will miss later changes to its input)."""
+        return self._pending
+
+    def cancel(self):
+        """Drop the running query; no results_ready follows for it."""
+        self.generation += 1
+        self._pending = False
+        if self._worker is not None:
+            self._worker.supersede(self.generation)
+
+    def _start_worker(self):
+        self._worker = self.worker_class(self._jobs)
+        self._worker.completed.connect(self._on_completed)
+        self._worker.failed.connect(self._on_failed)
+        self._thread = start_worker(self._worker)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _on_completed(self, generation: int, result):
+        if generation == self.generation:
+            self._pending = False
+            self.results_ready.emit(result)
+
+    def _on_failed(self, error: str):
+        self._pending = False
+        print(f"{type(self).__name__} query failed: {error}")
+
+    def shutdown(self):
+        """Stop the worker thread (done automatically when the application quits)."""
+        self.cancel()
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            self._thread.quit()
+            self._thread.wait(2000)
+        except RuntimeError:
+            pass
+        self._worker, self._thread = None, None
+
+
+class BackgroundFilter(BackgroundQuery):
+    """
+    Filters the cards returned by cards() with the {column: text} returned by filters()
+    and emits results_ready with the matching cards. Both are called on the GUI thread
+    when a query starts. applied_filters holds the filters of the last result emitted,
+    which may differ from what filters() returns while a query is pending.
+    """
+    worker_class = FilterWorker
+
+    def __init__(self, cards: Callable[[], List[dict]], filters: Callable[[], Dict[str, str]],
+                 debounce_ms: int = FILTER_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.cards = cards
+        self.filters = filters
+        self.applied_filters: Dict[str, str] = {}
+        self._requested_filters: Dict[str, str] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.run)
+
+    def request(self, *args):
+        """Run a query once no further request has come for the debounce interval."""
+        self._timer.start()
+
+    def run(self):
+        """Start a query now, superseding any pending or running one."""
+        self._timer.stop()
+        filters = {column: text for column, text in self.filters().items() if text}
+        cards = self.cards()
+        if not filters:
+            # Nothing to evaluate: everything matches
+            self.cancel()
+            self.applied_filters = {}
+            self.results_ready.emit(cards)
+            return
+        # Query a snapshot so edits to the inventory meanwhile cannot disturb the scan
+        self._requested_filters = filters
+        self.submit(list(cards), filters)
+
+    def _on_completed(self, generation: int, result):
+        if generation == self.generation:
+            self.applied_filters = self._requested_filters
+        super()._on_completed(generation, result)
+
+    def cancel(self):
+        """Drop the pending and running queries; no results_ready follows for them."""
+        self._timer.stop()
+        super().cancel()
+
+
+class BackgroundSort(BackgroundQuery):
+    """Sorts card lists with sort_cards() and emits results_ready with the sorted list."""
+    worker_class = SortWorker
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Only ever used on the worker thread: SortKeyCache is not thread-safe
+        self.keys = SortKeyCache()
+
+    def sort(self, cards: List[dict], spec: SortSpec) -> int:
+        # Sort a snapshot so edits to the list meanwhile cannot disturb the sort
+        return self.submit(list(cards), list(spec), self.keys)
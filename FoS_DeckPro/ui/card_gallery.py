@@ -0,0 +1,216 @@
+"""
+Thumbnail gallery of the cards shown in the table.
+
+CardGalleryView lays the cards out in a grid of fixed-size tiles and computes
+everything from the scroll position: which tiles are visible, where they go and which
+card is under the mouse are arithmetic on the tile size, so nothing is created per card
+and showing a new filter result of any size costs the same. Only the visible tiles are
+painted; their thumbnails (plus a screen ahead and behind) come from the ThumbnailCache.
+"""
+import math
+from typing import List, Optional
+
+from PySide6.QtCore import QRect, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QAbstractScrollArea
+
+from FoS_DeckPro.ui.thumbnail_cache import THUMBNAIL_HEIGHT, ThumbnailCache, get_thumbnail_cache
+
+TILE_PADDING = 6
+NAME_HEIGHT = 18
+# Magic cards are 63 x 88 mm
+CARD_ASPECT = 63 / 88
+
+
+class CardGalleryView(QAbstractScrollArea):
+    """Virtualized grid of card thumbnails; selecting a tile emits card_selected like CardTableView."""
+    card_selected = Signal(dict)
+
+    def __init__(self, thumbnails: Optional[ThumbnailCache] = None, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails if thumbnails is not None else get_thumbnail_cache()
+        self.cards: List[dict] = []
+        self.current = -1
+        self.image_width = round(THUMBNAIL_HEIGHT * CARD_ASPECT)
+        self.tile_width = self.image_width + 2 * TILE_PADDING
+        self.tile_height = THUMBNAIL_HEIGHT + NAME_HEIGHT + 2 * TILE_PADDING
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(self.tile_height // 4)
+        # Re-plan thumbnail work once scrolling pauses rather than on every pixel
+        self._window_timer = QTimer(self)
+        self._window_timer.setSingleShot(True)
+        self._window_timer.setInterval(30)
+        self._window_timer.timeout.connect(self._update_window)
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_done)
+        self.thumbnails.thumbnail_failed.connect(self._on_thumbnail_done)
+
+    def set_cards(self, cards):
+        """Show cards (typically CardTableView.filtered_cards)."""
+        if cards is not self.cards:
+            self.cards = cards
+            self.current = -1
+            self.verticalScrollBar().setValue(0)
+        elif self.current >= len(cards):
+            self.current = -1
+        self._update_scrollbar()
+        self.viewport().update()
+        self._window_timer.start()
+
+    def refresh(self, *args):
+        """Repaint after the shown cards were edited in place."""
+        self.viewport().update()
+
+    # --- Geometry ---
+
+    def columns(self) -> int:
+        return max(1, self.viewport().width() // self.tile_width)
+
+    def _update_scrollbar(self):
+        rows = math.ceil(len(self.cards) / self.columns())
+        height = self.viewport().height()
+        bar = self.verticalScrollBar()
+        bar.setRange(0, max(0, rows * self.tile_height - height))
+        bar.setPageStep(height)
+
+    def visible_range(self, margin: int = 0) -> range:
+        """Indexes of the cards on screen, plus `margin` screens either side."""
+        top = self.verticalScrollBar().value()
+        height = self.viewport().height()
+        first_row = max(0, (top - margin * height) // self.tile_height)
+        last_row = (top + (margin + 1) * height) // self.tile_height
+        columns = self.columns()
+        return range(first_row * columns, min(len(self.cards), (last_row + 1) * columns))
+
+    def tile_rect(self, index: int) -> QRect:
+        columns = self.columns()
+        left = (self.viewport().width() - columns * self.tile_width) // 2
+        row, column = divmod(index, columns)
+        return QRect(left + column * self.tile_width, row * self.tile_height - self.verticalScrollBar().value(),
+                     self.tile_width, self.tile_height)
+
+    def index_at(self, pos) -> int:
+        columns = self.columns()
+        left = (self.viewport().width() - columns * self.tile_width) // 2
+        column = (pos.x() - left) // self.tile_width
+        row = (pos.y() + self.verticalScrollBar().value()) // self.tile_height
+        index = row * columns + column
+        if 0 <= column < columns and 0 <= index < len(self.cards):
+            return index
+        return -1
+
+    # --- Painting ---
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        palette = self.palette()
+        exposed = event.rect()
+        for index in self.visible_range():
+            rect = self.tile_rect(index)
+            if rect.intersects(exposed):
+                self._paint_tile(painter, palette, index, rect)
+        painter.end()
+
+    def _paint_tile(self, painter, palette, index, rect):
+        card = self.cards[index]
+        if index == self.current:
+            painter.fillRect(rect, palette.highlight())
+        image_rect = QRect(rect.x() + TILE_PADDING, rect.y() + TILE_PADDING, self.image_width, THUMBNAIL_HEIGHT)
+        url = card.get("image_url", "") or ""
+        pixmap = self.thumbnails.thumbnail(url)
+        if pixmap is not None:
+            size = pixmap.size().scaled(image_rect.size(), Qt.KeepAspectRatio)
+            if size.width() > pixmap.width():
+                size = pixmap.size()  # never enlarge
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(image_rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            painter.fillRect(image_rect, QColor("#f5f7fa"))
+            painter.setPen(QPen(QColor("#b3c6e0")))
+            painter.drawRect(image_rect.adjusted(0, 0, -1, -1))
+            painter.setPen(QColor("#888888"))
+            if not url or self.thumbnails.failure(url) is not None:
+                text = "No image"
+            else:
+                text = "Loading..."
+            painter.drawText(image_rect, Qt.AlignCenter, text)
+        name_rect = QRect(rect.x() + TILE_PADDING, image_rect.bottom() + 1, self.image_width, NAME_HEIGHT)
+        painter.setPen(palette.highlightedText().color() if index == self.current else palette.text().color())
+        name = painter.fontMetrics().elidedText(str(card.get("Name", "")), Qt.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignHCenter | Qt.AlignVCenter, name)
+
+    def _on_thumbnail_done(self, url, *args):
+        for index in self.visible_range():
+            if (self.cards[index].get("image_url", "") or "") == url:
+                self.viewport().update(self.tile_rect(index))
+
+    def _update_window(self):
+        # What is on screen first, then the screen below and the one above
+        visible = self.visible_range()
+        around = self.visible_range(margin=1)
+        order = list(visible)
+        order += range(visible.stop, around.stop)
+        order += reversed(range(around.start, visible.start))
+        self.thumbnails.set_window(self.cards[i].get("image_url", "") or "" for i in order)
+
+    # --- Events ---
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+        self._window_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbar()
+        self._window_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_scrollbar()
+        self._window_timer.start()
+
+    def mousePressEvent(self, event):
+        index = self.index_at(event.position().toPoint())
+        if index >= 0:
+            self.set_current(index)
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        if not self.cards:
+            return super().keyPressEvent(event)
+        columns = self.columns()
+        page = max(1, self.viewport().height() // self.tile_height) * columns
+        moves = {
+            Qt.Key_Left: -1, Qt.Key_Right: 1, Qt.Key_Up: -columns, Qt.Key_Down: columns,
+            Qt.Key_PageUp: -page, Qt.Key_PageDown: page,
+        }
+        key = event.key()
+        if key == Qt.Key_Home:
+            self.set_current(0)
+        elif key == Qt.Key_End:
+            self.set_current(len(self.cards) - 1)
+        elif key in moves:
+            self.set_current(self.current + moves[key] if self.current >= 0 else 0)
+        else:
+            super().keyPressEvent(event)
+
+    def set_current(self, index: int):
+        """Select the card at index, scroll it into view and emit card_selected."""
+        if not self.cards:
+            return
+        index = min(max(index, 0), len(self.cards) - 1)
+        previous, self.current = self.current, index
+        if 0 <= previous < len(self.cards):
+            self.viewport().update(self.tile_rect(previous))
+        self.ensure_visible(index)
+        self.viewport().update(self.tile_rect(index))
+        self.card_selected.emit(self.cards[index])
+
+    def ensure_visible(self, index: int):
+        bar = self.verticalScrollBar()
+        top = index // self.columns() * self.tile_height
+        if top < bar.value():
+            bar.setValue(top)
+        elif top + self.tile_height > bar.value() + self.viewport().height():
+            bar.setValue(top + self.tile_height - self.viewport().height())
@@ -1,35 +1,187 @@
-from PySide6.QtWidgets import QTableView, QMenu, QHeaderView, QSizePolicy, QWidget, QHBoxLayout, QPushButton, QLabel, QComboBox
+from PySide6.QtWidgets import QApplication, QTableView, QMenu, QHeaderView, QSizePolicy, QLabel
 from PySide6.QtCore import QAbstractTableModel, Qt, Signal, QModelIndex
 
+from FoS_DeckPro.models.card_sort import SortKeyCache, sort_cards
+from FoS_DeckPro.ui.background_filter import BackgroundSort
+from FoS_DeckPro.ui.image_prefetch import ImagePrefetcher
+
+# Lists at least this long are sorted on a worker thread
+SORT_WORKER_MIN_ROWS = 20000
+# Changes scattered over more row runs than this reset the model instead
+MAX_CHANGE_RUNS = 1000
+# Rows whose display strings are kept; the cache starts over when it outgrows this
+DISPLAY_CACHE_ROWS = 10000
+
+# data() and headerData() run for every cell/section and role on each repaint; looking
+# Qt enums up is slow in PySide6, so they compare against these
+_DISPLAY_ROLE = Qt.DisplayRole
+_TOOLTIP_ROLE = Qt.ToolTipRole
+_HORIZONTAL = Qt.Horizontal
+
+def _runs(rows):
+    """Split sorted row numbers into (first, last) runs of consecutive rows."""
+    runs = []
+    for row in rows:
+        if runs and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
 class CardTableModel(QAbstractTableModel):
+    """
+    Table model over a list of card dicts, normally the whole filter result. Cells are
+    read from the list on demand in data(), so nothing is built per row and the view only
+    asks for the rows on screen; the view scrolls through every row instead of paging.
+    sort_spec is the order the list is in ([(column, descending)], most significant
+    first); the header shows it as arrows. Added, removed and edited cards are applied
+    with rowsInserted, rowsRemoved and dataChanged for just their rows, so the view keeps
+    its scroll position and selection; only a new list (set_cards) resets it.
+    Display strings are formatted once per shown cell and kept until a change to the card
+    (cards_changed, remove_cards) or the list or columns drops them, so a repaint costs
+    the same whatever the number of cards.
+    """
     def __init__(self, cards=None, columns=None):
         super().__init__()
         self.cards = cards if cards is not None else []
         self.columns = columns if columns is not None else ["Name", "Set", "Collector Number"]
+        # Rows the view knows about; the list can grow before cards_appended() announces it
+        self._rows = len(self.cards)
+        self.sort_spec = []
+        self._row_of = None  # id(card) -> row, built when first needed
+        self._display = {}  # id(card) -> display string per column, None until shown
 
-    def rowCount(self, parent=None):
-        return len(self.cards) + 1  # +1 for the blank filter row
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
 
-    def columnCount(self, parent=None):
-        return len(self.columns)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
 
-    def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or role != Qt.DisplayRole:
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE:
             return None
-        if index.row() == 0:
-            return ""  # Blank filter row
-        card = self.cards[index.row() - 1]
-        col = self.columns[index.column()]
-        return str(card.get(col, ""))
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self.columns[section]
+        row = index.row()  # -1 for an invalid index
+        if not 0 <= row < len(self.cards):
+            return None
+        card = self.cards[row]
+        texts = self._display.get(id(card))
+        if texts is None:
+            if len(self._display) >= DISPLAY_CACHE_ROWS:
+                self._display.clear()
+            texts = self._display[id(card)] = [None] * len(self.columns)
+        column = index.column()
+        text = texts[column]
+        if text is None:
+            text = texts[column] = str(card.get(self.columns[column], ""))
+        return text
+
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if orientation != _HORIZONTAL:
+            return None
+        if role == _DISPLAY_ROLE:
+            col = self.columns[section]
+            for n, (column, descending) in enumerate(self.sort_spec):
+                if column == col:
+                    arrow = "\u25bc" if descending else "\u25b2"
+                    return f"{col} {arrow}{n + 1}" if len(self.sort_spec) > 1 else f"{col} {arrow}"
+            return col
+        if role == _TOOLTIP_ROLE:
+            return "Click to sort by this column; Shift+click to add it to the sort"
         return None
 
+    def set_sort_spec(self, spec):
+        """Record the order the cards are shown in (see CardTableView.sort_by)."""
+        self.sort_spec = list(spec)
+        if self.columns:
+            self.headerDataChanged.emit(Qt.Horizontal, 0, len(self.columns) - 1)
+
     def set_cards(self, cards):
         self.beginResetModel()
         self.cards = cards
+        self._rows = len(cards)
+        self._row_of = None
+        self._display.clear()
+        self.endResetModel()
+
+    def cards_appended(self):
+        """Show cards appended to the list since it was set, without resetting the view."""
+        count = len(self.cards)
+        if count > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, count - 1)
+            if self._row_of is not None:
+                self._row_of.update((id(card), row) for row, card in enumerate(self.cards[self._rows:], self._rows))
+            self._rows = count
+            self.endInsertRows()
+
+    def append_cards(self, cards):
+        """Add cards after the last row."""
+        self.cards.extend(cards)
+        self.cards_appended()
+
+    def row_of(self, card):
+        """The row showing card (the object itself, not an equal copy), or -1."""
+        if self._row_of is None:
+            self._row_of = {id(c): row for row, c in enumerate(self.cards)}
+        return self._row_of.get(id(card), -1)
+
+    def _rows_of(self, cards):
+        return sorted(row for row in map(self.row_of, cards) if 0 <= row < self._rows)
+
+    def cards_changed(self, cards, fields=None):
+        """
+        Repaint the rows of cards edited in place; fields limits it to those columns
+        (None: all of them). Keeps selection and scroll position.
+        """
+        if fields is None:
+            columns = range(len(self.columns))
+        else:
+            columns = [i for i, col in enumerate(self.columns) if col in fields]
+        if not columns:
+            return
+        rows = self._rows_of(cards)
+        if not rows:
+            return
+        for card in cards:
+            texts = self._display.get(id(card))
+            if texts is not None:
+                for column in columns:
+                    texts[column] = None
+        first_col, last_col = min(columns), max(columns)
+        runs = _runs(rows)
+        if len(runs) > MAX_CHANGE_RUNS:
+            runs = [[rows[0], rows[-1]]]
+        for first, last in runs:
+            self.dataChanged.emit(self.index(first, first_col), self.index(last, last_col))
+
+    def remove_cards(self, cards):
+        """Remove the rows of cards, keeping the rest of the view as it is."""
+        rows = self._rows_of(cards)
+        if not rows:
+            return
+        for card in cards:
+            self._display.pop(id(card), None)
+        runs = _runs(rows)
+        if len(runs) > MAX_CHANGE_RUNS:
+            doomed = set(rows)
+            self.beginResetModel()
+            # In place: the view holds on to the list
+            self.cards[:] = [card for row, card in enumerate(self.cards) if row not in doomed]
+            self._rows = len(self.cards)
+            self._row_of = None
+            self.endResetModel()
+            return
+        # Last run first, so the rows of the runs still to go do not move
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.cards[first:last + 1]
+            self._rows -= last - first + 1
+            self.endRemoveRows()
+        self._row_of = None
+
+    def set_columns(self, columns):
+        self.beginResetModel()
+        self.columns = columns
+        self._display.clear()
         self.endResetModel()
 
 class CardTableView(QTableView):
@@ -39,7 +191,6 @@ class CardTableView(QTableView):
 
     def __init__(self, inventory, columns=None, parent=None):
         super().__init__(parent)
-        print("DEBUG: CardTableView __init__ called")
         self.inventory = inventory
         self.columns = columns if columns is not None else ["Name", "Set", "Collector Number"]
         self.model = CardTableModel([], self.columns)
@@ -51,11 +202,18 @@ class CardTableView(QTableView):
         self.customContextMenuRequested.connect(self.show_context_menu)
         self.doubleClicked.connect(self.on_double_click)
         self.default_widths = {col: 100 for col in self.columns}
-        # Pagination
-        self.page_size = 100
-        self.current_page = 0
-        self.filtered_cards = []
-        self.pagination_widget = self._create_pagination_widget()
+        # All filtered cards are in the model; the view scrolls through them
+        self.filtered_cards = self.model.cards
+        self.cards = self.filtered_cards
+        self.inventory_count_label = QLabel()
+        # Sorting: the list as given to update_cards, keys reused across sorts on this
+        # thread, and a worker (with keys of its own) for long lists
+        self._unsorted = self.filtered_cards
+        self._reselect = None
+        self.sort_keys = SortKeyCache()
+        self._sorter = BackgroundSort(self)
+        self._sorter.results_ready.connect(self._show_cards)
+        self.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
         # Scrollbars always as needed
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
@@ -75,121 +233,147 @@ class CardTableView(QTableView):
         # Make columns user-resizable and allow switching to stretch mode
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
 
-    def _create_pagination_widget(self):
-        widget = QWidget()
-        layout = QHBoxLayout(widget)
-        self.page_label = QLabel()
-        self.page_size_combo = QComboBox()
-        self.page_size_combo.addItems([str(x) for x in [50, 100, 250, 500, 1000]])
-        self.page_size_combo.setCurrentText(str(self.page_size))
-        self.page_size_combo.currentTextChanged.connect(self._on_page_size_changed)
-        self.first_btn = QPushButton("First")
-        self.prev_btn = QPushButton("Prev")
-        self.next_btn = QPushButton("Next")
-        self.last_btn = QPushButton("Last")
-        self.first_btn.clicked.connect(self._go_first)
-        self.prev_btn.clicked.connect(self._go_prev)
-        self.next_btn.clicked.connect(self._go_next)
-        self.last_btn.clicked.connect(self._go_last)
-        layout.addWidget(QLabel("Page size:"))
-        layout.addWidget(self.page_size_combo)
-        # Add inventory count label
-        self.inventory_count_label = QLabel()
-        layout.addWidget(self.inventory_count_label)
-        layout.addWidget(self.first_btn)
-        layout.addWidget(self.prev_btn)
-        layout.addWidget(self.page_label)
-        layout.addWidget(self.next_btn)
-        layout.addWidget(self.last_btn)
-        layout.addStretch()
-        return widget
-
-    def _on_page_size_changed(self, val):
-        self.page_size = int(val)
-        self.current_page = 0
-        self._update_pagination()
-
-    def _go_first(self):
-        self.current_page = 0
-        self._update_pagination()
-
-    def _go_prev(self):
-        if self.current_page > 0:
-            self.current_page -= 1
-            self._update_pagination()
-
-    def _go_next(self):
-        if self.current_page < self._max_page():
-            self.current_page += 1
-            self._update_pagination()
-
-    def _go_last(self):
-        self.current_page = self._max_page()
-        self._update_pagination()
-
-    def _max_page(self):
-        if not self.filtered_cards:
-            return 0
-        return max(0, (len(self.filtered_cards) - 1) // self.page_size)
-
-    def _update_pagination(self):
-        total = len(self.filtered_cards)
-        max_page = self._max_page()
-        print(f"DEBUG: CardTableView _update_pagination: page {self.current_page+1}/{max_page+1}, total {total}")
-        start = self.current_page * self.page_size
-        end = start + self.page_size
-        page_cards = self.filtered_cards[start:end]
-        print(f"DEBUG: CardTableView _update_pagination: displaying {len(page_cards)} cards: {[c.get('Name') for c in page_cards]}")
-        self.model.set_cards(page_cards)
-        self.cards = page_cards
-        self.viewport().update()
-        self.first_btn.setEnabled(self.current_page > 0)
-        self.prev_btn.setEnabled(self.current_page > 0)
-        self.next_btn.setEnabled(self.current_page < max_page)
-        self.last_btn.setEnabled(self.current_page < max_page)
-        # Update inventory count label
-        self.inventory_count_label.setText(f"Total cards: {total}")
+        # Download images around the visible rows and selection before they are asked for
+        self.image_prefetcher = ImagePrefetcher(self)
+
+    def cards_added(self, cards):
+        """Show cards added to the list being shown (e.g. while a file streams in)."""
+        if not cards:
+            return
+        if self._unsorted is self.cards and not self.model.sort_spec:
+            # Shown in the order given: the new cards go after the last row
+            self.model.append_cards(cards)
+            self._update_count()
+            return
+        # The new cards have to be sorted in (and would be lost when a pending sort arrives)
+        self._unsorted.extend(cards)
+        self.update_cards(self._unsorted)
+
+    def cards_removed(self, cards):
+        """Drop cards from the list being shown."""
+        if self._unsorted is not self.cards:
+            doomed = {id(card) for card in cards}
+            kept = [card for card in self._unsorted if id(card) not in doomed]
+            if len(kept) == len(self._unsorted):
+                return
+            self._unsorted = kept
+            if self._sorter.is_pending():
+                self.update_cards(self._unsorted)
+                return
+        self.model.remove_cards(cards)
+        self._update_count()
+
+    def cards_changed(self, cards, fields=None):
+        """Repaint cards edited in place (fields: the changed fields, None for any)."""
+        self.model.cards_changed(cards, fields)
+        sorted_by = {column for column, _ in self.model.sort_spec}
+        if sorted_by and (fields is None or sorted_by & set(fields)):
+            if any(self.model.row_of(card) >= 0 for card in cards):
+                # Edited sort values can move cards; the selected card stays selected
+                self._remember_selection()
+                self.update_cards(self._unsorted)
 
     def update_cards(self, cards):
-        print(f"DEBUG: CardTableView update_cards called with {len(cards)} cards: {[c.get('Name') for c in cards]}")
+        # A copy, as cards_added() and cards_removed() edit it in place. Unsorted, it is
+        # also the list shown.
+        self._unsorted = list(cards)
+        spec = [(col, descending) for col, descending in self.model.sort_spec if col in self.model.columns]
+        if spec != self.model.sort_spec:
+            self.model.set_sort_spec(spec)
+        if not spec or len(cards) < 2:
+            self._sorter.cancel()
+            self._show_cards(self._unsorted)
+        elif len(cards) < SORT_WORKER_MIN_ROWS:
+            self._sorter.cancel()
+            self._show_cards(sort_cards(self._unsorted, spec, self.sort_keys))
+        else:
+            # The current rows stay up until the sorted list arrives
+            self._sorter.sort(self._unsorted, spec)
+
+    def _show_cards(self, cards):
         self.filtered_cards = cards
-        self.current_page = 0
-        self._update_pagination()
-        # Update inventory count label
-        self.inventory_count_label.setText(f"Total cards: {len(cards)}")
+        self.cards = cards
+        self.model.set_cards(cards)
+        self._update_count()
+        card, self._reselect = self._reselect, None
+        if card is not None:
+            row = self.model.row_of(card)
+            if row >= 0:
+                self.selectRow(row)
+                self.scrollTo(self.model.index(row, 0))
+
+    def _update_count(self):
+        self.inventory_count_label.setText(f"Total cards: {len(self.cards)}")
+
+    def _remember_selection(self):
+        # _show_cards() selects this card again in the new list
+        indexes = self.selectedIndexes()
+        if indexes and indexes[0].row() < len(self.cards):
+            self._reselect = self.cards[indexes[0].row()]
+
+    def sort_by(self, spec):
+        """
+        Show the cards sorted by spec ([(column, descending)], most significant first;
+        empty for the order they were given in). The sort also applies to every later
+        update_cards(), e.g. a new filter result. The selected card stays selected.
+        """
+        self._remember_selection()
+        self.model.set_sort_spec(spec)
+        self.update_cards(self._unsorted)
+
+    def stop_sorting(self):
+        """Stop the sort thread; call when the view is going away."""
+        self._sorter.shutdown()
+
+    def on_header_clicked(self, section):
+        col = self.model.columns[section]
+        spec = list(self.model.sort_spec)
+        position = next((i for i, (column, _) in enumerate(spec) if column == col), -1)
+        if QApplication.keyboardModifiers() & Qt.ShiftModifier:
+            # Shift+click adds the column to the sort, or cycles it: ascending, descending, off
+            if position < 0:
+                spec.append((col, False))
+            elif not spec[position][1]:
+                spec[position] = (col, True)
+            else:
+                del spec[position]
+        elif spec == [(col, False)]:
+            spec = [(col, True)]
+        elif spec == [(col, True)]:
+            spec = []
+        else:
+            spec = [(col, False)]
+        self.sort_by(spec)
 
     def on_selection_changed(self, selected, deselected):
         indexes = self.selectedIndexes()
         if indexes:
             row = indexes[0].row()
-            if row == 0:
-                return  # Ignore blank filter row
-            if 0 < row <= len(self.cards):
-                print("DEBUG: CardTableView emitting card_selected:", self.cards[row - 1])
-                self.card_selected.emit(self.cards[row - 1])
+            if 0 <= row < len(self.cards):
+                self.card_selected.emit(self.cards[row])
 
     def show_context_menu(self, pos):
         index = self.indexAt(pos)
-        if not index.isValid() or index.row() == 0:
+        if not index.isValid():
             return
         menu = QMenu(self)
         edit_action = menu.addAction("Edit Card")
         delete_action = menu.addAction("Delete Card(s)")
         action = menu.exec(self.viewport().mapToGlobal(pos))
         if action == edit_action:
-            self.edit_card_requested.emit(index.row() - 1)
+            self.edit_card_requested.emit(index.row())
         elif action == delete_action:
-            rows = sorted(set(idx.row() - 1 for idx in self.selectedIndexes() if idx.row() > 0))
+            rows = sorted(set(idx.row() for idx in self.selectedIndexes()))
             if rows:
                 self.delete_card_requested.emit(rows)
 
     def on_double_click(self, index: QModelIndex):
-        if index.isValid() and index.row() > 0:
-            self.edit_card_requested.emit(index.row() - 1)
+        if index.isValid():
+            self.edit_card_requested.emit(index.row())
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Delete:
-            rows = sorted(set(idx.row() - 1 for idx in self.selectedIndexes() if idx.row() > 0))
+            rows = sorted(set(idx.row() for idx in self.selectedIndexes()))
             if rows:
                 self.delete_card_requested.emit(rows)
         else:
@@ -1,10 +1,10 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QListWidget, QListWidgetItem, QTabWidget, QTableWidget, QTableWidgetItem, QComboBox, QMessageBox, QCheckBox, QFileDialog, QInputDialog, QWidget, QFormLayout, QScrollArea, QSizePolicy, QFrame, QSpinBox, QDoubleSpinBox, QGroupBox, QAbstractItemView, QSplitter, QTextEdit, QStyle)
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect
-from FoS_DeckPro.models.scryfall_api import fetch_scryfall_data
 import random
 import json
 from FoS_DeckPro.ui.card_table import CardTableView
 from FoS_DeckPro.ui.filter_overlay import FilterOverlay
+from FoS_DeckPro.ui.background_filter import BackgroundFilter
 from FoS_DeckPro.ui.image_preview import ImagePreview
 from FoS_DeckPro.ui.card_details import CardDetails
 from FoS_DeckPro.ui.dialogs.export_item_listing_fields import ExportItemListingFieldsDialog
@@ -12,6 +12,7 @@ import csv
 import os
 from FoS_DeckPro.ui.columns_config import DEFAULT_COLUMNS
 from FoS_DeckPro.models.card import CARD_FIELDS
+from FoS_DeckPro.models.inventory import visible_fields
 
 # Centralized config/constants for break builder
 BREAK_BUILDER_CONFIG = {
@@ -252,8 +253,13 @@ class BreakBuilderDialog(QDialog):
         # Add FilterOverlay above the table
         self.filter_overlay = FilterOverlay(self.card_table, self.columns)
         self.filter_overlay.show()
+        # Same debounced background filtering as the main window
+        self.table_filter = BackgroundFilter(self.inventory.get_all_cards, self._filter_texts, parent=self)
+        self.table_filter.results_ready.connect(self._on_filter_results)
+        self.finished.connect(self.table_filter.shutdown)
+        self.finished.connect(self.card_table.stop_sorting)
         for col, filt in self.filter_overlay.filters.items():
-            filt.textChanged.connect(self.update_table_filter)
+            filt.textChanged.connect(self.table_filter.request)
         # --- Add Clear All Filters button above overlay ---
         clear_filters_btn = QPushButton("Clear All Filters")
         clear_filters_btn.setStyleSheet("padding: 4px 16px; border-radius: 8px; background: #e0e0e0; font-weight: bold;")
@@ -302,7 +308,7 @@ class BreakBuilderDialog(QDialog):
         table_vbox.setSpacing(10)
         table_vbox.addWidget(filter_controls_frame)
         table_vbox.addWidget(table_preview_splitter)
-        table_vbox.addWidget(self.card_table.pagination_widget)
+        table_vbox.addWidget(self.card_table.inventory_count_label)
         self.inventory_placeholder = QLabel("No cards in inventory.")
         self.inventory_placeholder.setStyleSheet("color: #888; font-style: italic; padding: 6px;")
         if not self.inventory.get_all_cards():
@@ -346,6 +352,7 @@ class BreakBuilderDialog(QDialog):
         self.curated_table.setSelectionMode(QAbstractItemView.MultiSelection)
         self.curated_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.curated_table.setMinimumHeight(140)
+        self.finished.connect(self.curated_table.stop_sorting)
         curated_layout.addWidget(self.curated_table)
         # Placeholder for empty curated table
         self.curated_placeholder = QLabel("No curated cards yet.")
@@ -480,17 +487,14 @@ class BreakBuilderDialog(QDialog):
             self.add_rule()
     def _get_all_inventory_fields(self):
         # Get all unique fields from inventory
-        fields = set()
-        for card in self.inventory.get_all_cards():
-            fields.update(card.keys())
-        return sorted(fields)
+        return sorted(self.inventory.get_visible_fields())
     def add_selected_to_curated(self):
         """
         Add selected cards from the inventory table to the curated list, avoiding duplicates, and update the curated table and break preview.
         """
         selected_rows = self.card_table.selectionModel().selectedRows()
         for idx in selected_rows:
-            card = self.card_table.cards[idx.row() - 1]
+            card = self.card_table.cards[idx.row()]
             if card not in self.curated_cards:
                 self.curated_cards.append(card)
         self.update_curated_table()
@@ -499,10 +503,11 @@ class BreakBuilderDialog(QDialog):
         """
         Remove selected cards from the curated list and update the curated table and break preview.
         """
-        selected_rows = self.curated_table.selectionModel().selectedRows()
-        for idx in sorted(selected_rows, reverse=True):
-            if 0 <= idx.row() - 1 < len(self.curated_cards):
-                self.curated_cards.pop(idx.row() - 1)
+        # Rows are positions in the (possibly sorted) table, not in curated_cards
+        shown = self.curated_table.cards
+        selected = {id(shown[idx.row()]) for idx in self.curated_table.selectionModel().selectedRows()
+                    if 0 <= idx.row() < len(shown)}
+        self.curated_cards = [card for card in self.curated_cards if id(card) not in selected]
         self.update_curated_table()
         self.generate_break_list()  # Always update preview
     def update_curated_table(self):
@@ -517,7 +522,7 @@ class BreakBuilderDialog(QDialog):
         self.curated_table.update_cards(self.curated_cards)
         self.curated_table.repaint()
         # Animate added rows
-        for row, card in enumerate(self.curated_cards):
+        for row, card in enumerate(self.curated_table.cards):
             if id(card) not in prev_set:
                 self._animate_table_row(self.curated_table, row, added=True)
         # Animate removed rows (optional, not shown since row is gone)
@@ -802,16 +807,18 @@ class BreakBuilderDialog(QDialog):
         avg_cost = (total_cost / len(prices)) if prices else 0.0
         self.total_cost_label.setText(f"<b>Total Whatnot Price:</b> ${total_cost:,.2f}")
         self.avg_cost_label.setText(f"<b>Average Whatnot Price:</b> ${avg_cost:,.2f}")
+    def _filter_texts(self):
+        return {col: filt.text() for col, filt in self.filter_overlay.filters.items()}
     def update_table_filter(self):
         """
         Update the inventory table based on the FilterOverlay fields.
-        This method is now unified with the main GUI's filtering logic for modularity.
+        This method is now unified with the main GUI's filtering logic for modularity:
+        the filters run on a worker and the results arrive in _on_filter_results.
         """
-        filters = {col: self.filter_overlay.filters[col].text() for col in self.columns}
-        filtered = self.inventory.filter_cards(filters)
+        self.table_filter.run()
+    def _on_filter_results(self, filtered):
         self.filtered_inventory = filtered  # Store the filtered pool
         self.card_table.update_cards(filtered)
-        self.card_table.repaint()
         # Inventory placeholder logic
         if hasattr(self, 'inventory_placeholder'):
             if not filtered:
@@ -831,10 +838,7 @@ class BreakBuilderDialog(QDialog):
         if not final_list:
             QMessageBox.warning(self, "Export Error", "No break list generated. Please generate the break list first.")
             return
-        all_fields = set()
-        for card in final_list:
-            all_fields.update(card.keys())
-        all_fields = sorted(all_fields)
+        all_fields = sorted(visible_fields(final_list))
         dlg = ExportItemListingFieldsDialog(all_fields, self)
         if not dlg.exec():
             return
@@ -1,10 +1,20 @@
 from PySide6.QtWidgets import QWidget, QLineEdit
 from PySide6.QtCore import Qt, QRect, QEvent
 
+# The event filter sees every viewport event; looking Qt enums up each time is slow in PySide6
+_RESIZE = QEvent.Resize
+
 class FilterOverlay(QWidget):
+    """
+    Row of filter boxes lined up with the table's columns. By default it sits in the
+    bottom of the horizontal header, which is made taller to hold it, so it never covers
+    a table row; it can also be put in a layout of its own. The boxes are only moved when
+    the header or viewport is resized, a column is resized or moved, or the table scrolls
+    sideways; repaints leave them alone.
+    """
     HEIGHT = 28
     def __init__(self, table, columns, parent=None):
-        super().__init__(parent or table.viewport())
+        super().__init__(parent or table.horizontalHeader().viewport())
         self.table = table
         self.columns = columns
         self.filters = {}
@@ -15,23 +25,47 @@ class FilterOverlay(QWidget):
             filt = QLineEdit(self)
             filt.setPlaceholderText(col)
             self.filters[col] = filt
+        header = self.table.horizontalHeader()
         self.table.viewport().installEventFilter(self)
-        self.table.horizontalHeader().sectionResized.connect(self.update_positions)
-        self.table.horizontalHeader().sectionMoved.connect(self.update_positions)
+        header.installEventFilter(self)
+        header.sectionResized.connect(self.update_positions)
+        header.sectionMoved.connect(self.update_positions)
+        header.sectionCountChanged.connect(self.update_positions)
         self.table.horizontalScrollBar().valueChanged.connect(self.update_positions)
+        self._reserve_header_space()
         self.update_positions()
 
-    def update_positions(self):
-        # Overlay sits at y=0 in the viewport, width matches viewport
-        self.setGeometry(0, 0, self.table.viewport().width(), self.HEIGHT)
-        for i, col in enumerate(self.columns):
-            idx = self.table.model.columns.index(col)
-            x = self.table.columnViewportPosition(idx)
-            width = self.table.columnWidth(idx)
-            self.filters[col].setGeometry(QRect(x, 0, width, self.HEIGHT))
+    def _in_header(self):
+        return self.parentWidget() is self.table.horizontalHeader().viewport()
+
+    def _reserve_header_space(self):
+        # Column titles go to the top of the header, the filters below them
+        header = self.table.horizontalHeader()
+        if self._in_header():
+            header.setDefaultAlignment(Qt.AlignHCenter | Qt.AlignTop)
+            header.setMinimumHeight(header.sizeHint().height() + self.HEIGHT)
+        else:
+            header.setDefaultAlignment(Qt.AlignCenter)
+            header.setMinimumHeight(0)
+
+    def update_positions(self, *args):
+        # In the header the overlay sits along its bottom edge; width matches the viewport
+        y = self.table.horizontalHeader().height() - self.HEIGHT if self._in_header() else 0
+        self.setGeometry(0, y, self.table.viewport().width(), self.HEIGHT)
+        for idx, col in enumerate(self.table.model.columns):
+            filt = self.filters.get(col)
+            if filt is not None:
+                x = self.table.columnViewportPosition(idx)
+                width = self.table.columnWidth(idx)
+                filt.setGeometry(QRect(x, 0, width, self.HEIGHT))
+
+    def event(self, event):
+        if event.type() == QEvent.ParentChange and hasattr(self, 'table'):
+            self._reserve_header_space()
+            self.update_positions()
+        return super().event(event)
 
     def eventFilter(self, obj, event):
-        if obj is self.table.viewport():
-            if event.type() in (QEvent.Resize, QEvent.Paint, QEvent.Move):
-                self.update_positions()
-        return super().eventFilter(obj, event) 
\ No newline at end of file
+        if event.type() == _RESIZE and (obj is self.table.viewport() or obj is self.table.horizontalHeader()):
+            self.update_positions()
+        return super().eventFilter(obj, event)
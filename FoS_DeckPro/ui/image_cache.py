@@ -0,0 +1,412 @@
+"""
+Shared card image cache for the GUI.
+
+Images are looked up in memory, then in the local ImageLibrary filled by the bulk image
+sync, then in the on-disk ImageDiskCache (so later sessions mostly work offline) before
+the network is touched. Memory holds two bounded LRUs:
+decoded full-size images, and scaled renditions keyed by URL and a height bucket
+(RENDITION_STEP pixels), so showing an image at a size it was shown at before, e.g.
+while a splitter is dragged back and forth, is a lookup rather than a rescale.
+
+Decoding and smooth scaling run on a small pool of ImageDecodeWorker threads; the GUI
+thread only converts finished renditions to pixmaps. Downloads go through one
+QNetworkAccessManager and concurrent requests for the same URL are merged. When
+something new is available for a URL, image_ready(url) is emitted and callers ask again.
+Local file paths are accepted as well as URLs.
+
+prefetch() starts low-priority loads that can be cancelled again until something
+actually requests the image (see ImagePrefetcher), or with keep=False only fetches the
+image to disk (see ThumbnailCache).
+"""
+import itertools
+import os
+import queue
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from PySide6.QtCore import QCoreApplication, QObject, QSize, Qt, QUrl, Signal
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+from FoS_DeckPro.models.image_library import ImageLibrary, open_image_library
+from FoS_DeckPro.models.scryfall_client import USER_AGENT
+from FoS_DeckPro.ui.workers import ImageDecodeWorker, start_worker
+from FoS_DeckPro.utils.image_disk_cache import ImageDiskCache, get_image_disk_cache
+
+# A Scryfall 'normal' image decodes to about 1.3 MB, so this keeps a 100-row page in memory
+ORIGINAL_CACHE_MAX_BYTES = 160 * 1024 * 1024
+RENDITION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Renditions are made for heights rounded down to a multiple of this
+RENDITION_STEP = 32
+DECODE_THREADS = 2
+
+# Decode queue priorities (lower runs first)
+PRIORITY_REQUEST = 0
+PRIORITY_PREFETCH = 1
+
+
+@dataclass
+class ImageCacheStats:
+    """Where requested images came from since the cache was created."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    downloads: int = 0
+    failures: int = 0
+    memory_evictions: int = 0
+    renditions: int = 0
+    prefetched: int = 0
+    prefetch_cancelled: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.memory_hits + self.disk_hits + self.downloads + self.failures
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.disk_hits) / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.memory_hits} memory hits, {self.disk_hits} disk hits, {self.downloads} downloads, "
+                f"{self.failures} failures ({self.hit_rate:.0%} served from cache); "
+                f"{self.renditions} renditions scaled; "
+                f"{self.prefetched} prefetched, {self.prefetch_cancelled} prefetches cancelled")
+
+
+def pixmap_bytes(pixmap: QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+def rendition_height(size: QSize, box_width: int, box_height: int) -> int:
+    """
+    Height of the rendition for an image of `size` shown in a box_width x box_height
+    area: scaled to fit (never enlarged), then rounded down to a RENDITION_STEP bucket.
+    """
+    if size.width() <= 0 or size.height() <= 0:
+        return 0
+    fit = int(min(size.height(), box_height, box_width * size.height() / size.width()))
+    return max(1, fit // RENDITION_STEP * RENDITION_STEP or fit)
+
+
+class _LruCache:
+    """Byte-bounded LRU mapping; sizes come from `size_of`."""
+
+    def __init__(self, max_bytes: int, size_of: Callable):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.used = 0
+        self.evictions = 0
+        self._items: "OrderedDict[Hashable, object]" = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.used -= self.size_of(old)
+        self._items[key] = value
+        self.used += self.size_of(value)
+        while self.used > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.used -= self.size_of(evicted)
+            self.evictions += 1
+
+
+class ImageCache(QObject):
+    """
+    Two-tier image cache with off-thread decoding. Create and use it on the GUI thread;
+    get_image_cache() returns the shared instance.
+    """
+    image_ready = Signal(str)
+    image_failed = Signal(str, str)
+
+    def __init__(self, disk: Optional[ImageDiskCache] = None, original_bytes: int = ORIGINAL_CACHE_MAX_BYTES,
+                 rendition_bytes: int = RENDITION_CACHE_MAX_BYTES, threads: int = DECODE_THREADS,
+                 library: Optional[ImageLibrary] = None, parent=None):
+        super().__init__(parent)
+        self.disk = disk if disk is not None else get_image_disk_cache()
+        # None: use the shared library once a sync has created one
+        self.library = library
+        self.stats = ImageCacheStats()
+        self._originals = _LruCache(original_bytes, lambda image: image.sizeInBytes())
+        self._renditions = _LruCache(rendition_bytes, pixmap_bytes)
+        # Full-size dimensions of every image decoded so far, to pick rendition buckets
+        self._sizes: Dict[str, QSize] = {}
+        self._failed: Dict[str, str] = {}
+        self._pending: Dict[str, QNetworkReply] = {}
+        # Pending downloads nobody has requested yet, which cancel_prefetch() may abort
+        self._prefetch_only: Set[str] = set()
+        # Prefetches only wanted on disk (e.g. as thumbnail sources), not decoded into memory
+        self._store_only: Set[str] = set()
+        self._decoding: Dict[str, int] = {}  # url -> priority
+        self._scaling: Set[Tuple[str, int]] = set()
+        # Display areas each loading image is wanted at, plus the most recently used ones
+        self._wanted: Dict[str, Set[Tuple[int, int]]] = {}
+        self._recent_boxes: Deque[Tuple[int, int]] = deque(maxlen=2)
+        self._jobs: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads_wanted = threads
+        self._workers = []
+        self._threads = []
+        self._manager = QNetworkAccessManager(self)
+        self._manager.finished.connect(self._on_reply_finished)
+
+    # --- Lookups ---
+
+    def rendition(self, url: str, width: int, height: int) -> Optional[QPixmap]:
+        """
+        url's image scaled to fit width x height (never enlarged). A cached rendition for
+        the size bucket is returned as is. Without one, a fast stand-in scaled from the
+        full-size image is returned while a smooth rendition is made off the GUI thread.
+        None while the image is still loading (or has failed, see failure()).
+        image_ready(url) follows whenever something better becomes available.
+        """
+        if not url or url in self._failed:
+            return None
+        box = (max(1, width), max(1, height))
+        if box not in self._recent_boxes:
+            self._recent_boxes.append(box)
+        size = self._sizes.get(url)
+        if size is not None:
+            target = rendition_height(size, *box)
+            pixmap = self._renditions.get((url, target))
+            if pixmap is not None:
+                self.stats.memory_hits += 1
+                return pixmap
+            original = self._originals.get(url)
+            if original is not None:
+                self.stats.memory_hits += 1
+                self._scale(url, original, [target], PRIORITY_REQUEST)
+                if target < original.height():
+                    return QPixmap.fromImage(original.scaledToHeight(target, Qt.FastTransformation))
+                return QPixmap.fromImage(original)
+        self._load(url, box, PRIORITY_REQUEST)
+        return None
+
+    def is_loading(self, url: str) -> bool:
+        return url in self._pending or url in self._decoding
+
+    def is_pending(self, url: str) -> bool:
+        """Whether url is being downloaded."""
+        return url in self._pending
+
+    def failure(self, url: str) -> Optional[str]:
+        """Why url could not be loaded, if it could not."""
+        return self._failed.get(url)
+
+    def retry(self, url: str):
+        """Forget an earlier failure so the next lookup tries again."""
+        self._failed.pop(url, None)
+
+    def contains(self, url: str) -> bool:
+        """Whether url can be shown without a download (does not touch the stats or the LRU order)."""
+        if url in self._originals:
+            return True
+        if not url.startswith(('http://', 'https://')):
+            return os.path.exists(url)
+        return self.disk.contains(url) or self.local_path(url) is not None
+
+    def local_path(self, url: str) -> Optional[str]:
+        """The image library's file for url, if the library has it."""
+        library = self.library if self.library is not None else open_image_library()
+        return library.local_path(url) if library is not None else None
+
+    def stored_path(self, url: str) -> Optional[str]:
+        """The local file holding url's image: the library's (never evicted), else the disk cache's."""
+        return self.local_path(url) or self.disk.path(url)
+
+    # --- Prefetching ---
+
+    def prefetch(self, url: str, keep: bool = True) -> bool:
+        """
+        Start a low-priority load of url into memory (from disk, else from the network)
+        unless it is there or already on its way. Returns True if a load was started;
+        image_ready or image_failed follows. With keep=False the image is only downloaded
+        to disk (see stored_path()) and not kept in memory.
+        """
+        if (not url.startswith(('http://', 'https://')) or url in self._originals or url in self._failed
+                or self.is_loading(url)):
+            return False
+        path = self.stored_path(url)
+        if not keep:
+            if path is not None:
+                return False
+            self._store_only.add(url)
+        self.stats.prefetched += 1
+        if path is not None:
+            self.stats.disk_hits += 1
+            self._decode(url, path, PRIORITY_PREFETCH, store=False)
+        else:
+            self._download(url, QNetworkRequest.LowPriority)
+            self._prefetch_only.add(url)
+        return True
+
+    def cancel_prefetch(self, url: str):
+        """Abort a prefetch download that nothing has requested since; requested downloads carry on."""
+        if url in self._prefetch_only:
+            self._prefetch_only.discard(url)
+            self._store_only.discard(url)
+            self._wanted.pop(url, None)
+            reply = self._pending.pop(url, None)
+            if reply is not None:
+                self.stats.prefetch_cancelled += 1
+                reply.abort()
+
+    # --- Loading ---
+
+    def _load(self, url: str, box: Tuple[int, int], priority: int):
+        self._wanted.setdefault(url, set()).add(box)
+        if self.is_loading(url):
+            if priority == PRIORITY_REQUEST:
+                self._prefetch_only.discard(url)
+                self._store_only.discard(url)
+            return
+        if not url.startswith(('http://', 'https://')):
+            if os.path.exists(url):
+                self.stats.disk_hits += 1
+                self._decode(url, url, priority, store=False)
+            else:
+                self._fail(url, "File not found")
+            return
+        path = self.stored_path(url)
+        if path is not None:
+            self.stats.disk_hits += 1
+            self._decode(url, path, priority, store=False)
+        else:
+            self._download(url, QNetworkRequest.HighPriority)
+
+    def _download(self, url: str, priority):
+        request = QNetworkRequest(QUrl(url))
+        request.setHeader(QNetworkRequest.UserAgentHeader, USER_AGENT)
+        request.setPriority(priority)
+        reply = self._manager.get(request)
+        reply.setProperty("image_url", url)
+        self._pending[url] = reply
+
+    def _on_reply_finished(self, reply: QNetworkReply):
+        url = reply.property("image_url")
+        reply.deleteLater()
+        if reply.error() == QNetworkReply.NetworkError.OperationCanceledError:
+            # A cancelled prefetch, already forgotten by cancel_prefetch()
+            return
+        self._pending.pop(url, None)
+        prefetch = url in self._prefetch_only
+        self._prefetch_only.discard(url)
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            self._fail(url, reply.errorString())
+            return
+        data = bytes(reply.readAll())
+        if not data:
+            self._fail(url, "Empty response")
+            return
+        self.stats.downloads += 1
+        self._decode(url, data, PRIORITY_PREFETCH if prefetch else PRIORITY_REQUEST, store=True)
+
+    def _fail(self, url: str, error: str):
+        self._store_only.discard(url)
+        self.stats.failures += 1
+        self._failed[url] = error
+        self._wanted.pop(url, None)
+        self.image_failed.emit(url, error)
+
+    # --- Decoding (see ImageDecodeWorker) ---
+
+    def _submit(self, priority: int, job):
+        if not self._workers:
+            self._start_workers()
+        self._jobs.put((priority, next(self._seq), job))
+
+    def _decode(self, url: str, source, priority: int, store: bool):
+        self._decoding[url] = priority
+        self._submit(priority, (url, source, (), self.disk if store else None))
+
+    def _scale(self, url: str, image: QImage, heights: Iterable[int], priority: int):
+        heights = [h for h in set(heights) if (url, h) not in self._renditions and (url, h) not in self._scaling]
+        if heights:
+            self._scaling.update((url, h) for h in heights)
+            self._submit(priority, (url, image, heights, None))
+
+    def _start_workers(self):
+        for _ in range(self._threads_wanted):
+            worker = ImageDecodeWorker(self._jobs)
+            worker.decoded.connect(self._on_decoded)
+            worker.rendition_ready.connect(self._on_rendition_ready)
+            worker.decode_failed.connect(self._on_decode_failed)
+            self._workers.append(worker)
+            self._threads.append(start_worker(worker))
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _on_decoded(self, url: str, image: QImage):
+        priority = self._decoding.pop(url, PRIORITY_REQUEST)
+        if url in self._store_only:
+            # Downloaded and checked, and now on disk; nobody has asked to see it
+            self._store_only.discard(url)
+            self._wanted.pop(url, None)
+            self.image_ready.emit(url)
+            return
+        self._originals.put(url, image)
+        self._sizes[url] = image.size()
+        boxes = self._wanted.pop(url, set()) | set(self._recent_boxes)
+        self._scale(url, image, [rendition_height(image.size(), *box) for box in boxes], priority)
+        self.image_ready.emit(url)
+
+    def _on_rendition_ready(self, url: str, height: int, image: QImage):
+        self._scaling.discard((url, height))
+        self._renditions.put((url, height), QPixmap.fromImage(image))
+        self.stats.renditions += 1
+        self.image_ready.emit(url)
+
+    def _on_decode_failed(self, url: str, error: str):
+        self._decoding.pop(url, None)
+        if url.startswith(('http://', 'https://')):
+            # An unreadable cache file is dropped (a bad download was never stored)
+            self.disk.discard(url)
+        self._fail(url, error)
+
+    def shutdown(self):
+        """Stop the decode threads (done automatically when the application quits)."""
+        for worker in self._workers:
+            worker.cancel()
+        for thread in self._threads:
+            try:
+                thread.quit()
+                thread.wait(2000)
+            except RuntimeError:
+                pass
+        self._workers, self._threads = [], []
+
+    # --- Stats ---
+
+    def memory_used(self) -> int:
+        return self._originals.used + self._renditions.used
+
+    def summary(self) -> str:
+        disk = self.disk
+        self.stats.memory_evictions = self._originals.evictions + self._renditions.evictions
+        return (f"Images: {self.stats.summary()}; memory {len(self._originals)} images and "
+                f"{len(self._renditions)} renditions, {self.memory_used() / 2**20:.0f} MiB; "
+                f"disk {disk.entry_count()} files, {disk.size_bytes() / 2**20:.0f} MiB, "
+                f"{disk.stats.evictions} evicted")
+
+
+_shared_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """The GUI-wide image cache, created on first use (on the GUI thread)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ImageCache()
+    return _shared_cache
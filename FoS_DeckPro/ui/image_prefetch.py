@@ -0,0 +1,120 @@
+"""
+Predictive image prefetching for CardTableView.
+
+Whenever the table scrolls or the selection changes, the prefetcher works out a window
+of cards whose images are likely to be wanted next: the rows nearest the selection (on
+screen or not) and then the rows on screen and a screen's worth below, closest first. Their images are
+loaded into the shared ImageCache (decoded from disk, else downloaded) at low priority,
+at most max_in_flight at a time; downloads for cards that have left the window are
+cancelled. By the time the user arrow-keys onto a row its image is normally in memory.
+"""
+from collections import deque
+from typing import Deque, List, Optional, Set
+
+from PySide6.QtCore import QObject, QTimer
+
+from FoS_DeckPro.ui.image_cache import ImageCache, get_image_cache
+
+PREFETCH_MAX_IN_FLIGHT = 4
+# Rows either side of the selection that are prefetched first, even when off screen
+PREFETCH_NEIGHBOURS = 10
+# Upper bound on the window, so it fits in the in-memory pixmap cache with room to spare
+PREFETCH_MAX_WINDOW = 100
+
+
+class ImagePrefetcher(QObject):
+    """Prefetches card images around a CardTableView's visible rows and selection."""
+
+    def __init__(self, view, cache: Optional[ImageCache] = None, max_in_flight: int = PREFETCH_MAX_IN_FLIGHT,
+                 neighbours: int = PREFETCH_NEIGHBOURS, max_window: int = PREFETCH_MAX_WINDOW):
+        super().__init__(view)
+        self.view = view
+        self.cache = cache if cache is not None else get_image_cache()
+        self.max_in_flight = max_in_flight
+        self.neighbours = neighbours
+        self.max_window = max_window
+        self.enabled = True
+        self._queue: Deque[str] = deque()
+        self._window: Set[str] = set()
+        self._in_flight: Set[str] = set()
+        # Coalesce bursts of scroll/selection changes (e.g. holding an arrow key) into one update
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(30)
+        self._timer.timeout.connect(self.update_window)
+        view.model.modelReset.connect(self.schedule)
+        view.model.rowsInserted.connect(self.schedule)
+        view.model.rowsRemoved.connect(self.schedule)
+        view.verticalScrollBar().valueChanged.connect(self.schedule)
+        view.selectionModel().selectionChanged.connect(self.schedule)
+        self.cache.image_ready.connect(self._on_image_done)
+        self.cache.image_failed.connect(self._on_image_done)
+
+    def schedule(self, *args):
+        if self.enabled:
+            self._timer.start()
+
+    def window_urls(self) -> List[str]:
+        """Image URLs to prefetch, most urgent first (see the module docstring)."""
+        view = self.view
+        cards = view.filtered_cards
+        if not cards:
+            return []
+        count = min(len(cards), view.model.rowCount())
+        first = max(0, view.rowAt(0))
+        last = view.rowAt(view.viewport().height() - 1)
+        if last < 0:
+            last = count - 1
+        # The rows on screen and the next screenful
+        ahead = range(first, min(count, last + 1 + (last - first + 1)))
+        rows = view.selectionModel().selectedRows() if view.selectionModel() else []
+        selected = [index.row() for index in rows]
+        if selected:
+            centre = selected[0]
+            near = range(max(0, centre - self.neighbours), min(count, centre + self.neighbours + 1))
+        else:
+            centre = first
+            near = range(0)
+        order = sorted(near, key=lambda i: abs(i - centre))
+        order += sorted((i for i in ahead if i not in near), key=lambda i: abs(i - centre))
+        urls, seen = [], set()
+        for i in order:
+            url = cards[i].get("image_url", "") or ""
+            if url and url not in seen:
+                seen.add(url)
+                urls.append(url)
+                if len(urls) >= self.max_window:
+                    break
+        return urls
+
+    def update_window(self):
+        """Recompute the window, cancel prefetches that left it and queue the rest."""
+        urls = self.window_urls() if self.enabled else []
+        window = set(urls)
+        for url in list(self._in_flight):
+            if url not in window:
+                self._in_flight.discard(url)
+                self.cache.cancel_prefetch(url)
+        self._window = window
+        self._queue = deque(url for url in urls if url not in self._in_flight)
+        self._fill()
+
+    def stop(self):
+        """Cancel everything queued or in flight."""
+        self._timer.stop()
+        for url in self._in_flight:
+            self.cache.cancel_prefetch(url)
+        self._in_flight.clear()
+        self._queue.clear()
+        self._window = set()
+
+    def _fill(self):
+        while self._queue and len(self._in_flight) < self.max_in_flight:
+            url = self._queue.popleft()
+            if self.cache.prefetch(url):
+                self._in_flight.add(url)
+
+    def _on_image_done(self, url, *args):
+        if url in self._in_flight:
+            self._in_flight.discard(url)
+            self._fill()
@@ -1,15 +1,16 @@
 from PySide6.QtWidgets import QLabel
-from PySide6.QtCore import Qt, QUrl, QByteArray, QObject
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPixmap
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
-import os
+
+from FoS_DeckPro.ui.image_cache import get_image_cache
 
 class ImagePreview(QLabel):
     """
     QLabel-based widget for displaying a card image preview.
     Images are only ever scaled down (never up) and always centered.
-    Now supports async network image loading via QNetworkAccessManager.
-    Handles reply deletion and race conditions robustly.
+    Images come from the shared ImageCache, which decodes and scales them off the GUI
+    thread and keeps renditions per size bucket, so resizing reuses earlier renditions
+    instead of rescaling the full-size image on every resize event.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -17,10 +18,15 @@ class ImagePreview(QLabel):
         self.setAlignment(Qt.AlignCenter)
         self.setMinimumWidth(10)
         self.setStyleSheet("border: 1.5px solid #b3c6e0; background: #f5f7fa; color: #888; font-style: italic;")
-        self._original_pixmap = None  # Store the original pixmap for correct scaling
-        self._manager = QNetworkAccessManager(self)
-        self._network_reply = None
-        self._current_request_id = 0
+        self._url = ""
+        self._cache = get_image_cache()
+        self._cache.image_ready.connect(self._on_image_ready)
+        self._cache.image_failed.connect(self._on_image_ready)
+        # Images from the disk cache arrive within a frame or two; only say "Loading" for slower ones
+        self._loading_timer = QTimer(self)
+        self._loading_timer.setSingleShot(True)
+        self._loading_timer.setInterval(150)
+        self._loading_timer.timeout.connect(self._show_loading)
         # No background, no extra padding
 
     def show_card_image(self, card):
@@ -29,110 +35,43 @@ class ImagePreview(QLabel):
         Only scale down images, never up. Center the image.
         Supports both URLs and local file paths.
         """
-        url = card.get("image_url", "")
-        print(f"DEBUG: show_card_image called with url: {url}")
-        self._current_request_id += 1
-        request_id = self._current_request_id
-        # Clean up previous reply if needed
-        if self._network_reply is not None:
-            try:
-                self._network_reply.finished.disconnect()
-            except Exception:
-                pass
-            self._network_reply.deleteLater()
-            self._network_reply = None
-        if not url:
-            self.setText("No image available")
+        self._url = card.get("image_url", "") or ""
+        self._cache.retry(self._url)
+        self._refresh()
+
+    def _on_image_ready(self, url, *args):
+        # Ignore images for cards that are no longer selected
+        if url == self._url:
+            self._refresh()
+
+    def _refresh(self):
+        """Show the current card's image at the current size, or why it cannot be shown."""
+        self._loading_timer.stop()
+        if not self._url:
             self.setPixmap(QPixmap())
-            self._original_pixmap = None
+            self.setText("No image available")
             return
-        # If it's a local file
-        if os.path.exists(url):
-            print(f"DEBUG: Loading local file image: {url}")
-            pixmap = QPixmap(url)
-            if not pixmap.isNull():
-                self.setPixmap(pixmap.scaled(self.width(), self.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                self._original_pixmap = pixmap
-                self.setText("")
-            else:
-                self.setText("Image failed to load")
-                self.setPixmap(QPixmap())
-                self._original_pixmap = None
+        pixmap = self._cache.rendition(self._url, self.width(), self.height())
+        if pixmap is not None:
+            self.setPixmap(pixmap)
+            self.setText("")
             return
-        # Otherwise, try to load from network
-        print(f"DEBUG: Loading network image: {url}")
-        request = QNetworkRequest(QUrl(url))
-        self.setText("Loading image...")
         self.setPixmap(QPixmap())
-        self._original_pixmap = None
-        reply = self._manager.get(request)
-        self._network_reply = reply
-        def on_finished():
-            print(f"DEBUG: on_finished slot called for url: {url}")
-            # Only handle if this is the latest request
-            if request_id != self._current_request_id:
-                print(f"DEBUG: Ignoring late reply for url: {url}")
-                reply.deleteLater()
-                return
-            print(f"DEBUG: _on_image_loaded called for url: {url}")
-            if reply.error() != QNetworkReply.NetworkError.NoError:
-                print(f"DEBUG: Network reply error: {reply.error()} for URL: {url}")
-                self.setText("Image failed to load")
-                self.setPixmap(QPixmap())
-                self._original_pixmap = None
-            else:
-                print(f"DEBUG: Entering image load else block for url: {url}")
-                data = reply.readAll()
-                print(f"DEBUG: type(data)={type(data)}, data={data[:40]}...")
-                data_bytes = bytes(data)
-                print(f"DEBUG: type(data_bytes)={type(data_bytes)}, len(data_bytes)={len(data_bytes)}")
-                if not data_bytes:
-                    print(f"WARNING: No image data received for url: {url}")
-                print(f"DEBUG: Image data length: {len(data_bytes)} bytes")
-                pixmap = QPixmap()
-                loaded = pixmap.loadFromData(data_bytes)
-                print(f"DEBUG: QPixmap loaded: {loaded}, isNull: {pixmap.isNull()}")
-                if loaded and not pixmap.isNull():
-                    self.setPixmap(pixmap.scaled(self.width(), self.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                    self._original_pixmap = pixmap
-                    self.setText("")
-                    print(f"DEBUG: Network image loaded and pixmap is valid")
-                else:
-                    self.setText("Image failed to load")
-                    self.setPixmap(QPixmap())
-                    self._original_pixmap = None
-            reply.deleteLater()
-            self._network_reply = None
-        reply.finished.connect(on_finished)
+        if self._cache.failure(self._url) is not None:
+            self.setText("Image failed to load")
+        else:
+            self.setText("")
+            self._loading_timer.start()
+
+    def _show_loading(self):
+        if self._cache.is_loading(self._url):
+            self.setText("Loading image...")
 
     def resizeEvent(self, event):
         """
-        Rescale the image to fit the new size, but only scale down (never up).
-        Always scale from the original pixmap for crispness.
+        Show the image at the new size, but only scale down (never up). Sizes seen
+        before are served from the rendition cache.
         """
         super().resizeEvent(event)
-        if self._original_pixmap:
-            self.setPixmap(self._original_pixmap.scaled(self.width(), self.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-
-    def _update_scaled_pixmap(self):
-        """
-        Helper to update the displayed pixmap according to the current widget size.
-        Only scales down the image, never up, and keeps it centered.
-        Always scale from the original pixmap for best quality.
-        """
-        if self._original_pixmap and not self._original_pixmap.isNull():
-            label_width = self.width()
-            label_height = self.height()
-            img_width = self._original_pixmap.width()
-            img_height = self._original_pixmap.height()
-            # Only scale down if image is larger than label in either dimension
-            if img_width > label_width or img_height > label_height:
-                scaled = self._original_pixmap.scaled(
-                    label_width, label_height, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
-                self.setPixmap(scaled)
-            else:
-                # Image is smaller than label, show at original size (centered)
-                self.setPixmap(self._original_pixmap)
-        else:
-            self.setPixmap(QPixmap())
+        if self._url:
+            self._refresh()
@@ -1,14 +1,16 @@
 from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QStatusBar, QMenuBar, QFileDialog, QMessageBox, QSplitter, QSizePolicy, QDialog, QPushButton, QTextEdit, QInputDialog, QRadioButton, QButtonGroup, QLineEdit, QProgressDialog, QListWidget, QListWidgetItem, QComboBox
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QStatusBar, QMenuBar, QFileDialog, QMessageBox, QSplitter, QSizePolicy, QDialog, QPushButton, QTextEdit, QInputDialog, QRadioButton, QButtonGroup, QLineEdit, QProgressDialog, QListWidget, QListWidgetItem, QComboBox, QProgressBar
 )
 from PySide6.QtGui import QAction, QScreen
 from PySide6.QtCore import Qt, QTimer
 from FoS_DeckPro.ui.card_table import CardTableView
+from FoS_DeckPro.ui.card_gallery import CardGalleryView
 from FoS_DeckPro.ui.filter_overlay import FilterOverlay
+from FoS_DeckPro.ui.background_filter import BackgroundFilter
 from FoS_DeckPro.ui.image_preview import ImagePreview
 from FoS_DeckPro.ui.card_details import CardDetails
 from FoS_DeckPro.ui.dialogs.export_columns import ExportColumnsDialog
-from FoS_DeckPro.models.inventory import CardInventory
+from FoS_DeckPro.models.inventory import CardInventory, InventoryChange, card_matcher, visible_fields
 import json
 import os
 from FoS_DeckPro.utils.config import save_last_file, load_last_file
@@ -19,7 +21,6 @@ from FoS_DeckPro.ui.dialogs.edit_card import EditCardDialog
 import datetime
 from FoS_DeckPro.ui.dialogs.column_customization import ColumnCustomizationDialog
 from FoS_DeckPro.ui.dialogs.bulk_edit_remove import BulkEditRemoveDialog
-from FoS_DeckPro.models.scryfall_api import fetch_scryfall_data
 import time
 from FoS_DeckPro.ui.dialogs.export_item_listing_fields import ExportItemListingFieldsDialog
 import pandas as pd
@@ -28,12 +29,17 @@ from FoS_DeckPro.ui.dialogs.break_builder import BreakBuilderDialog
 from FoS_DeckPro.ui.columns_config import DEFAULT_COLUMNS
 import pdfplumber
 import traceback
+import uuid
 from FoS_DeckPro.utils.packing_slip_file_manager import find_new_packing_slips, move_and_rename_packing_slip
 from FoS_DeckPro.logic.whatnot_packing_slip_parser import WhatnotPackingSlipParser
 from FoS_DeckPro.logic.whatnot_inventory_removal import remove_sold_cards_from_inventory
 from FoS_DeckPro.logic.whatnot_buyer_db import WhatnotBuyerDB
 from FoS_DeckPro.ui.dialogs.packing_slip_summary import PackingSlipSummaryDialog
 from FoS_DeckPro.utils import license
+from FoS_DeckPro.utils.startup_timer import startup_timer
+from FoS_DeckPro.ui.workers import start_worker, InventoryLoadWorker, CsvImportWorker, JsonImportWorker, ExportWorker
+from FoS_DeckPro.logic.export_service import base_extension, export_cards_csv, export_cards_json, export_listings
+from FoS_DeckPro.logic.import_pipeline import IMPORT_APP_FIELDS, read_csv_header
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -46,12 +52,35 @@ class MainWindow(QMainWindow):
         self.columns = DEFAULT_COLUMNS.copy()
         self.visible_columns = DEFAULT_COLUMNS.copy()
         self.inventory = CardInventory()
-        # Load sample data for now
-        sample_cards = [
-            {"Name": "Paradise Plume", "Set name": "Time Spiral Remastered", "Set code": "TSR", "Collector number": "271", "Rarity": "uncommon", "Condition": "near_mint", "Foil": "normal", "Language": "en", "Purchase price": "$0.25", "Whatnot price": "$1"},
-            {"Name": "Lightning Bolt", "Set name": "Magic 2011", "Set code": "M11", "Collector number": "145", "Rarity": "common", "Condition": "near_mint", "Foil": "foil", "Language": "en", "Purchase price": "$2.00", "Whatnot price": "$2"},
-        ]
-        self.inventory.load_cards(sample_cards)
+        # The last used file is streamed in after the window is shown (see _start_deferred_load).
+        # Sample data is only shown when there is nothing to load.
+        self._deferred_load_file = None
+        self._load_thread = None
+        self._load_worker = None
+        self._load_previous = None
+        self._load_count = 0
+        self._load_mode = None
+        self._import_state = None
+        self._import_worker = None
+        self._import_thread = None
+        self._import_progress = None
+        self._export_worker = None
+        self._export_thread = None
+        self._enrich_worker = None
+        self._enrich_thread = None
+        self._enrich_groups = {}
+        self._enrich_scopes = {}
+        self._image_sync_worker = None
+        self._image_sync_thread = None
+        last_file = load_last_file()
+        if last_file and os.path.exists(last_file):
+            self._deferred_load_file = last_file
+        else:
+            sample_cards = [
+                {"Name": "Paradise Plume", "Set name": "Time Spiral Remastered", "Set code": "TSR", "Collector number": "271", "Rarity": "uncommon", "Condition": "near_mint", "Foil": "normal", "Language": "en", "Purchase price": "$0.25", "Whatnot price": "$1"},
+                {"Name": "Lightning Bolt", "Set name": "Magic 2011", "Set code": "M11", "Collector number": "145", "Rarity": "common", "Condition": "near_mint", "Foil": "foil", "Language": "en", "Purchase price": "$2.00", "Whatnot price": "$2"},
+            ]
+            self.inventory.load_cards(sample_cards)
         self._update_columns_from_inventory()
 
         # Menu bar and File > Open
@@ -95,6 +124,7 @@ class MainWindow(QMainWindow):
         undo_packing_slip_action.triggered.connect(self.undo_last_packing_slip_removal)
         self._last_packing_slip_inventory = None
         self._last_packing_slip_summary = None
+        self._last_packing_slip_batch = None
         edit_menu = menubar.addMenu("Edit")
         bulk_edit_remove_action = edit_menu.addAction("Bulk Edit/Remove...")
         bulk_edit_remove_action.triggered.connect(self.bulk_edit_remove_dialog)
@@ -130,15 +160,27 @@ class MainWindow(QMainWindow):
                     self.card_table.setColumnWidth(i, self.column_widths[col])
         self.card_table.horizontalHeader().sectionResized.connect(self.save_column_widths)
         table_container_layout.addWidget(self.card_table)
-        # Add pagination widget below the table
-        table_container_layout.addWidget(self.card_table.pagination_widget)
+        # Card count below the table
+        table_container_layout.addWidget(self.card_table.inventory_count_label)
         table_container.setLayout(table_container_layout)
-        left_layout.addWidget(table_container)
+        # Thumbnail gallery of the same filter results, below the table (View > Show Card Gallery)
+        self.card_gallery = CardGalleryView()
+        self.card_gallery.hide()
+        table_splitter = QSplitter()
+        table_splitter.setOrientation(Qt.Vertical)
+        table_splitter.setChildrenCollapsible(False)
+        table_splitter.addWidget(table_container)
+        table_splitter.addWidget(self.card_gallery)
+        table_splitter.setSizes([400, 300])
+        left_layout.addWidget(table_splitter)
         # Create and show the filter overlay as a child of the table's viewport
         self.filter_overlay = FilterOverlay(self.card_table, self.columns)
         self.filter_overlay.show()
+        # Filters are evaluated off the GUI thread once typing pauses
+        self.table_filter = BackgroundFilter(self.inventory.get_all_cards, self._filter_texts, parent=self)
+        self.table_filter.results_ready.connect(self._on_filter_results)
         for col, filt in self.filter_overlay.filters.items():
-            filt.textChanged.connect(self.update_table_filter)
+            filt.textChanged.connect(self.table_filter.request)
 
         # Right side: vertical splitter for image preview and card details
         right_splitter = QSplitter()
@@ -176,32 +218,49 @@ class MainWindow(QMainWindow):
         # Status bar
         self.setStatusBar(QStatusBar())
         self.statusBar().showMessage("Ready")
-
-        # Initial table population
-        self.card_table.update_cards(self.inventory.get_all_cards())
+        # Progress indicator for background loads (hidden when idle)
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setTextVisible(True)
+        self.load_progress.hide()
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.export_progress = QProgressBar()
+        self.export_progress.setMaximumWidth(200)
+        self.export_progress.setFormat("Export %p%")
+        self.export_progress.hide()
+        self.statusBar().addPermanentWidget(self.export_progress)
+        self.enrich_progress = QProgressBar()
+        self.enrich_progress.setMaximumWidth(200)
+        self.enrich_progress.setFormat("Scryfall %p%")
+        self.enrich_progress.hide()
+        self.statusBar().addPermanentWidget(self.enrich_progress)
+        self.enrich_stop_btn = QPushButton("Stop")
+        self.enrich_stop_btn.clicked.connect(self._stop_enrichment)
+        self.enrich_stop_btn.hide()
+        self.statusBar().addPermanentWidget(self.enrich_stop_btn)
+        self.image_sync_progress = QProgressBar()
+        self.image_sync_progress.setMaximumWidth(200)
+        self.image_sync_progress.setFormat("Images %p%")
+        self.image_sync_progress.hide()
+        self.statusBar().addPermanentWidget(self.image_sync_progress)
+        self.image_sync_stop_btn = QPushButton("Stop")
+        self.image_sync_stop_btn.clicked.connect(self._stop_image_sync)
+        self.image_sync_stop_btn.hide()
+        self.statusBar().addPermanentWidget(self.image_sync_stop_btn)
+
+        # Initial table population; from here on inventory changes update the table
+        self.inventory.add_listener(self._on_inventory_changed)
+        self.update_table_filter()
 
         # Connect card selection to image preview and details
         self.card_table.card_selected.connect(self.image_preview.show_card_image)
         self.card_table.card_selected.connect(self.card_details.show_card_details)
-
-        # Try to load last used JSON file
-        last_file = load_last_file()
-        if last_file and os.path.exists(last_file):
-            try:
-                with open(last_file, 'r', encoding='utf-8') as f:
-                    cards = json.load(f)
-                    for card in cards:
-                        for col in self.columns:
-                            if col not in card or card[col] is None:
-                                card[col] = ""
-                            if isinstance(card[col], float) and (card[col] != card[col]):
-                                card[col] = ""
-                    self.inventory.load_cards(cards)
-                    self._update_columns_from_inventory()
-                    self.card_table.update_cards(self.inventory.get_all_cards())
-                    self.statusBar().showMessage(f"Loaded {len(cards)} cards from {os.path.basename(last_file)} (auto)")
-            except Exception as e:
-                self.statusBar().showMessage(f"Failed to load last file: {e}")
+        self.card_gallery.card_selected.connect(self.image_preview.show_card_image)
+        self.card_gallery.card_selected.connect(self.card_details.show_card_details)
+        self.card_table.model.modelReset.connect(self._sync_gallery)
+        self.card_table.model.rowsInserted.connect(self._sync_gallery)
+        self.card_table.model.rowsRemoved.connect(self._sync_gallery)
+        self.card_table.model.dataChanged.connect(self.card_gallery.refresh)
 
         # Connect edit and delete signals
         self.card_table.edit_card_requested.connect(self.edit_card)
@@ -219,6 +278,10 @@ class MainWindow(QMainWindow):
             self.card_table.set_stretch_columns(stretch_columns_action.isChecked())
         stretch_columns_action.triggered.connect(toggle_stretch)
         view_menu.addAction(stretch_columns_action)
+        gallery_action = QAction("Show Card Gallery", self)
+        gallery_action.setCheckable(True)
+        gallery_action.toggled.connect(self.show_card_gallery)
+        view_menu.addAction(gallery_action)
 
         # Add Whatnot pricing adjustment action (paid)
         tools_menu = menubar.addMenu("Tools")
@@ -236,6 +299,12 @@ class MainWindow(QMainWindow):
         enrich_action = QAction("Enrich All Cards from Scryfall...", self)
         enrich_action.triggered.connect(lambda: self._on_paid_feature_triggered(self.enrich_all_cards_from_scryfall, feature_name='enrich_scryfall'))
         tools_menu.addAction(enrich_action)
+        import_bulk_action = QAction("Import Scryfall Bulk Data...", self)
+        import_bulk_action.triggered.connect(self.import_scryfall_bulk_data)
+        tools_menu.addAction(import_bulk_action)
+        download_images_action = QAction("Download Card Images...", self)
+        download_images_action.triggered.connect(self.download_card_images)
+        tools_menu.addAction(download_images_action)
         # Add Break/Autobox Builder action
         break_builder_action = QAction("Open Break/Autobox Builder", self)
         self.break_builder_action = break_builder_action
@@ -280,21 +349,166 @@ class MainWindow(QMainWindow):
         self.screenshot_timer.timeout.connect(self.check_screenshot_trigger)
         self.screenshot_timer.start(500)  # Check every 0.5s
 
+        startup_timer.mark("window_constructed")
+        # Load the last used JSON file once the event loop is running, i.e. after window.show()
+        QTimer.singleShot(0, self._start_deferred_load)
+
+    def _start_deferred_load(self):
+        """Phase 2 of startup: stream the last used file in on a worker thread."""
+        if not self._deferred_load_file:
+            startup_timer.mark("first_page")
+            startup_timer.write_report(cards=len(self.inventory.get_all_cards()))
+            return
+        path = self._deferred_load_file
+        self._deferred_load_file = None
+        self._start_inventory_load(path, 'startup')
+
+    def _start_inventory_load(self, path, mode):
+        """
+        Replace the inventory with the JSON list in `path`, streamed in on a worker thread.
+        The first rows are shown as soon as the first chunk is parsed.
+        mode: 'startup' (last used file), 'open' (File > Open) or 'restore' (backup).
+        """
+        self._cancel_inventory_load()
+        # Enrichment results are for the cards being replaced; keep those applied so far
+        self._stop_enrichment()
+        self._load_mode = mode
+        self._load_path = path
+        self._load_count = 0
+        self._load_error = None
+        # load_cards() copies, so this list is left untouched and can be put back on failure
+        self._load_previous = self.inventory.get_all_cards()
+        self.statusBar().showMessage(f"Loading {os.path.basename(path)}...")
+        self.load_progress.setRange(0, 0)  # busy until the first progress report
+        self.load_progress.show()
+        # Restored backups are loaded as-is; other loads get the displayed columns filled in
+        columns = () if mode == 'restore' else self.columns
+        # Connect bound slots only (no lambdas) so they are queued onto the GUI thread
+        worker = InventoryLoadWorker(path, columns)
+        worker.batch_ready.connect(self._on_inventory_chunk)
+        worker.progress.connect(self._on_load_progress)
+        worker.failed.connect(self._on_inventory_load_failed)
+        worker.finished.connect(self._on_inventory_load_finished)
+        self._load_worker = worker
+        self._load_thread = start_worker(worker, self)
+
+    def _is_inventory_loading(self):
+        return self._load_worker is not None
+
+    def _refuse_while_loading(self, title):
+        """
+        While a load is streaming in, the inventory holds only part of the new file (and
+        the current file is still the previous one), so saving or editing it must wait.
+        Returns True, after telling the user, if that is the case.
+        """
+        if not self._is_inventory_loading():
+            return False
+        QMessageBox.information(self, title, "The inventory is still loading. Please try again once it has finished.")
+        return True
+
+    def _on_inventory_chunk(self, cards):
+        if self._load_count == 0:
+            # First chunk: show the first rows immediately
+            self.inventory.load_cards(cards)
+            if self._load_mode == 'startup':
+                startup_timer.mark("first_page")
+        else:
+            self.inventory.extend_cards(cards)
+        self._load_count += len(cards)
+        if self._load_worker is not None:
+            self._load_worker.batch_consumed()
+
+    def _on_load_progress(self, done, total):
+        self.load_progress.setRange(0, total)
+        self.load_progress.setValue(done)
+
+    def _on_inventory_load_failed(self, message):
+        self._load_error = message
+
+    def _on_inventory_load_finished(self):
+        path, mode = self._load_path, self._load_mode
+        self._load_worker = None
+        self._load_thread = None
+        self.load_progress.hide()
+        if self._load_error:
+            # Put back whatever was loaded before this file
+            self.inventory.load_cards(self._load_previous)
+            self._load_previous = None
+            if mode == 'startup':
+                self.statusBar().showMessage(f"Failed to load last file: {self._load_error}")
+            elif mode == 'restore':
+                QMessageBox.critical(self, "Restore Failed", f"Failed to restore: {self._load_error}")
+            else:
+                QMessageBox.critical(self, "Error", f"Failed to load JSON: {self._load_error}")
+            return
+        self._load_previous = None
+        if not self._load_count:
+            # An empty list still replaces the inventory
+            self.inventory.load_cards([])
+        if mode == 'startup':
+            startup_timer.mark("inventory_loaded")
+            self.statusBar().showMessage(f"Loaded {self._load_count} cards from {os.path.basename(path)} (auto)")
+        elif mode == 'restore':
+            self._unsaved_changes = True
+            # Optionally, update current file path (comment out if not desired)
+            # self._current_json_file = path
+            self.statusBar().showMessage(f"Restored from backup: {os.path.basename(path)}")
+        else:
+            self.statusBar().showMessage(f"Loaded {self._load_count} cards from {os.path.basename(path)}")
+            save_last_file(path)
+            self._current_json_file = path
+        # Build indexes and settle columns once everything has arrived
+        QTimer.singleShot(0, self._build_indexes_after_load)
+
+    def _build_indexes_after_load(self):
+        timed = self._load_mode == 'startup' and not startup_timer.reported
+        self.inventory.build_indexes()
+        if timed:
+            startup_timer.mark("indexes_built")
+        self._update_columns_from_inventory()
+        if timed:
+            startup_timer.mark("columns_ready")
+            startup_timer.write_report(cards=len(self.inventory.get_all_cards()))
+
+    def _cancel_inventory_load(self):
+        """Stop a load that is still streaming in, putting back the inventory it was replacing."""
+        if self._load_worker is None:
+            return
+        try:
+            self._load_worker.batch_ready.disconnect()
+            self._load_worker.finished.disconnect(self._on_inventory_load_finished)
+            self._load_worker.cancel()
+        except RuntimeError:
+            pass  # worker already deleted
+        if self._load_thread is not None:
+            try:
+                self._load_thread.quit()
+                self._load_thread.wait(2000)
+            except RuntimeError:
+                pass
+        if self._load_count and self._load_previous is not None:
+            self.inventory.load_cards(self._load_previous)
+        self._load_previous = None
+        self._load_worker = None
+        self._load_thread = None
+        self.load_progress.hide()
+
     def _update_columns_from_inventory(self):
         # Dynamically set self.columns to all unique fields in inventory, with defaults first
         all_fields = set(DEFAULT_COLUMNS)
-        for card in self.inventory.get_all_cards():
-            all_fields.update(card.keys())
+        all_fields.update(self.inventory.get_visible_fields())
         # Keep default columns order, then add the rest sorted
         extra_fields = sorted(f for f in all_fields if f not in DEFAULT_COLUMNS)
-        self.columns = DEFAULT_COLUMNS + extra_fields
+        new_columns = DEFAULT_COLUMNS + extra_fields
+        columns_changed = new_columns != getattr(self, 'columns', None)
+        self.columns = new_columns
         self.visible_columns = self.columns.copy()
         # Update table and filter overlay if they exist
-        if hasattr(self, 'card_table'):
+        if hasattr(self, 'card_table') and columns_changed:
             self.card_table.columns = self.columns
-            self.card_table.model.columns = self.columns
-            self.card_table.update_cards(self.inventory.get_all_cards())
-        if hasattr(self, 'filter_overlay'):
+            self.card_table.model.set_columns(self.columns)
+        # Keep typed filters when the column set is unchanged
+        if hasattr(self, 'filter_overlay') and columns_changed:
             self.filter_overlay.columns = self.columns
             # Rebuild overlay filters
             for filt in self.filter_overlay.filters.values():
@@ -303,23 +517,36 @@ class MainWindow(QMainWindow):
             for col in self.columns:
                 filt = QLineEdit(self.filter_overlay)
                 filt.setPlaceholderText(col)
-                filt.textChanged.connect(self.update_table_filter)
+                filt.textChanged.connect(self.table_filter.request)
                 self.filter_overlay.filters[col] = filt
             self.filter_overlay.update_positions()
+            # The typed filters are gone with the old boxes
+            self.update_table_filter()
+
+    def _filter_texts(self):
+        return {col: filt.text() for col, filt in self.filter_overlay.filters.items()}
 
     def update_table_filter(self):
-        filters = {col: self.filter_overlay.filters[col].text() for col in self.columns}
-        # Debug: print all card values for each filter
-        for col, value in filters.items():
-            if value:
-                print(f"DEBUG: Filtering on column '{col}' with value '{value}'")
-                print(f"DEBUG: All values for '{col}': {[str(card.get(col, '')) for card in self.inventory.get_all_cards()]}")
-        if self.inventory.get_all_cards():
-            print(f"DEBUG: Keys in first card: {list(self.inventory.get_all_cards()[0].keys())}")
-        filtered = self.inventory.filter_cards(filters)
-        print(f"Filter: {filters} -> {len(filtered)} cards")  # DEBUG
+        """Re-run the filters now; results arrive in _on_filter_results."""
+        self.table_filter.run()
+
+    def _on_inventory_changed(self, change):
+        """Apply an inventory change to the table: only the rows concerned change."""
+        if change.kind == InventoryChange.RESET or self.table_filter.is_pending():
+            # A filter result still on its way would not have the change
+            self.update_table_filter()
+        elif change.kind == InventoryChange.ADDED:
+            # The filters the shown rows were selected by, not text still being typed
+            matches = card_matcher(self.table_filter.applied_filters)
+            self.card_table.cards_added([card for card in change.cards if matches(card)])
+        elif change.kind == InventoryChange.REMOVED:
+            self.card_table.cards_removed(change.cards)
+        else:
+            # Edited cards stay shown even if they no longer match the filters
+            self.card_table.cards_changed(change.cards, change.fields)
+
+    def _on_filter_results(self, filtered):
         self.card_table.update_cards(filtered)
-        self.card_table.repaint()  # Force repaint
         # Hide columns not in visible_columns
         for i, col in enumerate(self.columns):
             self.card_table.setColumnHidden(i, col not in self.visible_columns)
@@ -327,68 +554,112 @@ class MainWindow(QMainWindow):
     def open_json_file(self):
         filename, _ = QFileDialog.getOpenFileName(self, "Open JSON File", os.getcwd(), "JSON Files (*.json)")
         if filename:
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    cards = json.load(f)
-                    for card in cards:
-                        for col in self.columns:
-                            if col not in card or card[col] is None:
-                                card[col] = ""
-                            if isinstance(card[col], float) and (card[col] != card[col]):
-                                card[col] = ""
-                    self.inventory.load_cards(cards)
-                    self._update_columns_from_inventory()
-                    self.card_table.update_cards(self.inventory.get_all_cards())
-                    self.statusBar().showMessage(f"Loaded {len(cards)} cards from {os.path.basename(filename)}")
-                    save_last_file(filename)
-                    self._current_json_file = filename
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load JSON: {e}")
+            self._start_inventory_load(filename, 'open')
 
     def export_cards(self):
-        filtered_cards = self.card_table.cards
+        # Export everything that passes the current filters, not just the visible page
+        filtered_cards = list(self.card_table.filtered_cards)
         if not filtered_cards:
             QMessageBox.information(self, "Export", "No cards to export.")
             return
-        # Ask user for format
-        formats = ["CSV (*.csv)", "JSON (*.json)"]
+        # Ask user for format; a .gz or .zst suffix compresses the output
+        formats = [
+            "CSV (*.csv *.csv.gz *.csv.zst)",
+            "JSON (*.json *.json.gz *.json.zst)",
+            "Compact JSON (*.json *.json.gz *.json.zst)",
+            "NDJSON (*.ndjson *.jsonl *.ndjson.gz *.ndjson.zst)",
+        ]
         filename, selected_filter = QFileDialog.getSaveFileName(self, "Export Cards", os.getcwd(), ";;".join(formats))
         if not filename:
             return
-        try:
-            if selected_filter.startswith("CSV") or filename.lower().endswith(".csv"):
-                # Get all unique fields from the cards
-                all_fields = set()
-                for card in filtered_cards:
-                    all_fields.update(card.keys())
-                # Show column selection dialog
-                dialog = ExportColumnsDialog(sorted(all_fields), self)
-                if dialog.exec():
-                    selected_columns = dialog.get_selected_columns()
-                    if selected_columns:
-                        self._export_to_csv(filename, filtered_cards, selected_columns)
-                        self.statusBar().showMessage(f"Exported {len(filtered_cards)} cards to {os.path.basename(filename)}")
-                    else:
-                        QMessageBox.warning(self, "Export", "No columns selected for export.")
+        ext = base_extension(filename)
+        if selected_filter.startswith("CSV") or ext == ".csv":
+            # Show column selection dialog
+            dialog = ExportColumnsDialog(sorted(visible_fields(filtered_cards)), self)
+            if not dialog.exec():
+                return
+            selected_columns = dialog.get_selected_columns()
+            if not selected_columns:
+                QMessageBox.warning(self, "Export", "No columns selected for export.")
+                return
+            self._start_export("cards", export_cards_csv, filename, filtered_cards, selected_columns)
+        else:
+            if selected_filter.startswith("NDJSON") or ext in (".ndjson", ".jsonl"):
+                mode = 'ndjson'
+            elif selected_filter.startswith("Compact"):
+                mode = 'compact'
             else:
-                self._export_to_json(filename, filtered_cards)
-                self.statusBar().showMessage(f"Exported {len(filtered_cards)} cards to {os.path.basename(filename)}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", f"Failed to export: {e}")
+                mode = 'pretty'
+            self._start_export("cards", export_cards_json, filename, filtered_cards, mode=mode)
 
-    def _export_to_csv(self, filename, cards, columns):
-        """Export cards to CSV with specified columns in the given order."""
-        if not cards or not columns:
+    def _start_export(self, what, export_fn, filename, *args, on_done=None, **kwargs):
+        """
+        Run an export function on a worker thread, reporting progress in the status bar.
+        on_done(result) is called on the GUI thread when it succeeds; by default the
+        ExportStats summary is shown in the status bar.
+        """
+        if self._export_worker is not None:
+            QMessageBox.information(self, "Export", "Another export is still running. Please wait for it to finish.")
+            return False
+        self._export_what = what
+        self._export_error = None
+        self._export_stats = None
+        self._export_done = on_done or self._show_export_stats
+        self.statusBar().showMessage(f"Exporting {what} to {os.path.basename(filename)}...")
+        self.export_progress.setRange(0, 0)
+        self.export_progress.show()
+        worker = ExportWorker(export_fn, filename, *args, **kwargs)
+        worker.progress.connect(self._on_export_progress)
+        worker.completed.connect(self._on_export_completed)
+        worker.failed.connect(self._on_export_failed)
+        worker.finished.connect(self._on_export_finished)
+        self._export_worker = worker
+        self._export_thread = start_worker(worker, self)
+        return True
+
+    def _on_export_progress(self, done, total):
+        self.export_progress.setRange(0, max(total, 1))
+        self.export_progress.setValue(done)
+
+    def _on_export_completed(self, stats):
+        self._export_stats = stats
+
+    def _on_export_failed(self, message):
+        self._export_error = message
+
+    def _on_export_finished(self):
+        self._export_worker = None
+        self._export_thread = None
+        self.export_progress.hide()
+        stats = self._export_stats
+        if self._export_error:
+            QMessageBox.critical(self, "Export Failed", f"Failed to export: {self._export_error}")
+        elif stats is not None:
+            self._export_done(stats)
+
+    def _show_export_stats(self, stats):
+        self.statusBar().showMessage(
+            f"Exported {stats.rows} {self._export_what} to {os.path.basename(stats.path)} "
+            f"({stats.bytes_written / 1024:.0f} KiB, {stats.seconds:.2f}s, {stats.rows_per_second:,.0f} rows/s)")
+
+    def _cancel_export(self):
+        """Stop a running export; its partial output file is removed."""
+        if self._export_worker is None:
             return
-        with open(filename, "w", newline='', encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=columns)
-            writer.writeheader()
-            for card in cards:
-                writer.writerow({col: card.get(col, "") for col in columns})
-
-    def _export_to_json(self, filename, cards):
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(cards, f, ensure_ascii=False, indent=2)
+        try:
+            self._export_worker.finished.disconnect(self._on_export_finished)
+            self._export_worker.cancel()
+        except RuntimeError:
+            pass  # worker already deleted
+        if self._export_thread is not None:
+            try:
+                self._export_thread.quit()
+                self._export_thread.wait(5000)
+            except RuntimeError:
+                pass
+        self._export_worker = None
+        self._export_thread = None
+        self.export_progress.hide()
 
     def import_cards(self):
         formats = ["CSV (*.csv)", "JSON (*.json)"]
@@ -409,94 +680,121 @@ class MainWindow(QMainWindow):
         self._do_import_cards(filename, selected_filter, merge)
 
     def _do_import_cards(self, filename, selected_filter, merge):
-        import csv
-        import json
         from PySide6.QtWidgets import QMessageBox
+        if self._refuse_while_loading("Import"):
+            return
         try:
-            self.save_undo_state()
             # Determine file type
             if selected_filter.startswith("CSV") or filename.lower().endswith(".csv"):
-                with open(filename, newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    csv_columns = reader.fieldnames
-                    # Show column mapping dialog
-                    app_fields = [
-                        "Name", "Set name", "Set code", "Collector number", "Rarity",
-                        "Condition", "Foil", "Language", "Purchase price", "Whatnot price",
-                        "ManaBox ID", "Scryfall ID", "Misprint", "Altered", "Purchase price currency",
-                        "Quantity", "cmc", "color_identity", "colors", "legal_commander", "legal_pauper",
-                        "mana_cost", "type_line", "oracle_text"
-                    ]
-                    dialog = ImportColumnMappingDialog(csv_columns, app_fields, self)
-                    if not dialog.exec():
-                        return  # User cancelled
-                    mapping = dialog.get_mapping()
-                    # Build new_cards using mapping
-                    new_cards = []
-                    for row in reader:
-                        card = {}
-                        for csv_col, app_field in mapping.items():
-                            if app_field:
-                                val = row.get(csv_col, "")
-                                # For price fields, keep as string, never set to '0.0'
-                                if app_field in ("Purchase price", "Whatnot price"):
-                                    if val is None or val.strip() == "" or val.strip() == "0.0":
-                                        val = ""
-                                card[app_field] = val
-                        if card:
-                            new_cards.append(card)
-                    # DEBUG: Print first 5 imported cards and their 'Purchase price'
-                    print("DEBUG: First 5 imported cards after CSV import:")
-                    for c in new_cards[:5]:
-                        print({k: c.get(k, None) for k in ("Name", "Purchase price")})
+                csv_columns = read_csv_header(filename)
+                # Show column mapping dialog
+                dialog = ImportColumnMappingDialog(csv_columns, IMPORT_APP_FIELDS, self)
+                if not dialog.exec():
+                    return  # User cancelled
+                worker = CsvImportWorker(filename, dialog.get_mapping())
             else:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    new_cards = json.load(f)
-            if not isinstance(new_cards, list):
-                raise ValueError("Imported file does not contain a list of cards.")
-            if not new_cards:
-                QMessageBox.information(self, "Import", "No cards found in the file.")
-                return
-            # Normalize keys (strip whitespace)
-            for card in new_cards:
-                for k in list(card.keys()):
-                    if k != k.strip():
-                        card[k.strip()] = card.pop(k)
-            if merge:
-                # Merge: update existing or add new (by Name+Set code+Collector number)
-                existing = self.inventory.get_all_cards()
-                key_fields = ["Name", "Set code", "Collector number"]
-                def card_key(card):
-                    return tuple(card.get(f, "").strip().lower() for f in key_fields)
-                existing_map = {card_key(card): card for card in existing}
-                added, updated = 0, 0
-                for new_card in new_cards:
-                    k = card_key(new_card)
-                    if k in existing_map:
-                        # Only update fields where new_card has a non-empty value
-                        for field, value in new_card.items():
-                            if value not in (None, ""):
-                                existing_map[k][field] = value
-                        updated += 1
-                    else:
-                        existing.append(new_card)
-                        added += 1
-                self.inventory.load_cards(existing)
-                self.card_table.update_cards(self.inventory.get_all_cards())
-                QMessageBox.information(self, "Import", f"Imported {len(new_cards)} cards.\nAdded: {added}, Updated: {updated}.")
-                self._unsaved_changes = True
-                if self._auto_save:
-                    self.save_inventory()
-            else:
-                # Replace: clear and load
-                self.inventory.load_cards(new_cards)
-                self.card_table.update_cards(self.inventory.get_all_cards())
-                QMessageBox.information(self, "Import", f"Replaced inventory with {len(new_cards)} cards.")
-                self._unsaved_changes = True
-                if self._auto_save:
-                    self.save_inventory()
+                worker = JsonImportWorker(filename)
         except Exception as e:
             QMessageBox.critical(self, "Import Failed", f"Failed to import: {e}")
+            return
+        self.save_undo_state()
+        # Parsing runs on a worker; batches are merged here on the GUI thread as they arrive
+        self._import_state = {
+            'filename': filename,
+            'merge': merge,
+            'targets': self.inventory.key_index_snapshot() if merge else None,
+            'count': 0, 'added': 0, 'updated': 0,
+            'error': None, 'cancelled': False,
+        }
+        progress = QProgressDialog(f"Importing {os.path.basename(filename)}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(self._cancel_import)
+        self._import_progress = progress
+        worker.batch_ready.connect(self._on_import_batch)
+        worker.progress.connect(self._on_import_progress)
+        worker.failed.connect(self._on_import_failed)
+        worker.finished.connect(self._on_import_finished)
+        self._import_worker = worker
+        self._import_thread = start_worker(worker, self)
+
+    def _on_import_batch(self, cards):
+        state = self._import_state
+        if state is None or state['cancelled']:
+            return
+        if state['merge']:
+            added, updated = self.inventory.merge_by_key(cards, state['targets'])
+            state['added'] += added
+            state['updated'] += updated
+        elif state['count'] == 0:
+            # Replace: the first batch swaps the inventory out, later batches append
+            self.inventory.load_cards(cards)
+        else:
+            self.inventory.extend_cards(cards)
+        state['count'] += len(cards)
+        if self._import_worker is not None:
+            self._import_worker.batch_consumed()
+
+    def _on_import_progress(self, done, total):
+        progress, state = self._import_progress, self._import_state
+        if progress is None or state is None:
+            return
+        progress.setLabelText(
+            f"Importing {os.path.basename(state['filename'])} "
+            f"({done} / {total} KiB read, {state['count']} cards)...")
+        progress.setMaximum(total)
+        # setValue may process events (and even finish the import) on a modal dialog, so it goes last
+        progress.setValue(min(done, total))
+
+    def _on_import_failed(self, message):
+        if self._import_state is not None:
+            self._import_state['error'] = message
+
+    def _cancel_import(self):
+        if self._import_state is not None:
+            self._import_state['cancelled'] = True
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+
+    def _on_import_finished(self):
+        from PySide6.QtWidgets import QMessageBox
+        state = self._import_state
+        self._import_state = None
+        self._import_worker = None
+        self._import_thread = None
+        if self._import_progress is not None:
+            self._import_progress.canceled.disconnect(self._cancel_import)
+            self._import_progress.close()
+            self._import_progress = None
+        if state is None:
+            return
+        if state['cancelled'] or state['error'] or not state['count']:
+            # Drop the undo snapshot taken for this import, rolling back any batches
+            # that were already merged
+            if self._undo_stack:
+                snapshot = self._undo_stack.pop()
+                if state['count']:
+                    self.inventory.load_cards(snapshot)
+                if not self._undo_stack:
+                    self.undo_action.setEnabled(False)
+        if state['cancelled'] or state['error']:
+            if state['error']:
+                QMessageBox.critical(self, "Import Failed", f"Failed to import: {state['error']}")
+            else:
+                self.statusBar().showMessage("Import cancelled.")
+            return
+        if not state['count']:
+            QMessageBox.information(self, "Import", "No cards found in the file.")
+            return
+        self._update_columns_from_inventory()
+        if state['merge']:
+            QMessageBox.information(self, "Import", f"Imported {state['count']} cards.\nAdded: {state['added']}, Updated: {state['updated']}.")
+        else:
+            QMessageBox.information(self, "Import", f"Replaced inventory with {state['count']} cards.")
+        self._unsaved_changes = True
+        if self._auto_save:
+            self.save_inventory()
 
     def save_undo_state(self):
         # Save a deep copy of the current inventory for multi-level undo
@@ -504,6 +802,8 @@ class MainWindow(QMainWindow):
         self.undo_action.setEnabled(True)
 
     def undo_last_change(self):
+        if self._refuse_while_loading("Undo"):
+            return
         if not self._undo_stack:
             QMessageBox.information(self, "Undo", "No previous state to undo.")
             return
@@ -516,7 +816,6 @@ class MainWindow(QMainWindow):
         )
         if confirm == QMessageBox.Yes:
             self.inventory.load_cards(prev_cards)
-            self.card_table.update_cards(self.inventory.get_all_cards())
             if not self._undo_stack:
                 self.undo_action.setEnabled(False)
             # Show summary dialog with optional diff
@@ -570,16 +869,14 @@ class MainWindow(QMainWindow):
             dlg.exec()
 
     def edit_card(self, row, test_mode=False):
+        if self._refuse_while_loading("Edit Card"):
+            return
         card = self.card_table.cards[row]
         dlg = EditCardDialog(card, all_fields=self.columns, parent=self)
         if test_mode:
             def on_accept():
                 self.save_undo_state()
-                updated_card = dlg.get_card()
-                all_cards = self.inventory.get_all_cards()
-                all_cards[row] = updated_card
-                self.inventory.load_cards(all_cards)
-                self.card_table.update_cards(self.inventory.get_all_cards())
+                self.inventory.replace_card(card, dlg.get_card())
                 self._unsaved_changes = True
                 if self._auto_save:
                     self.save_inventory()
@@ -588,26 +885,20 @@ class MainWindow(QMainWindow):
             return dlg
         if dlg.exec():
             self.save_undo_state()
-            updated_card = dlg.get_card()
-            # Update the card in inventory
-            all_cards = self.inventory.get_all_cards()
-            all_cards[row] = updated_card
-            self.inventory.load_cards(all_cards)
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            # Edited in place, so the table repaints just this row
+            self.inventory.replace_card(card, dlg.get_card())
             self._unsaved_changes = True
             if self._auto_save:
                 self.save_inventory()
 
     def add_card(self, test_mode=False):
+        if self._refuse_while_loading("Add Card"):
+            return
         dlg = EditCardDialog(card=None, all_fields=self.columns, parent=self)
         if test_mode:
             def on_accept():
                 self.save_undo_state()
-                new_card = dlg.get_card()
-                all_cards = self.inventory.get_all_cards()
-                all_cards.append(new_card)
-                self.inventory.load_cards(all_cards)
-                self.card_table.update_cards(self.inventory.get_all_cards())
+                self.inventory.add_card(dlg.get_card())
                 self._unsaved_changes = True
                 if self._auto_save:
                     self.save_inventory()
@@ -616,11 +907,7 @@ class MainWindow(QMainWindow):
             return dlg
         if dlg.exec():
             self.save_undo_state()
-            new_card = dlg.get_card()
-            all_cards = self.inventory.get_all_cards()
-            all_cards.append(new_card)
-            self.inventory.load_cards(all_cards)
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            self.inventory.add_card(dlg.get_card())
             self._unsaved_changes = True
             if self._auto_save:
                 self.save_inventory()
@@ -629,6 +916,8 @@ class MainWindow(QMainWindow):
         from PySide6.QtWidgets import QMessageBox
         if not rows:
             return
+        if self._refuse_while_loading("Delete Card(s)"):
+            return
         confirm = QMessageBox.question(
             self, "Delete Card(s)",
             f"Are you sure you want to delete {len(rows)} card(s)?",
@@ -636,19 +925,17 @@ class MainWindow(QMainWindow):
         )
         if confirm == QMessageBox.Yes:
             self.save_undo_state()
-            all_cards = self.inventory.get_all_cards()
-            # Remove by index, highest first to avoid reindexing
-            for row in sorted(rows, reverse=True):
-                if 0 <= row < len(all_cards):
-                    all_cards.pop(row)
-            self.inventory.load_cards(all_cards)
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            # Rows are positions in the filtered, sorted view
+            shown = self.card_table.cards
+            self.inventory.remove_cards([shown[row] for row in rows if 0 <= row < len(shown)])
             self._unsaved_changes = True
             if self._auto_save:
                 self.save_inventory()
 
     def save_inventory(self):
         import json
+        if self._refuse_while_loading("Save"):
+            return
         if not self._current_json_file:
             self.save_inventory_as()
             return
@@ -666,6 +953,8 @@ class MainWindow(QMainWindow):
     def save_inventory_as(self):
         import json
         from PySide6.QtWidgets import QFileDialog, QMessageBox
+        if self._refuse_while_loading("Save"):
+            return
         filename, _ = QFileDialog.getSaveFileName(self, "Save Inventory As", os.getcwd(), "JSON Files (*.json)")
         if not filename:
             return
@@ -713,31 +1002,30 @@ class MainWindow(QMainWindow):
             elif reply == QMessageBox.Cancel:
                 event.ignore()
                 return
+        self._cancel_inventory_load()
+        self._cancel_export()
+        self._cancel_enrichment()
+        self._cancel_image_sync()
+        self.table_filter.shutdown()
+        self.card_table.stop_sorting()
+        self.card_table.image_prefetcher.stop()
+        if getattr(self, '_bulk_import_worker', None) is not None:
+            # The import runs in one transaction, so stopping it keeps the previous mirror
+            self._bulk_import_worker.cancel()
+            self._bulk_import_thread.quit()
+            self._bulk_import_thread.wait(5000)
         event.accept()
 
     def toggle_auto_save(self):
         self._auto_save = self.auto_save_action.isChecked()
 
     def restore_from_backup(self):
-        import json
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
+        from PySide6.QtWidgets import QFileDialog
         backup_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backups')
         filename, _ = QFileDialog.getOpenFileName(self, "Restore from Backup", backup_dir, "JSON Files (*.json)")
         if not filename:
             return
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                cards = json.load(f)
-            if not isinstance(cards, list):
-                raise ValueError("Backup file does not contain a list of cards.")
-            self.inventory.load_cards(cards)
-            self.card_table.update_cards(self.inventory.get_all_cards())
-            self._unsaved_changes = True
-            # Optionally, update current file path (comment out if not desired)
-            # self._current_json_file = filename
-            self.statusBar().showMessage(f"Restored from backup: {os.path.basename(filename)}")
-        except Exception as e:
-            QMessageBox.critical(self, "Restore Failed", f"Failed to restore: {e}")
+        self._start_inventory_load(filename, 'restore')
 
     def customize_columns(self):
         dlg = ColumnCustomizationDialog(self.columns, self.visible_columns, self.default_columns, self)
@@ -748,8 +1036,7 @@ class MainWindow(QMainWindow):
             self.save_column_prefs()
             # Update table columns and visibility
             self.card_table.columns = self.columns
-            self.card_table.model.columns = self.columns
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            self.card_table.model.set_columns(self.columns)
             # Hide columns not in visible_columns
             for i, col in enumerate(self.columns):
                 self.card_table.setColumnHidden(i, col not in self.visible_columns)
@@ -772,7 +1059,7 @@ class MainWindow(QMainWindow):
                 self.filter_overlay = FilterOverlay(self.card_table, self.columns)
                 self.filter_overlay.show()
                 for col, filt in self.filter_overlay.filters.items():
-                    filt.textChanged.connect(self.update_table_filter)
+                    filt.textChanged.connect(self.table_filter.request)
 
     def save_column_widths(self):
         # Save current column widths to preferences
@@ -845,8 +1132,7 @@ class MainWindow(QMainWindow):
             self.save_column_prefs()
             # Update table columns and visibility
             self.card_table.columns = self.columns
-            self.card_table.model.columns = self.columns
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            self.card_table.model.set_columns(self.columns)
             for i, col in enumerate(self.columns):
                 self.card_table.setColumnHidden(i, col not in self.visible_columns)
                 if col in self.column_widths:
@@ -879,47 +1165,19 @@ class MainWindow(QMainWindow):
                     self.card_table.setColumnWidth(i, self.column_widths[col])
 
     def export_to_whatnot(self):
-        import csv
-        import os
-        from PySide6.QtWidgets import QMessageBox
+        from PySide6.QtWidgets import QMessageBox, QInputDialog
         from FoS_DeckPro.ui.dialogs.export_item_listing_fields import ExportItemListingFieldsDialog
+        from FoS_DeckPro.logic.whatnot_export import WhatnotRowBuilder, WhatnotExportState, load_whatnot_template, export_whatnot
         all_cards = self.inventory.get_all_cards()
         if not all_cards:
             QMessageBox.information(self, "Export to Whatnot", "No cards to export.")
             return
         # Try to read Whatnot template for columns and defaults
-        template_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../Whatnot Card Inventory - Template (3).csv')
-        columns = None
-        defaults = None
-        if os.path.exists(template_path):
-            with open(template_path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                columns = next(reader)
-                defaults = next(reader)
-        else:
-            # Use built-in default columns and defaults
-            columns = [
-                "Category", "Sub Category", "Title", "Description", "Quantity", "Type", "Price", "Shipping Profile", "Offerable", "Hazmat", "Condition", "Cost Per Item", "SKU", "Image URL 1", "Image URL 2", "Image URL 3", "Image URL 4", "Image URL 5", "Image URL 6", "Image URL 7", "Image URL 8"
-            ]
-            defaults = [
-                "Trading Card Games", "Magic: The Gathering", "", "", "1", "Buy it Now", "1", "0-1 oz", "No", "Not Hazmat", "Near Mint", "", "", "", "", "", "", ""
-            ]
+        columns, defaults, found = load_whatnot_template()
+        if not found:
             QMessageBox.warning(self, "Whatnot Template Missing", "Template file not found. Using built-in default columns for export.")
-        # Static columns and their default values
-        static_defaults = {
-            "Category": "Trading Card Games",
-            "Sub Category": "Magic: The Gathering",
-            "Type": "Buy it Now",
-            "Shipping Profile": "0-1 oz",
-            "Offerable": "No",
-            "Hazmat": "Not Hazmat",
-            "Condition": "Near Mint",
-        }
         # Ask user for Title/Description fields and order
-        all_fields = set()
-        for card in all_cards:
-            all_fields.update(card.keys())
-        all_fields = sorted(all_fields)
+        all_fields = sorted(self.inventory.get_visible_fields())
         dlg = ExportItemListingFieldsDialog(all_fields, self)
         if not dlg.exec():
             return
@@ -928,58 +1186,28 @@ class MainWindow(QMainWindow):
             title_fields = ["Name", "Foil"] if "Name" in all_fields else all_fields[:1]
         if not desc_fields:
             desc_fields = [f for f in all_fields if f not in ("Name", "Foil", "Purchase price")]
-        # Build export rows
-        export_rows = []
-        for card in all_cards:
-            row = list(defaults)  # start with template defaults
-            # Fill static columns
-            for col, val in static_defaults.items():
-                if col in columns:
-                    row[columns.index(col)] = val
-            # Title: join selected fields
-            title = " ".join(str(card.get(f, "")) for f in title_fields if f in card)
-            if "Title" in columns:
-                row[columns.index("Title")] = title.strip()
-            # Description: join selected fields as lines
-            desc = "\n".join(f"{f}: {card.get(f, '')}" for f in desc_fields if f in card)
-            if "Description" in columns:
-                row[columns.index("Description")] = desc.strip()
-            # Quantity
-            if "Quantity" in columns:
-                row[columns.index("Quantity")] = str(card.get("Quantity", ""))
-            # Price
-            if "Price" in columns:
-                # Whatnot price minimum rule: 0 always exports as 1 (see README)
-                price_val = card.get("Whatnot price", "")
-                if str(price_val).strip() in ("0", "0.0"):
-                    row[columns.index("Price")] = "1"
-                else:
-                    row[columns.index("Price")] = str(price_val)
-            # Cost Per Item
-            if "Cost Per Item" in columns:
-                row[columns.index("Cost Per Item")] = str(card.get("Purchase price", ""))
-            # Image URL 1
-            if "Image URL 1" in columns:
-                row[columns.index("Image URL 1")] = card.get("image_url", card.get("Image URL 1", ""))
-            # Fill other columns with card data if present (but don't overwrite above)
-            for i, col in enumerate(columns):
-                if col in static_defaults or col in ("Title", "Description", "Quantity", "Price", "Cost Per Item", "Image URL 1"):
-                    continue
-                value = card.get(col, None)
-                if value is not None and value != '':
-                    row[i] = str(value)
-            export_rows.append(row)
-        # Save to CSV
+        builder = WhatnotRowBuilder(columns, defaults, title_fields, desc_fields)
+        state = WhatnotExportState()
+        full = True
+        if state.matches(builder):
+            modes = [f"Changes since last export ({state.exported_at})", "Full inventory"]
+            mode, ok = QInputDialog.getItem(self, "Export to Whatnot", "Export:", modes, 0, False)
+            if not ok:
+                return
+            full = mode == modes[1]
+        # Save to CSV (delta exports write _new/_changed/_removed files next to this name)
         out_path, _ = self.get_export_path('whatnot')
         if not out_path:
             return
-        with open(out_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            writer.writerows(export_rows)
-        QMessageBox.information(self, "Export to Whatnot", f"Exported {len(export_rows)} cards to {out_path}.")
+        self._start_export("Whatnot listings", export_whatnot, out_path, all_cards, builder,
+                           full=full, state=state, on_done=self._on_whatnot_export_done)
+
+    def _on_whatnot_export_done(self, result):
+        QMessageBox.information(self, "Export to Whatnot", result.summary())
 
     def bulk_edit_remove_dialog(self):
+        if self._refuse_while_loading("Bulk Edit/Remove"):
+            return
         dlg = BulkEditRemoveDialog(self.card_table.cards, self.columns, parent=self)
         if dlg.exec():
             action, field, value = dlg.get_result()
@@ -987,19 +1215,15 @@ class MainWindow(QMainWindow):
             if action == "remove":
                 # Remove all filtered cards
                 self.inventory.remove_cards(self.card_table.cards)
-                self.card_table.update_cards(self.inventory.get_all_cards())
                 self._unsaved_changes = True
                 if self._auto_save:
                     self.save_inventory()
             elif action == "edit":
                 # Bulk edit field for all filtered cards
-                all_cards = self.inventory.get_all_cards()
-                filtered = self.card_table.cards
-                for card in all_cards:
-                    if card in filtered:
-                        card[field] = value
-                self.inventory.load_cards(all_cards)
-                self.card_table.update_cards(self.inventory.get_all_cards())
+                filtered = list(self.card_table.cards)
+                for card in filtered:
+                    card[field] = value
+                self.inventory.notify_updated(filtered, [field])
                 self._unsaved_changes = True
                 if self._auto_save:
                     self.save_inventory()
@@ -1007,6 +1231,8 @@ class MainWindow(QMainWindow):
     def adjust_whatnot_pricing_dialog(self):
         from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QRadioButton, QButtonGroup, QMessageBox, QComboBox
         import math
+        if self._refuse_while_loading("Adjust Whatnot Pricing"):
+            return
 
         dlg = QDialog(self)
         dlg.setWindowTitle("Adjust Whatnot Pricing")
@@ -1108,7 +1334,7 @@ class MainWindow(QMainWindow):
                         print(f"WARNING: {inv_card.get('Name', '')} | {price_label}: {price_str} | Could not parse for rounding, skipped.")
                         continue
 
-            self.card_table.update_cards(self.inventory.get_all_cards())
+            self.inventory.notify_updated(all_cards, ["Whatnot price"])
             dlg.accept()
 
         apply_btn.clicked.connect(apply)
@@ -1116,31 +1342,241 @@ class MainWindow(QMainWindow):
         dlg.exec()
 
     def enrich_all_cards_from_scryfall(self):
-        from PySide6.QtWidgets import QMessageBox, QProgressDialog
-        from FoS_DeckPro.models.scryfall_api import fetch_scryfall_data
-        import time
+        """
+        Refresh stale Scryfall data in the background: cards never enriched (or enriched
+        long ago) get a full refresh, recently enriched ones only new prices, and fresh
+        ones are skipped. Results are applied batch by batch while the table stays usable;
+        Stop in the status bar cancels, and running it again resumes where it left off.
+        """
+        from FoS_DeckPro.logic.scryfall_enrichment import PRICE_MAX_AGE, SCOPE_FULL, plan_enrichment
+        from FoS_DeckPro.ui.workers import ScryfallEnrichWorker
+        from FoS_DeckPro.utils.http_cache import get_response_cache
+        if self._refuse_while_loading("Scryfall Enrichment"):
+            return
+        if self._enrich_worker is not None:
+            QMessageBox.information(self, "Scryfall Enrichment", "Enrichment is already running. Use Stop in the status bar to cancel it.")
+            return
         cards = self.inventory.get_all_cards()
         if not cards:
             QMessageBox.information(self, "Scryfall Enrichment", "No cards to enrich.")
             return
-        progress = QProgressDialog("Enriching cards from Scryfall...", "Cancel", 0, len(cards), self)
-        progress.setWindowTitle("Scryfall Enrichment")
-        progress.setWindowModality(Qt.WindowModal)
-        updated = 0
-        for i, card in enumerate(cards):
-            progress.setValue(i)
-            if progress.wasCanceled():
-                break
-            scryfall_id = card.get("Scryfall ID", "")
-            if scryfall_id:
-                data = fetch_scryfall_data(scryfall_id)
-                card.update(data)
-                updated += 1
-            time.sleep(0.1)  # To avoid Scryfall rate limits
-        progress.setValue(len(cards))
-        self.inventory.load_cards(cards)
-        self.card_table.update_cards(self.inventory.get_all_cards())
-        QMessageBox.information(self, "Scryfall Enrichment", f"Enriched {updated} cards from Scryfall.")
+        # Group the cards that need refreshing by printing so each one is looked up once
+        groups, scopes = plan_enrichment(cards)
+        if not groups:
+            groups, scopes = plan_enrichment(cards, force=True)
+            if not groups:
+                QMessageBox.information(self, "Scryfall Enrichment", "No cards have a Scryfall ID or set and collector number.")
+                return
+            reply = QMessageBox.question(
+                self, "Scryfall Enrichment",
+                "All cards are up to date. Refresh every card from Scryfall anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        full = {key for key, scope in scopes.items() if scope == SCOPE_FULL}
+        self._enrich_groups = groups
+        self._enrich_scopes = scopes
+        self._enrich_updated = 0
+        self._enrich_missing = 0
+        self._enrich_error = None
+        self._enrich_fields = self.inventory.get_unique_fields()
+        stats = get_response_cache().stats
+        self._enrich_cache_baseline = (stats.hits, stats.misses)
+        self.enrich_progress.setRange(0, len(groups))
+        self.enrich_progress.setValue(0)
+        self.enrich_progress.show()
+        self.enrich_stop_btn.setEnabled(True)
+        self.enrich_stop_btn.show()
+        self.statusBar().showMessage(
+            f"Refreshing {len(groups)} printings from Scryfall in the background "
+            f"({len(full)} full, {len(groups) - len(full)} prices only)...")
+        # An outdated bulk mirror still serves oracle data, but prices then come from the API
+        worker = ScryfallEnrichWorker([identifier for identifier, _ in groups.values()],
+                                      mirror_keys=full, mirror_max_age=PRICE_MAX_AGE)
+        worker.batch_ready.connect(self._on_enrich_batch)
+        worker.progress.connect(self._on_enrich_progress)
+        worker.failed.connect(self._on_enrich_failed)
+        worker.finished.connect(self._on_enrich_finished)
+        self._enrich_worker = worker
+        self._enrich_thread = start_worker(worker, self)
+
+    def _on_enrich_batch(self, batch):
+        from FoS_DeckPro.logic.scryfall_enrichment import SCOPE_FULL, enrichment_fields
+        found, missing, (source, source_version, as_of) = batch
+        updates = []
+        for key, data in found.items():
+            group = self._enrich_groups.pop(key, None)
+            if group is None:
+                continue
+            scope = self._enrich_scopes.get(key, SCOPE_FULL)
+            for card in group[1]:
+                updates.append((card, enrichment_fields(card, data, scope, source, as_of, source_version)))
+        self._enrich_updated += self.inventory.update_fields(updates)
+        self._enrich_missing += missing
+        if updates:
+            self._unsaved_changes = True
+
+    def _on_enrich_progress(self, done, total):
+        self.enrich_progress.setRange(0, max(total, 1))
+        self.enrich_progress.setValue(done)
+
+    def _on_enrich_failed(self, message):
+        self._enrich_error = message
+
+    def _on_enrich_finished(self):
+        from FoS_DeckPro.utils.http_cache import get_response_cache
+        cancelled = self._enrich_worker.is_cancelled()
+        self._enrich_worker = None
+        self._enrich_thread = None
+        self._enrich_groups = {}
+        self._enrich_scopes = {}
+        self.enrich_progress.hide()
+        self.enrich_stop_btn.hide()
+        if self.inventory.get_unique_fields() - self._enrich_fields:
+            self._update_columns_from_inventory()
+        message = f"Refreshed {self._enrich_updated} cards from Scryfall."
+        if self._enrich_missing:
+            message += f" {self._enrich_missing} printings were not found."
+        stats = get_response_cache().stats
+        hits, misses = stats.hits - self._enrich_cache_baseline[0], stats.misses - self._enrich_cache_baseline[1]
+        if hits or misses:
+            message += f" Response cache: {hits} hits, {misses} misses."
+        if cancelled:
+            message = "Enrichment stopped. " + message + " Run it again to resume."
+        self.statusBar().showMessage(message)
+        if self._enrich_error:
+            QMessageBox.warning(self, "Scryfall Enrichment", f"Scryfall lookup failed: {self._enrich_error}\n\n{message}")
+
+    def _stop_enrichment(self):
+        """Ask the running enrichment to stop; results applied so far are kept."""
+        if self._enrich_worker is not None:
+            self._enrich_worker.cancel()
+            self.enrich_stop_btn.setEnabled(False)
+
+    def _cancel_enrichment(self):
+        """Stop enrichment and wait for its thread, without reporting (used on close)."""
+        if self._enrich_worker is None:
+            return
+        try:
+            self._enrich_worker.finished.disconnect(self._on_enrich_finished)
+            self._enrich_worker.cancel()
+        except RuntimeError:
+            pass  # worker already deleted
+        if self._enrich_thread is not None:
+            try:
+                self._enrich_thread.quit()
+                self._enrich_thread.wait(5000)
+            except RuntimeError:
+                pass
+        self._enrich_worker = None
+        self._enrich_thread = None
+
+    def show_card_gallery(self, show=True):
+        """Show or hide the thumbnail gallery under the table."""
+        self.card_gallery.setVisible(show)
+        self._sync_gallery()
+
+    def _sync_gallery(self):
+        # A hidden gallery is brought up to date when it is shown
+        if self.card_gallery.isVisible():
+            self.card_gallery.set_cards(self.card_table.filtered_cards)
+
+    def download_card_images(self):
+        """
+        Download card images into the local image library in the background, for the
+        inventory or for every card in the local Scryfall mirror. Images already in the
+        library are skipped, so running it again after Stop resumes the sync.
+        """
+        from FoS_DeckPro.logic.image_sync import image_sync_urls
+        from FoS_DeckPro.models.image_library import get_image_library
+        from FoS_DeckPro.models.scryfall_bulk import SCRYFALL_BULK_DB_PATH
+        from FoS_DeckPro.ui.workers import ImageSyncWorker
+        if self._image_sync_worker is not None:
+            QMessageBox.information(self, "Card Images", "Image download is already running. Use Stop in the status bar to cancel it.")
+            return
+        from_mirror = False
+        if os.path.exists(SCRYFALL_BULK_DB_PATH):
+            box = QMessageBox(self)
+            box.setWindowTitle("Card Images")
+            box.setText("Download images for which cards?")
+            inventory_btn = box.addButton("Inventory", QMessageBox.AcceptRole)
+            mirror_btn = box.addButton("Scryfall Mirror", QMessageBox.AcceptRole)
+            box.addButton(QMessageBox.Cancel)
+            box.exec()
+            if box.clickedButton() not in (inventory_btn, mirror_btn):
+                return
+            from_mirror = box.clickedButton() is mirror_btn
+        urls = [] if from_mirror else image_sync_urls(self.inventory.get_all_cards())
+        if not from_mirror and not urls:
+            QMessageBox.information(self, "Card Images", "No cards have an image URL.")
+            return
+        self._image_sync_stats = None
+        self._image_sync_error = None
+        self.image_sync_progress.setRange(0, 0)
+        self.image_sync_progress.show()
+        self.image_sync_stop_btn.setEnabled(True)
+        self.image_sync_stop_btn.show()
+        source = "the Scryfall mirror" if from_mirror else f"{len(urls)} inventory images"
+        self.statusBar().showMessage(f"Downloading card images for {source} in the background...")
+        worker = ImageSyncWorker(get_image_library(), urls, from_mirror=from_mirror)
+        worker.progress.connect(self._on_image_sync_progress)
+        worker.stats.connect(self._on_image_sync_stats)
+        worker.failed.connect(self._on_image_sync_failed)
+        worker.finished.connect(self._on_image_sync_finished)
+        self._image_sync_worker = worker
+        self._image_sync_thread = start_worker(worker, self)
+
+    def _on_image_sync_progress(self, done, total):
+        self.image_sync_progress.setRange(0, max(total, 1))
+        self.image_sync_progress.setValue(done)
+
+    def _on_image_sync_stats(self, stats):
+        self._image_sync_stats = stats
+        self.statusBar().showMessage(f"Downloading card images: {stats.summary()}")
+
+    def _on_image_sync_failed(self, message):
+        self._image_sync_error = message
+
+    def _on_image_sync_finished(self):
+        from FoS_DeckPro.models.image_library import get_image_library
+        cancelled = self._image_sync_worker.is_cancelled()
+        self._image_sync_worker = None
+        self._image_sync_thread = None
+        self.image_sync_progress.hide()
+        self.image_sync_stop_btn.hide()
+        info = get_image_library().info()
+        message = f"Image library: {info['images']} images, {info['bytes'] / 2**20:.0f} MiB."
+        if self._image_sync_stats is not None:
+            message = f"Card images: {self._image_sync_stats.summary()}. " + message
+        if cancelled:
+            message = "Image download stopped. " + message + " Run it again to resume."
+        self.statusBar().showMessage(message)
+        if self._image_sync_error:
+            QMessageBox.warning(self, "Card Images", f"Image download failed: {self._image_sync_error}\n\n{message}")
+
+    def _stop_image_sync(self):
+        """Ask the running image download to stop; images stored so far are kept."""
+        if self._image_sync_worker is not None:
+            self._image_sync_worker.cancel()
+            self.image_sync_stop_btn.setEnabled(False)
+
+    def _cancel_image_sync(self):
+        """Stop the image download and wait for its thread, without reporting (used on close)."""
+        if self._image_sync_worker is None:
+            return
+        try:
+            self._image_sync_worker.finished.disconnect(self._on_image_sync_finished)
+            self._image_sync_worker.cancel()
+        except RuntimeError:
+            pass  # worker already deleted
+        if self._image_sync_thread is not None:
+            try:
+                self._image_sync_thread.quit()
+                self._image_sync_thread.wait(5000)
+            except RuntimeError:
+                pass
+        self._image_sync_worker = None
+        self._image_sync_thread = None
 
     def export_item_listings_dialog(self):
         from PySide6.QtWidgets import QFileDialog, QMessageBox
@@ -1155,7 +1591,6 @@ class MainWindow(QMainWindow):
 
     def export_item_listings(self, filename, filetype="csv"):
         from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QTextEdit, QMessageBox
-        import csv
         from FoS_DeckPro.ui.dialogs.export_item_listing_fields import ExportItemListingFieldsDialog
         # Use all filtered cards
         cards = self.inventory.filter_cards({col: self.filter_overlay.filters[col].text() for col in self.columns})
@@ -1163,10 +1598,7 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Export Item Listings", "No cards to export.")
             return
         # Gather all available fields
-        all_fields = set()
-        for card in cards:
-            all_fields.update(card.keys())
-        all_fields = sorted(all_fields)
+        all_fields = sorted(visible_fields(cards))
         # Ask user for Title/Description fields and order
         dlg = ExportItemListingFieldsDialog(all_fields, self)
         if not dlg.exec():
@@ -1182,13 +1614,13 @@ class MainWindow(QMainWindow):
             desc_lines = [f"{f}: {card.get(f, '')}" for f in desc_fields if f in card]
             desc = "\n".join(desc_lines)
             return title.strip(), desc
-        listings = [make_listing(card) for card in cards]
         # Preview dialog with pagination
         class ListingPreviewDialog(QDialog):
-            def __init__(self, listings, parent=None):
+            def __init__(self, cards, parent=None):
                 super().__init__(parent)
                 self.setWindowTitle("Preview Item Listings")
-                self.listings = listings
+                # Listings are built on demand; the full set is only generated while exporting
+                self.cards = cards
                 self.idx = 0
                 self.layout = QVBoxLayout(self)
                 self.title_label = QLabel()
@@ -1212,34 +1644,24 @@ class MainWindow(QMainWindow):
                 self.cancel_btn.clicked.connect(self.reject)
                 self.update_view()
             def update_view(self):
-                title, desc = self.listings[self.idx]
-                self.title_label.setText(f"<b>{title}</b>  <span style='font-size:10pt;'>(Listing {self.idx+1} of {len(self.listings)})</span>")
+                title, desc = make_listing(self.cards[self.idx])
+                self.title_label.setText(f"<b>{title}</b>  <span style='font-size:10pt;'>(Listing {self.idx+1} of {len(self.cards)})</span>")
                 self.desc_text.setPlainText(desc)
                 self.prev_btn.setEnabled(self.idx > 0)
-                self.next_btn.setEnabled(self.idx < len(self.listings)-1)
+                self.next_btn.setEnabled(self.idx < len(self.cards)-1)
             def prev(self):
                 if self.idx > 0:
                     self.idx -= 1
                     self.update_view()
             def next(self):
-                if self.idx < len(self.listings)-1:
+                if self.idx < len(self.cards)-1:
                     self.idx += 1
                     self.update_view()
-        dlg = ListingPreviewDialog(listings, self)
+        dlg = ListingPreviewDialog(cards, self)
         if not dlg.exec():
             return
-        # Export all listings
-        if filetype == "csv":
-            with open(filename, "w", newline='', encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Title", "Description"])
-                for title, desc in listings:
-                    writer.writerow([title, desc])
-        else:
-            with open(filename, "w", encoding="utf-8") as f:
-                for i, (title, desc) in enumerate(listings, 1):
-                    f.write(f"Listing {i}: {title}\n{desc}\n\n")
-        self.statusBar().showMessage(f"Exported {len(listings)} item listings to {filename}")
+        # Export all listings in the background
+        self._start_export("item listings", export_listings, filename, cards, make_listing, filetype=filetype)
 
     def get_export_path(self, kind):
         from PySide6.QtWidgets import QFileDialog
@@ -1252,20 +1674,81 @@ class MainWindow(QMainWindow):
     def open_break_builder(self):
         dlg = BreakBuilderDialog(self.inventory, self)
         dlg.exec()
-        self.card_table.update_cards(self.inventory.get_all_cards())
+
+    def import_scryfall_bulk_data(self):
+        """Import a Scryfall bulk-data dump (e.g. default_cards.json) into the local mirror in the background."""
+        from FoS_DeckPro.ui.workers import ScryfallBulkImportWorker
+        if getattr(self, '_bulk_import_worker', None) is not None:
+            QMessageBox.information(self, "Scryfall Bulk Data", "An import is already running.")
+            return
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Import Scryfall Bulk Data", os.getcwd(), "Scryfall bulk data (*.json *.json.gz)")
+        if not filename:
+            return
+        progress = QProgressDialog(f"Importing {os.path.basename(filename)}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Scryfall Bulk Data")
+        progress.setWindowModality(Qt.NonModal)
+        progress.setMinimumDuration(0)
+        worker = ScryfallBulkImportWorker(filename)
+        progress.canceled.connect(worker.cancel)
+        worker.progress.connect(self._on_bulk_import_progress)
+        worker.completed.connect(self._on_bulk_import_completed)
+        worker.failed.connect(self._on_bulk_import_failed)
+        worker.finished.connect(self._on_bulk_import_finished)
+        self._bulk_import_progress = progress
+        self._bulk_import_worker = worker
+        self._bulk_import_thread = start_worker(worker, self)
+
+    def _on_bulk_import_progress(self, done, total):
+        if self._bulk_import_progress is not None:
+            self._bulk_import_progress.setMaximum(total)
+            self._bulk_import_progress.setValue(min(done, total))
+
+    def _on_bulk_import_completed(self, count):
+        self.statusBar().showMessage(f"Imported {count} cards into the local Scryfall mirror.")
+
+    def _on_bulk_import_failed(self, message):
+        QMessageBox.critical(self, "Scryfall Bulk Data", f"Import failed: {message}")
+
+    def _on_bulk_import_finished(self):
+        progress = self._bulk_import_progress
+        self._bulk_import_progress = None
+        self._bulk_import_worker = None
+        self._bulk_import_thread = None
+        if progress is not None:
+            progress.close()
 
     def add_card_by_scryfall_id(self):
         from PySide6.QtWidgets import QInputDialog, QMessageBox
-        from FoS_DeckPro.models.scryfall_api import fetch_scryfall_data
+        import requests
+        from FoS_DeckPro.models.scryfall_api import ScryfallAPI, inventory_card_from_scryfall
+        from FoS_DeckPro.models.scryfall_bulk import open_bulk_store
+        if self._refuse_while_loading("Add by Scryfall ID"):
+            return
         scry_id, ok = QInputDialog.getText(self, "Add by Scryfall ID", "Enter Scryfall ID:")
         if not ok or not scry_id.strip():
             return
-        data = fetch_scryfall_data(scry_id.strip())
+        data = None
+        store = open_bulk_store()
+        if store is not None:
+            try:
+                local = store.get_by_id(scry_id.strip())
+            finally:
+                store.close()
+            if local is not None:
+                data = inventory_card_from_scryfall(local)
+        if data is None:
+            try:
+                card = ScryfallAPI().card_by_id(scry_id)
+            except requests.RequestException as e:
+                QMessageBox.warning(self, "Scryfall Error", f"Could not look up that Scryfall ID:\n{e}")
+                return
+            if card is not None:
+                data = card.inventory_card()
         if not data:
             QMessageBox.warning(self, "Not Found", "No card found for that Scryfall ID.")
             return
-        self.inventory.get_all_cards().append(data)
-        self.card_table.update_cards(self.inventory.get_all_cards())
+        self.inventory.add_card(data)
         QMessageBox.information(self, "Added", f"Card '{data.get('Name', '')}' added to inventory.")
 
     def process_packing_slips(self):
@@ -1276,9 +1759,12 @@ class MainWindow(QMainWindow):
         from FoS_DeckPro.logic.whatnot_packing_slip_parser import WhatnotPackingSlipParser
         from FoS_DeckPro.logic.whatnot_inventory_removal import remove_sold_cards_from_inventory
         from FoS_DeckPro.logic.whatnot_buyer_db import WhatnotBuyerDB
+        from FoS_DeckPro.logic.sales_ledger import SalesLedger, ledger_record
         from FoS_DeckPro.ui.dialogs.packing_slip_summary import PackingSlipSummaryDialog
         from FoS_DeckPro.ui.dialogs.edit_card import EditCardDialog
         import os
+        if self._refuse_while_loading("Process Packing Slips"):
+            return
 
         # 1. Prompt for folder
         folder = getattr(self, '_packing_slip_folder', None)
@@ -1299,11 +1785,16 @@ class MainWindow(QMainWindow):
         parser = WhatnotPackingSlipParser()
         buyer_db = WhatnotBuyerDB()
         summary = {'removed': [], 'not_found': [], 'ambiguous': [], 'buyers': [], 'files': [], 'errors': []}
-        updated_inventory = copy.deepcopy(self.inventory.get_all_cards())
+        # A shallow copy: matched cards stay the inventory's own, to be removed from it below
+        updated_inventory = list(self.inventory.get_all_cards())
         self._last_packing_slip_inventory = copy.deepcopy(self.inventory.get_all_cards())
         self._last_packing_slip_summary = None
+        self._last_packing_slip_batch = None
         buyers_updated = set()
         files_to_move = []
+        # Purchases and ledger rows are recorded in one go after all slips are parsed
+        pending_purchases = []
+        pending_ledger = []
 
         # DEBUG: Print first 5 inventory cards before removal
         print("=== INVENTORY SAMPLE BEFORE REMOVAL ===")
@@ -1359,9 +1850,10 @@ class MainWindow(QMainWindow):
                             summary['not_found'].append(log)
                         elif log['action'] == 'ambiguous':
                             summary['ambiguous'].append(log)
-                    # Update buyers DB
-                    for sale in sales:
-                        buyer_db.add_purchase(buyer, sale, show)
+                    # Queue purchases for the buyers DB and the sales ledger
+                    pending_purchases.extend((buyer, sale, show) for sale in sales)
+                    matched = {id(log['sale']): log['match'] for log in removal_log if log['action'] == 'removed'}
+                    pending_ledger.extend(ledger_record(sale, show, buyer, matched.get(id(sale))) for sale in sales)
                     buyers_updated.add(buyer['username'] or buyer['name'])
                 # Do not move/rename file yet; add to files_to_move for after confirmation
                 show_date = buyers[0]['show']['date'] if buyers and buyers[0]['show']['date'] else 'UnknownDate'
@@ -1370,9 +1862,22 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 summary['errors'].append(f"{os.path.basename(pdf_path)}: {e}\n{traceback.format_exc()}")
 
-        # Save updated inventory
-        self.inventory.load_cards(updated_inventory)
-        self.card_table.update_cards(self.inventory.get_all_cards())
+        # Update buyers DB and the sales ledger, tagged so undoing this run takes its sales back out
+        batch = uuid.uuid4().hex
+        self._last_packing_slip_batch = batch
+        try:
+            buyer_db.bulk_add_purchases(pending_purchases, batch=batch)
+        except Exception as e:
+            summary['errors'].append(f"Buyer database: {e}\n{traceback.format_exc()}")
+        finally:
+            buyer_db.close()
+        try:
+            SalesLedger().append(pending_ledger, batch=batch)
+        except Exception as e:
+            summary['errors'].append(f"Sales ledger: {e}\n{traceback.format_exc()}")
+
+        # Take the sold cards out of the inventory; the table just drops their rows
+        self.inventory.remove_cards([log['match'] for log in summary['removed']])
         self._last_packing_slip_summary = copy.deepcopy(summary)
         # Enable undo after a successful removal
         if summary['removed']:
@@ -1402,6 +1907,8 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Packing Slips", "No cards were removed. Packing slips will not be moved.")
 
     def undo_last_packing_slip_removal(self):
+        if self._refuse_while_loading("Undo Packing Slip Removal"):
+            return
         from PySide6.QtWidgets import QMessageBox
         if self._last_packing_slip_inventory is None:
             QMessageBox.information(self, "Undo", "No packing slip removal to undo.")
@@ -1412,8 +1919,22 @@ class MainWindow(QMainWindow):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if confirm == QMessageBox.Yes:
             self.inventory.load_cards(copy.deepcopy(self._last_packing_slip_inventory))
-            self.card_table.update_cards(self.inventory.get_all_cards())
-            self.statusBar().showMessage("Inventory restored to before last packing slip removal.")
+            message = "Inventory restored to before last packing slip removal."
+            batch = self._last_packing_slip_batch
+            if batch:
+                from FoS_DeckPro.logic.sales_ledger import SalesLedger
+                buyer_db = WhatnotBuyerDB()
+                try:
+                    buyer_db.remove_batch(batch)
+                except Exception as e:
+                    message += f" Could not remove its purchases from the buyer database: {e}"
+                finally:
+                    buyer_db.close()
+                try:
+                    SalesLedger().remove_batch(batch)
+                except Exception as e:
+                    message += f" Could not remove its sales from the sales ledger: {e}"
+            self.statusBar().showMessage(message)
             # Optionally, show the previous summary dialog
             if self._last_packing_slip_summary:
                 dlg = PackingSlipSummaryDialog(self._last_packing_slip_summary, self)
@@ -1426,6 +1947,7 @@ class MainWindow(QMainWindow):
                         break
             self._last_packing_slip_inventory = None
             self._last_packing_slip_summary = None
+            self._last_packing_slip_batch = None
 
     def _lock_paid_features(self):
         # Do not disable any paid feature actions/buttons; all should remain enabled
@@ -1464,6 +1986,8 @@ class MainWindow(QMainWindow):
 
     def import_csv_data(self, csv_data):
         """Import cards from CSV data string."""
+        if self._refuse_while_loading("Import"):
+            return
         import csv
         from io import StringIO
         reader = csv.DictReader(StringIO(csv_data))
@@ -1477,7 +2001,6 @@ class MainWindow(QMainWindow):
         if cards:
             self.inventory.load_cards(cards)
             self._update_columns_from_inventory()
-            self.card_table.update_cards(self.inventory.get_all_cards())
             self._unsaved_changes = True
             self.statusBar().showMessage(f"Imported {len(cards)} cards from CSV data")
 
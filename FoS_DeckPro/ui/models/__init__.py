@@ -1,6 +1,6 @@
 # Models package for FoS_DeckPro
 from .card_table_model import CardTableModel
 from .inventory import CardInventory
-from .scryfall_api import fetch_scryfall_data, get_card_price
+from FoS_DeckPro.models.scryfall_api import fetch_scryfall_data, get_card_price
 
-__all__ = ['CardTableModel', 'CardInventory', 'fetch_scryfall_data', 'get_card_price'] 
\ No newline at end of file
+__all__ = ['CardTableModel', 'CardInventory', 'fetch_scryfall_data', 'get_card_price'] 
@@ -62,10 +62,6 @@ class CardTableModel(QAbstractTableModel):
             self._headers = list(self._data[0].keys())
         self.endResetModel()
 
-    def _update_pagination(self):
-        """Placeholder method for pagination - the actual pagination is handled by CardTableView."""
-        pass
-
     @property
     def cards(self) -> List[Dict[str, Any]]:
         """Get the current cards data."""
@@ -0,0 +1,195 @@
+"""
+Card thumbnails for the gallery view.
+
+Thumbnails are made once per image URL on a small pool of ThumbnailWorker threads and
+kept in a compact on-disk cache (thumbnail_cache/, small JPEGs rather than full-size
+images), so scrolling back over a collection, in this session or a later one, only has
+to read tiny files. Full-size sources come from the image library or the image disk
+cache; images that are not on disk yet are downloaded through the shared ImageCache.
+Decoded thumbnails are kept in a bounded in-memory LRU.
+
+At most max_in_flight thumbnails are worked on at once. Requests are served newest
+first and set_window() drops those for tiles that have scrolled away, so a fast fling
+through tens of thousands of cards does not leave a long backlog behind it.
+"""
+import os
+import queue
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set
+
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from FoS_DeckPro.ui.image_cache import ImageCache, _LruCache, get_image_cache, pixmap_bytes
+from FoS_DeckPro.ui.workers import ThumbnailWorker, start_worker
+from FoS_DeckPro.utils.image_disk_cache import ImageDiskCache
+
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'thumbnail_cache')
+# A thumbnail is roughly 10 KB, so this holds tens of thousands of cards
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+THUMBNAIL_MEMORY_MAX_BYTES = 48 * 1024 * 1024
+# Scryfall's 'small' image size
+THUMBNAIL_HEIGHT = 204
+THUMBNAIL_THREADS = 2
+THUMBNAIL_MAX_IN_FLIGHT = 8
+
+
+class ThumbnailCache(QObject):
+    """
+    Thumbnail store for the gallery. Create and use it on the GUI thread;
+    get_thumbnail_cache() returns the shared instance.
+    """
+    thumbnail_ready = Signal(str)
+    thumbnail_failed = Signal(str, str)
+
+    def __init__(self, images: Optional[ImageCache] = None, disk: Optional[ImageDiskCache] = None,
+                 height: int = THUMBNAIL_HEIGHT, memory_bytes: int = THUMBNAIL_MEMORY_MAX_BYTES,
+                 threads: int = THUMBNAIL_THREADS, max_in_flight: int = THUMBNAIL_MAX_IN_FLIGHT, parent=None):
+        super().__init__(parent)
+        self.images = images if images is not None else get_image_cache()
+        self.disk = disk if disk is not None else ImageDiskCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+        self.height = height
+        self.max_in_flight = max_in_flight
+        self._memory = _LruCache(memory_bytes, pixmap_bytes)
+        self._failed: Dict[str, str] = {}
+        self._waiting: Deque[str] = deque()
+        self._requested: Set[str] = set()
+        self._making: Set[str] = set()
+        self._downloading: Set[str] = set()
+        self._jobs: queue.Queue = queue.Queue()
+        self._threads_wanted = threads
+        self._workers = []
+        self._threads = []
+        self.images.image_ready.connect(self._on_image_ready)
+        self.images.image_failed.connect(self._on_image_failed)
+
+    def thumbnail(self, url: str) -> Optional[QPixmap]:
+        """url's thumbnail, or None while it is being made (thumbnail_ready follows) or if it failed."""
+        if not url:
+            return None
+        pixmap = self._memory.get(url)
+        if pixmap is None and url not in self._failed and url not in self._requested:
+            self._requested.add(url)
+            self._waiting.append(url)
+            self._pump()
+        return pixmap
+
+    def failure(self, url: str) -> Optional[str]:
+        return self._failed.get(url)
+
+    def set_window(self, urls: Iterable[str]):
+        """
+        Make thumbnails for urls, most urgent first, instead of whatever was asked for
+        before: requests for other URLs that have not been started are dropped and their
+        downloads cancelled.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        keep = set(urls)
+        for url in list(self._downloading):
+            if url not in keep:
+                self._downloading.discard(url)
+                self.images.cancel_prefetch(url)
+        busy = self._making | self._downloading
+        # _pump() takes from the right
+        self._waiting = deque(url for url in reversed(urls)
+                              if url not in self._memory and url not in self._failed and url not in busy)
+        self._requested = set(self._waiting) | busy
+        self._pump()
+
+    def _pump(self):
+        while self._waiting and len(self._making) + len(self._downloading) < self.max_in_flight:
+            # Newest first: the tiles painted last are the ones the user is looking at now
+            url = self._waiting.pop()
+            path = self.disk.path(url)
+            if path is not None:
+                self._make(url, path, store=False)
+                continue
+            if url.startswith(('http://', 'https://')):
+                path = self.images.stored_path(url)
+            elif os.path.exists(url):
+                path = url
+            if path is not None:
+                self._make(url, path, store=True)
+            elif self.images.prefetch(url, keep=False) or self.images.is_loading(url):
+                self._downloading.add(url)
+            else:
+                self._fail(url, self.images.failure(url) or "Image not available")
+
+    def _make(self, url: str, path: str, store: bool):
+        if not self._workers:
+            self._start_workers()
+        self._making.add(url)
+        self._jobs.put((url, path, self.height, self.disk if store else None))
+
+    def _start_workers(self):
+        for _ in range(self._threads_wanted):
+            worker = ThumbnailWorker(self._jobs)
+            worker.thumbnail_ready.connect(self._on_thumbnail_ready)
+            worker.thumbnail_failed.connect(self._on_thumbnail_failed)
+            self._workers.append(worker)
+            self._threads.append(start_worker(worker))
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def _on_image_ready(self, url: str):
+        if url in self._downloading:
+            self._downloading.discard(url)
+            path = self.images.stored_path(url)
+            if path is not None:
+                self._make(url, path, store=True)
+            else:
+                self._fail(url, "Image not available")
+            self._pump()
+
+    def _on_image_failed(self, url: str, error: str):
+        if url in self._downloading:
+            self._downloading.discard(url)
+            self._fail(url, error)
+            self._pump()
+
+    def _on_thumbnail_ready(self, url: str, image: QImage):
+        self._making.discard(url)
+        self._requested.discard(url)
+        self._memory.put(url, QPixmap.fromImage(image))
+        self.thumbnail_ready.emit(url)
+        self._pump()
+
+    def _on_thumbnail_failed(self, url: str, error: str):
+        self._making.discard(url)
+        self.disk.discard(url)
+        self._fail(url, error)
+        self._pump()
+
+    def _fail(self, url: str, error: str):
+        self._requested.discard(url)
+        self._failed[url] = error
+        self.thumbnail_failed.emit(url, error)
+
+    def shutdown(self):
+        """Stop the thumbnail threads (done automatically when the application quits)."""
+        for worker in self._workers:
+            worker.cancel()
+        for thread in self._threads:
+            try:
+                thread.quit()
+                thread.wait(2000)
+            except RuntimeError:
+                pass
+        self._workers, self._threads = [], []
+
+    def summary(self) -> str:
+        return (f"Thumbnails: {len(self._memory)} in memory ({self._memory.used / 2**20:.0f} MiB), "
+                f"{self.disk.entry_count()} on disk ({self.disk.size_bytes() / 2**20:.0f} MiB, "
+                f"{self.disk.stats.hits} hits), {len(self._failed)} failed")
+
+
+_shared_cache: Optional[ThumbnailCache] = None
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """The GUI-wide thumbnail cache, created on first use (on the GUI thread)."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ThumbnailCache()
+    return _shared_cache
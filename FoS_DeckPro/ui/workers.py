@@ -0,0 +1,494 @@
+"""
+Background workers for FoS-DeckPro.
+
+Each worker is a QObject whose run() executes on its own QThread (see start_worker)
+and reports back to the GUI thread through queued signals, so long-running file and
+network jobs never block the main window.
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from contextlib import aclosing
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QSize, QThread, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+from FoS_DeckPro.models.card import normalize_card_fields
+from FoS_DeckPro.models.inventory import card_matcher
+from FoS_DeckPro.models.card_sort import sort_cards
+from FoS_DeckPro.logic.import_pipeline import iter_csv_batches, normalize_import_keys, DEFAULT_BATCH_SIZE
+from FoS_DeckPro.logic.export_service import ExportCancelled
+from FoS_DeckPro.models.scryfall_bulk import ScryfallBulkStore
+from FoS_DeckPro.logic.scryfall_enrichment import ENRICH_CONCURRENCY, resolve_printings
+from FoS_DeckPro.logic.image_sync import IMAGE_SYNC_CONCURRENCY, IMAGE_SYNC_RATE, sync_images
+from FoS_DeckPro.utils.json_stream import JsonArrayReader
+
+
+def start_worker(worker, parent=None):
+    """
+    Move `worker` to a new QThread and start it.
+    The thread quits when the worker emits finished; both objects are deleted afterwards.
+    Returns the QThread so callers can wait() on it at shutdown.
+    """
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    worker.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
+
+
+class Worker(QObject):
+    """Base class for cancellable background workers."""
+    progress = Signal(int, int)  # done, total
+    failed = Signal(str)
+    finished = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; safe to call from any thread."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    async def run_until_cancelled(self, coro):
+        """Await coro on this thread's event loop, cancelling it soon after cancel() is called."""
+        task = asyncio.ensure_future(coro)
+        # Poll the cancel flag so stopping does not wait for the task's next step
+        while not task.done():
+            await asyncio.wait([task], timeout=0.1)
+            if self.is_cancelled():
+                task.cancel()
+        try:
+            return task.result()
+        except asyncio.CancelledError:
+            return None
+
+    def run(self):
+        raise NotImplementedError
+
+
+class CardStreamWorker(Worker):
+    """
+    Base for workers that stream card batches to the GUI thread.
+    At most `max_in_flight` batches are queued at once: the consumer calls batch_consumed()
+    after handling each batch, which keeps memory bounded on very large files.
+    Subclasses implement iter_batches() yielding (cards, done, total).
+    """
+    batch_ready = Signal(object)  # list of card dicts
+
+    def __init__(self, max_in_flight=4):
+        super().__init__()
+        self._slots = threading.Semaphore(max_in_flight)
+
+    def batch_consumed(self):
+        self._slots.release()
+
+    def _emit_batch(self, batch):
+        while not self._slots.acquire(timeout=0.1):
+            if self.is_cancelled():
+                return False
+        self.batch_ready.emit(batch)
+        return True
+
+    def iter_batches(self):
+        raise NotImplementedError
+
+    def run(self):
+        try:
+            for batch, done, total in self.iter_batches():
+                if self.is_cancelled():
+                    break
+                if batch and not self._emit_batch(batch):
+                    break
+                self.progress.emit(done, total)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class InventoryLoadWorker(CardStreamWorker):
+    """
+    Streams an inventory JSON file in off the GUI thread, one card at a time, and hands it
+    back in chunks. The first chunk is kept small so the first table rows can render before
+    the rest of the file has been parsed. Progress is in KiB.
+    """
+
+    def __init__(self, path, columns, chunk_size=2000, first_chunk_size=100):
+        super().__init__()
+        self.path = path
+        self.columns = list(columns)
+        self.chunk_size = chunk_size
+        self.first_chunk_size = first_chunk_size
+
+    def iter_batches(self):
+        total = os.path.getsize(self.path) // 1024
+        size = self.first_chunk_size
+        with open(self.path, 'rb') as f:
+            reader = JsonArrayReader(f)
+            chunk = []
+            for card in reader:
+                if not isinstance(card, dict):
+                    raise ValueError("File does not contain a list of cards.")
+                chunk.append(normalize_card_fields(card, self.columns))
+                if len(chunk) >= size:
+                    yield chunk, reader.bytes_read // 1024, total
+                    chunk = []
+                    size = self.chunk_size
+                    if self.is_cancelled():
+                        return
+            yield chunk, reader.bytes_read // 1024, total
+
+
+class CsvImportWorker(CardStreamWorker):
+    """Parses a CSV file in batches using a precompiled column mapping. Progress is in KiB."""
+
+    def __init__(self, path, mapping, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__()
+        self.path = path
+        self.mapping = dict(mapping)
+        self.batch_size = batch_size
+
+    def iter_batches(self):
+        for batch, done, total in iter_csv_batches(self.path, self.mapping, self.batch_size):
+            yield batch, done // 1024, total // 1024
+
+
+class JsonImportWorker(CardStreamWorker):
+    """Streams a JSON list of cards in batches with normalized keys. Progress is in KiB."""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+
+    def iter_batches(self):
+        total = os.path.getsize(self.path) // 1024
+        with open(self.path, 'rb') as f:
+            reader = JsonArrayReader(f)
+            batch = []
+            for card in reader:
+                if not isinstance(card, dict):
+                    raise ValueError("Imported file does not contain a list of cards.")
+                batch.append(normalize_import_keys(card))
+                if len(batch) >= self.batch_size:
+                    yield batch, reader.bytes_read // 1024, total
+                    batch = []
+                    if self.is_cancelled():
+                        return
+            yield batch, reader.bytes_read // 1024, total
+
+
+class ExportWorker(Worker):
+    """
+    Runs one of the export_service functions off the GUI thread.
+    The function is called with progress= and is_cancelled= hooks; completed carries its ExportStats.
+    """
+    completed = Signal(object)  # ExportStats
+
+    def __init__(self, export_fn, *args, **kwargs):
+        super().__init__()
+        self.export_fn = export_fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            stats = self.export_fn(*self.args, progress=self.progress.emit,
+                                   is_cancelled=self.is_cancelled, **self.kwargs)
+            self.completed.emit(stats)
+        except ExportCancelled:
+            pass
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class ScryfallBulkImportWorker(Worker):
+    """Imports a Scryfall bulk-data file into the local mirror. Progress is in KiB; completed carries the card count."""
+    completed = Signal(int)
+
+    def __init__(self, path, db_path=None):
+        super().__init__()
+        self.path = path
+        self.db_path = db_path
+
+    def run(self):
+        store = None
+        try:
+            # The store is opened here so its SQLite connection belongs to this thread
+            store = ScryfallBulkStore(self.db_path) if self.db_path else ScryfallBulkStore()
+            count = store.import_file(self.path, progress=self.progress.emit, is_cancelled=self.is_cancelled)
+            self.completed.emit(count)
+        except InterruptedError:
+            pass
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            if store is not None:
+                store.close()
+            self.finished.emit()
+
+
+class ScryfallEnrichWorker(Worker):
+    """
+    Resolves printings (bulk mirror, response cache, then concurrent Scryfall requests) on
+    an asyncio loop in this worker's thread. batch_ready carries
+    (found, not_found_count, (source, source_version, as_of)) per batch, found mapping
+    identifier_key to the Scryfall card object; progress counts printings. Cards
+    themselves are only touched by the GUI thread.
+    """
+    batch_ready = Signal(object)
+
+    def __init__(self, identifiers, mirror_keys=None, mirror_max_age=None, concurrency=ENRICH_CONCURRENCY):
+        super().__init__()
+        self.identifiers = list(identifiers)
+        self.mirror_keys = mirror_keys
+        self.mirror_max_age = mirror_max_age
+        self.concurrency = concurrency
+
+    def run(self):
+        try:
+            asyncio.run(self.run_until_cancelled(self._resolve()))
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    async def _resolve(self):
+        results = resolve_printings(self.identifiers, self.concurrency, mirror_keys=self.mirror_keys,
+                                    mirror_max_age=self.mirror_max_age)
+        async with aclosing(results):
+            async for found, not_found, done, total, source in results:
+                self.batch_ready.emit((found, len(not_found), source))
+                self.progress.emit(done, total)
+
+
+class ImageSyncWorker(Worker):
+    """
+    Downloads card images into the image library (see logic.image_sync). The URLs are
+    given, or with from_mirror read from the local Scryfall mirror in this thread.
+    progress counts images; stats carries the ImageSyncStats, at most every quarter second
+    and once more at the end.
+    """
+    stats = Signal(object)
+
+    def __init__(self, library, urls=None, from_mirror=False, bulk_db_path=None,
+                 concurrency=IMAGE_SYNC_CONCURRENCY, rate=IMAGE_SYNC_RATE):
+        super().__init__()
+        self.library = library
+        self.urls = list(urls or [])
+        self.from_mirror = from_mirror
+        self.bulk_db_path = bulk_db_path
+        self.concurrency = concurrency
+        self.rate = rate
+        self._last_report = 0.0
+        self.result = None
+
+    def run(self):
+        try:
+            if self.from_mirror:
+                store = ScryfallBulkStore(self.bulk_db_path) if self.bulk_db_path else ScryfallBulkStore()
+                try:
+                    self.urls = list(dict.fromkeys(store.iter_image_urls()))
+                finally:
+                    store.close()
+            asyncio.run(self.run_until_cancelled(
+                sync_images(self.urls, self.library, self.concurrency, self.rate, self._on_progress)))
+            if self.result is not None:
+                self.stats.emit(self.result)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    def _on_progress(self, stats):
+        self.result = stats
+        now = time.monotonic()
+        if now - self._last_report >= 0.25 or stats.done == stats.total:
+            self._last_report = now
+            self.progress.emit(stats.done, stats.total)
+            self.stats.emit(stats)
+
+
+class ImageDecodeWorker(Worker):
+    """
+    One of the ImageCache's decode threads. Takes (priority, seq, job) items from a
+    shared queue until cancelled or handed a None job, where job is
+    (url, source, heights, disk): source is encoded bytes, a file path or an already
+    decoded QImage. Decoded images are emitted with decoded, then each requested
+    rendition height with rendition_ready. Downloaded bytes are written to `disk` (an
+    ImageDiskCache) once they have decoded successfully.
+    """
+    decoded = Signal(str, QImage)  # url, full-size image
+    rendition_ready = Signal(str, int, QImage)  # url, height, scaled image
+    decode_failed = Signal(str, str)  # url, error
+
+    def __init__(self, jobs: queue.PriorityQueue):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        try:
+            while not self.is_cancelled():
+                try:
+                    _, _, job = self.jobs.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if job is None:
+                    break
+                self._process(*job)
+        finally:
+            self.finished.emit()
+
+    def _process(self, url, source, heights, disk):
+        if isinstance(source, QImage):
+            image = source
+        else:
+            image = QImage()
+            loaded = image.loadFromData(source) if isinstance(source, bytes) else image.load(source)
+            if not loaded or image.isNull():
+                self.decode_failed.emit(url, "Not a valid image")
+                return
+            if disk is not None and isinstance(source, bytes):
+                try:
+                    disk.put(url, source)
+                except OSError as e:
+                    print(f"Could not write image cache entry for {url}: {e}")
+            self.decoded.emit(url, image)
+        for height in heights:
+            if height < image.height():
+                self.rendition_ready.emit(url, height, image.scaledToHeight(height, Qt.SmoothTransformation))
+            else:
+                self.rendition_ready.emit(url, height, image)
+
+
+class ThumbnailWorker(Worker):
+    """
+    One of the ThumbnailCache's threads. Takes (url, path, height, disk) jobs from a
+    shared queue until cancelled or handed None, reads the image at `path` scaled to
+    `height` (JPEG is decoded at reduced size rather than decoded in full and shrunk),
+    and emits thumbnail_ready. With `disk` (an ImageDiskCache) set the thumbnail is
+    also stored there, as JPEG unless it has transparency.
+    """
+    thumbnail_ready = Signal(str, QImage)
+    thumbnail_failed = Signal(str, str)  # url, error
+
+    def __init__(self, jobs: queue.Queue):
+        super().__init__()
+        self.jobs = jobs
+
+    def run(self):
+        try:
+            while not self.is_cancelled():
+                try:
+                    job = self.jobs.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if job is None:
+                    break
+                self._process(*job)
+        finally:
+            self.finished.emit()
+
+    def _process(self, url, path, height, disk):
+        reader = QImageReader(path)
+        reader.setDecideFormatFromContent(True)
+        size = reader.size()
+        if size.isValid() and size.height() > height:
+            reader.setScaledSize(QSize(max(1, round(size.width() * height / size.height())), height))
+        image = reader.read()
+        if image.isNull():
+            self.thumbnail_failed.emit(url, reader.errorString())
+            return
+        if disk is not None:
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.WriteOnly)
+            image.save(buffer, "PNG" if image.hasAlphaChannel() else "JPG", 85)
+            try:
+                disk.put(url, bytes(data))
+            except OSError as e:
+                print(f"Could not write thumbnail cache entry for {url}: {e}")
+        self.thumbnail_ready.emit(url, image)
+
+
+class QueryWorker(Worker):
+    """
+    Base for the threads behind BackgroundQuery (table filtering and sorting). Takes
+    (generation, *args) jobs from a queue until cancelled or handed None; when several
+    are queued only the newest runs. Subclasses implement query(generation, *args),
+    checking is_superseded() now and then to abandon work that supersede() has made
+    obsolete (returning None). Results are emitted with completed together with their
+    generation.
+    """
+    completed = Signal(int, object)  # generation, result
+
+    def __init__(self, jobs: queue.Queue):
+        super().__init__()
+        self.jobs = jobs
+        self._latest = 0
+
+    def supersede(self, generation: int):
+        """Mark generation as the newest query; safe to call from any thread."""
+        self._latest = generation
+
+    def is_superseded(self, generation: int) -> bool:
+        return generation != self._latest or self.is_cancelled()
+
+    def run(self):
+        try:
+            while not self.is_cancelled():
+                try:
+                    job = self.jobs.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                # Skip straight to the newest query
+                while job is not None:
+                    try:
+                        job = self.jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                if job is None:
+                    break
+                try:
+                    result = self.query(*job)
+                except Exception as e:
+                    self.failed.emit(str(e))
+                    continue
+                if result is not None and not self.is_superseded(job[0]):
+                    self.completed.emit(job[0], result)
+        finally:
+            self.finished.emit()
+
+    def query(self, generation, *args):
+        raise NotImplementedError
+
+
+class FilterWorker(QueryWorker):
+    """Answers (generation, cards, filters) jobs with the matching cards, checking for a newer query between chunks."""
+    CHUNK_SIZE = 5000
+
+    def query(self, generation, cards, filters):
+        matches = card_matcher(filters)
+        result = []
+        for start in range(0, len(cards), self.CHUNK_SIZE):
+            if self.is_superseded(generation):
+                return None
+            result.extend(card for card in cards[start:start + self.CHUNK_SIZE] if matches(card))
+        return result
+
+
+class SortWorker(QueryWorker):
+    """Sorts (generation, cards, sort_spec, sort_keys) jobs with sort_cards()."""
+
+    def query(self, generation, cards, sort_spec, sort_keys=None):
+        return sort_cards(cards, sort_spec, sort_keys)
@@ -10,6 +10,12 @@ ERROR_REPORTING_ENDPOINT = ''
 # App version for error reporting and diagnostics
 APP_VERSION = '1.0.0'
 
+# --- Startup Timings ---
+# Set FOS_STARTUP_TIMINGS=1 to print the startup timing report and append it to startup_timings.jsonl
+STARTUP_TIMINGS_ENABLED = os.environ.get('FOS_STARTUP_TIMINGS') == '1'
+# startup_timings.jsonl is trimmed to its newest entries once it grows past this size
+STARTUP_TIMINGS_MAX_BYTES = 256 * 1024
+
 def save_last_file(path):
     try:
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
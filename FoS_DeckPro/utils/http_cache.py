@@ -0,0 +1,283 @@
+"""
+Disk-backed HTTP response cache.
+
+Responses are kept in SQLite (http_cache.sqlite3), keyed by URL (plus a hash of the
+request body for POSTs), together with their ETag/Last-Modified validators. How long a
+stored response counts as fresh depends on the class of data the caller needs: oracle
+text barely changes, prices change daily. An expired response that has validators is
+revalidated with a conditional request, so an unchanged resource costs a 304 rather than
+a full download. The cache is capped in size and evicts least recently used entries.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+HTTP_CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'http_cache.sqlite3')
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Freshness per data class, in seconds
+DATA_CLASS_TTLS = {
+    'oracle': 30 * DAY,   # names, types, rules text, images
+    'prices': 12 * HOUR,  # Scryfall refreshes prices once a day
+    'default': DAY,
+}
+
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters since the cache was opened (or reset)."""
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses + self.revalidated
+
+    @property
+    def hit_rate(self) -> float:
+        # A 304 revalidation saves the download, so it counts towards the hit rate
+        return (self.hits + self.revalidated) / self.requests if self.requests else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.revalidated} revalidated, {self.misses} misses "
+                f"({self.hit_rate:.0%} served from cache)")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """
+    Thread-safe response cache. One instance can be shared across threads; all access to
+    the SQLite connection is serialized by a lock.
+    """
+
+    def __init__(self, db_path: str = HTTP_CACHE_DB_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DATA_CLASS_TTLS, **(ttls or {}))
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def cache_key(url: str, body: Any = None) -> str:
+        """The URL, or for requests with a JSON body the URL plus a hash of the body."""
+        if body is None:
+            return url
+        digest = hashlib.sha1(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{url}#{digest}"
+
+    def ttl(self, data_class: str) -> float:
+        return self.ttls.get(data_class, self.ttls['default'])
+
+    # --- Storage ---
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """The stored response for key regardless of age (does not touch the stats)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def put(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.put_many([(key, body, etag, last_modified)])
+
+    def put_many(self, entries: Iterable[Tuple[str, bytes, Optional[str], Optional[str]]]):
+        """Store several (key, body, etag, last_modified) responses in one transaction."""
+        now = time.time()
+        rows = []
+        for key, body, etag, last_modified in entries:
+            blob = zlib.compress(body)
+            rows.append((key, blob, etag, last_modified, now, now, len(blob)))
+        if not rows:
+            return
+        with self._lock, self.conn:
+            keys = [(row[0],) for row in rows]
+            replaced = 0
+            for (key,) in keys:
+                old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                if old:
+                    replaced += old[0]
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._size += sum(row[6] for row in rows) - replaced
+            self.stats.stores += len(rows)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def put_json(self, key: str, payload: Any):
+        self.put(key, json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    def _evict(self):
+        # Drop least recently used entries until the cache is back under 90% of its cap
+        target = int(self.max_bytes * 0.9)
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            doomed.append((key,))
+            self._size -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.stats.evictions += len(doomed)
+
+    def _touch(self, keys, fetched: bool = False):
+        now = time.time()
+        column = "fetched_at = ?, accessed_at = ?" if fetched else "accessed_at = ?"
+        params = [((now, now, key) if fetched else (now, key)) for key in keys]
+        with self._lock, self.conn:
+            self.conn.executemany(f"UPDATE responses SET {column} WHERE key = ?", params)
+
+    def size_bytes(self) -> int:
+        return self._size
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    # --- Lookups ---
+
+    def get_json(self, key: str, data_class: str = 'default') -> Optional[Any]:
+        """The stored payload for key if it is still fresh for data_class, else None."""
+        return self.get_many_json([key], data_class).get(key)
+
+    def get_many_json(self, keys: Iterable[str], data_class: str = 'default') -> Dict[str, Any]:
+        """Fresh payloads for any of keys, looked up in bulk. Keys not returned count as misses."""
+        keys = list(dict.fromkeys(keys))
+        cutoff = time.time() - self.ttl(data_class)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self.conn.execute(
+                    f"SELECT key, body FROM responses WHERE fetched_at >= ? AND key IN ({','.join('?' * len(chunk))})",
+                    [cutoff] + chunk).fetchall()
+                for key, blob in rows:
+                    found[key] = json.loads(zlib.decompress(blob))
+            self.stats.hits += len(found)
+            self.stats.misses += len(keys) - len(found)
+        if found:
+            self._touch(found)
+        return found
+
+    def check(self, key: str, data_class: str = 'default') -> Tuple[Optional[CachedResponse], bool]:
+        """
+        The stored response for key (None if absent) and whether it is still fresh for
+        data_class. A fresh entry counts as a hit; a stale one is left for the caller to
+        revalidate (see validators) or replace.
+        """
+        entry = self.lookup(key)
+        if entry is None or entry.fetched_at < time.time() - self.ttl(data_class):
+            return entry, False
+        with self._lock:
+            self.stats.hits += 1
+        self._touch([key])
+        return entry, True
+
+    @staticmethod
+    def validators(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Conditional request headers (If-None-Match/If-Modified-Since) for a stored response."""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, key: str):
+        """Record a 304 for key: the stored response is fresh again."""
+        with self._lock:
+            self.stats.revalidated += 1
+        self._touch([key], fetched=True)
+
+    def store_response(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Record a miss for key and store the response that was downloaded for it."""
+        with self._lock:
+            self.stats.misses += 1
+        self.put(key, body, etag, last_modified)
+
+    def fetch_json(self, session, url: str, data_class: str = 'default', method: str = 'GET',
+                   json_body: Any = None, timeout: Optional[float] = None) -> Any:
+        """
+        Return the JSON payload for a request, from the cache when fresh, otherwise via
+        session.request() (a requests.Session or a ScryfallClient). An expired entry
+        with validators is revalidated with If-None-Match/If-Modified-Since. HTTP errors
+        raise as with response.raise_for_status().
+        """
+        key = self.cache_key(url, json_body)
+        entry, fresh = self.check(key, data_class)
+        if fresh:
+            return entry.json()
+        response = session.request(method, url, json=json_body, headers=self.validators(entry), timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            self.revalidated(key)
+            return entry.json()
+        response.raise_for_status()
+        self.store_response(key, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.json()
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """The process-wide response cache, opened on first use."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,154 @@
+"""
+On-disk card image cache.
+
+Downloaded images are stored as files under image_cache/, named by a hash of their URL.
+Scryfall image URLs carry a version query string, so a stored file never goes stale and
+is kept until the cache outgrows its cap, when the least recently used files are
+deleted. Reads and writes are thread-safe.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlsplit
+
+from FoS_DeckPro.utils.http_cache import CacheStats
+
+IMAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'image_cache')
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+class ImageDiskCache:
+    """Size-capped, least-recently-used cache of image files keyed by URL."""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # File name -> size, least recently used first (file mtimes carry the order across sessions)
+        files = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((name, size) for _, name, size in files)
+        self._size = sum(self._entries.values())
+
+    @staticmethod
+    def file_name(url: str) -> str:
+        """Cache file name for url: a hash of the URL plus the image's extension."""
+        ext = os.path.splitext(urlsplit(url).path)[1].lower()
+        if ext not in _IMAGE_EXTENSIONS:
+            ext = '.img'
+        return hashlib.sha1(url.encode('utf-8')).hexdigest() + ext
+
+    def path(self, url: str) -> Optional[str]:
+        """Path of the cached file for url, or None (a miss). A hit marks the file as recently used."""
+        name = self.file_name(url)
+        with self._lock:
+            if name not in self._entries:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.stats.hits += 1
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except OSError:
+            # Deleted behind our back
+            self.discard(url)
+            return None
+        return path
+
+    def contains(self, url: str) -> bool:
+        """Whether url is cached (does not touch the stats or the LRU order)."""
+        return self.file_name(url) in self._entries
+
+    def get(self, url: str) -> Optional[bytes]:
+        path = self.path(url)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            self.discard(url)
+            return None
+
+    def put(self, url: str, data: bytes) -> str:
+        """Store data for url (atomically, so readers never see a partial file); returns its path."""
+        name = self.file_name(url)
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self.stats.stores += 1
+            if self._size > self.max_bytes:
+                self._evict(keep=name)
+        return path
+
+    def discard(self, url: str):
+        """Forget url's file, e.g. because it turned out to be unreadable."""
+        name = self.file_name(url)
+        with self._lock:
+            self._size -= self._entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _evict(self, keep: str):
+        # Drop least recently used files until the cache is back under 90% of its cap
+        target = int(self.max_bytes * 0.9)
+        for name in list(self._entries):
+            if self._size <= target:
+                break
+            if name == keep:
+                continue
+            self._size -= self._entries.pop(name)
+            self.stats.evictions += 1
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def size_bytes(self) -> int:
+        return self._size
+
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            names = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+_shared_cache: Optional[ImageDiskCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_image_disk_cache() -> ImageDiskCache:
+    """The process-wide image disk cache, opened on first use."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ImageDiskCache()
+        return _shared_cache
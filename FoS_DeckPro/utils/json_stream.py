@@ -0,0 +1,103 @@
+"""
+Incremental reader for large JSON array files.
+
+Inventory, backup and Scryfall bulk files are a single top-level JSON array.
+JsonArrayReader decodes one element at a time from a bounded buffer, so peak
+memory stays close to the size of the objects kept by the caller rather than
+the whole document plus its parsed copy.
+"""
+import codecs
+import json
+from typing import Any, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_END = _WHITESPACE + ',]'
+
+
+class JsonArrayReader:
+    """
+    Iterate the elements of a top-level JSON array from a binary file object.
+    bytes_read tracks how much of the file has been consumed, for progress reporting.
+    """
+
+    def __init__(self, fp, chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk into the buffer. Returns False at end of file."""
+        if self._eof:
+            return False
+        raw = self.fp.read(self.chunk_size)
+        if not raw:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._text.decode(b'', final=True)
+            self._pos = 0
+            return False
+        self.bytes_read += len(raw)
+        # Drop consumed text so the buffer stays bounded
+        self._buf = self._buf[self._pos:] + self._text.decode(raw)
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> str:
+        """Advance past whitespace and return the next character ('' at end of file)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._skip_whitespace() != '[':
+            raise ValueError("File does not contain a JSON list.")
+        self._pos += 1
+        first = True
+        while True:
+            ch = self._skip_whitespace()
+            if ch == ']':
+                self._pos += 1
+                return
+            if ch == '':
+                raise ValueError("Unexpected end of file inside JSON list.")
+            if not first:
+                if ch != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON list, found {ch!r}.")
+                self._pos += 1
+                if self._skip_whitespace() == '':
+                    raise ValueError("Unexpected end of file inside JSON list.")
+            first = False
+            yield self._decode_value()
+
+    def _decode_value(self) -> Any:
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number is only complete once a delimiter follows it; it may have been cut off mid-token
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and (end == len(self._buf) or self._buf[end] not in _NUMBER_END)
+                    and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of the JSON array stored in `path` one at a time."""
+    with open(path, 'rb') as f:
+        yield from JsonArrayReader(f, chunk_size)
+
@@ -0,0 +1,96 @@
+"""
+Startup phase timing for FoS-DeckPro.
+
+Records how long each startup phase takes (window construction, first page,
+full inventory load, index build) so regressions are visible. Reporting is
+opt-in (FOS_STARTUP_TIMINGS=1, see config): the report is then printed to the
+console and appended to startup_timings.jsonl, which is kept under
+STARTUP_TIMINGS_MAX_BYTES by dropping its oldest entries.
+"""
+import json
+import os
+import time
+import datetime
+
+from FoS_DeckPro.utils import config
+
+TIMINGS_FILE = os.path.join(os.path.dirname(__file__), '..', 'startup_timings.jsonl')
+
+
+class StartupTimer:
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.phases = []  # list of (phase name, seconds since previous mark, seconds since start)
+        self.reported = False
+
+    def restart(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.phases = []
+        self.reported = False
+
+    def mark(self, phase):
+        """Record the end of a startup phase."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - self._start))
+        self._last = now
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def report(self):
+        """Return a human-readable timing table."""
+        lines = ["=== STARTUP TIMINGS ==="]
+        for phase, delta, total in self.phases:
+            lines.append(f"{phase:<24} +{delta * 1000:8.1f} ms  (t={total * 1000:8.1f} ms)")
+        return "\n".join(lines)
+
+    def write_report(self, path=TIMINGS_FILE, enabled=None, **extra):
+        """
+        Print the report and append it as one JSON line to `path` if startup timings are
+        enabled (`enabled` overrides config.STARTUP_TIMINGS_ENABLED). Only the first call reports.
+        """
+        if self.reported:
+            return
+        self.reported = True
+        if enabled is None:
+            enabled = config.STARTUP_TIMINGS_ENABLED
+        if not enabled:
+            return
+        print(self.report())
+        entry = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "phases": {phase: round(delta * 1000, 1) for phase, delta, _ in self.phases},
+            "total_ms": round(self.elapsed() * 1000, 1),
+        }
+        entry.update(extra)
+        try:
+            _trim(path, config.STARTUP_TIMINGS_MAX_BYTES)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            print(f"WARNING: Could not write startup timings to {path}: {e}")
+
+
+def _trim(path, max_bytes):
+    """Drop the oldest lines of `path` until it is at most half of max_bytes, once it exceeds max_bytes."""
+    try:
+        if os.path.getsize(path) <= max_bytes:
+            return
+    except OSError:
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    kept, size = [], 0
+    for line in reversed(lines):
+        size += len(line.encode('utf-8'))
+        if size > max_bytes // 2:
+            break
+        kept.append(line)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(reversed(kept))
+
+
+# Global startup timer, started when this module is first imported
+startup_timer = StartupTimer()
@@ -1,4 +1,5 @@
 import sys
+from FoS_DeckPro.utils.startup_timer import startup_timer
 from PySide6.QtWidgets import QApplication
 from FoS_DeckPro.ui.main_window import MainWindow
 
@@ -11,7 +12,9 @@ except ImportError:
     print("Warning: Unified APTPT/REI/HCE system not available")
 
 def main():
+    startup_timer.mark("imports")
     app = QApplication(sys.argv)
+    startup_timer.mark("qapplication")
     
     # Start unified control system if available
     if UNIFIED_SYSTEM_AVAILABLE:
@@ -23,6 +26,7 @@ def main():
     
     window = MainWindow()
     window.show()
+    startup_timer.mark("window_shown")
     
     # Run the application
     exit_code = app.exec()
@@ -0,0 +1,62 @@
+import random
+
+from FoS_DeckPro.models import card_sort
+from FoS_DeckPro.models.card_sort import SortKeyCache, natural_key, sort_cards, sort_key
+
+
+def _names(cards):
+    return [card["Name"] for card in cards]
+
+
+def test_sort_keys_are_type_aware():
+    assert natural_key("10a") == ("", 10, "a")
+    assert sort_key("Collector number", "2") < sort_key("Collector number", "10") < sort_key("Collector number", "10a")
+    assert sort_key("usd", "$1,200.50") == 1200.5
+    assert sort_key("usd", "n/a") is None
+    assert sort_key("usd", "nan") is None
+    assert sort_key("Name", "  ") is None
+    assert sort_key("Name", "Bear") == sort_key("Name", "bear")
+
+
+def test_sort_cards_multi_column_blanks_last_and_stable():
+    cards = [
+        {"Name": "a", "Set code": "NEO", "usd": "2"},
+        {"Name": "b", "Set code": "neo", "usd": ""},
+        {"Name": "c", "Set code": "DMU", "usd": "10"},
+        {"Name": "d", "Set code": "NEO", "usd": "2.0"},
+        {"Name": "e", "Set code": "", "usd": "1"},
+    ]
+    assert _names(sort_cards(cards, [("usd", False)])) == ["e", "a", "d", "c", "b"]
+    assert _names(sort_cards(cards, [("usd", True)])) == ["c", "a", "d", "e", "b"]
+    assert _names(sort_cards(cards, [("Set code", False), ("usd", True)])) == ["c", "a", "d", "b", "e"]
+    assert _names(sort_cards(cards, [("Set code", True), ("usd", False)])) == ["a", "d", "b", "c", "e"]
+    assert sort_cards([], [("usd", False)]) == []
+
+
+def test_sort_key_cache_picks_up_new_and_list_values():
+    keys = SortKeyCache()
+    cards = [{"Name": "x", "cmc": "3"}, {"Name": "y", "cmc": "1"}]
+    assert _names(sort_cards(cards, [("cmc", False)], keys)) == ["y", "x"]
+
+    # Edited and new values not seen before re-rank the column
+    cards[0]["cmc"] = "0"
+    cards.append({"Name": "z", "cmc": "2", "colors": ["G"]})
+    assert _names(sort_cards(cards, [("cmc", False)], keys)) == ["x", "y", "z"]
+    # Keys of values no longer in use are kept, so their ranks still count
+    assert keys.ranks("cmc", cards) == ([0, 1, 2], 4)
+    assert _names(sort_cards(cards, [("colors", False)], keys)) == ["z", "x", "y"]
+
+    keys.clear("cmc")
+    assert keys.ranks("cmc", cards[:1]) == ([0], 1)
+
+
+def test_sort_cards_matches_sorted_across_merge_runs(monkeypatch):
+    original = card_sort._sorted_indexes
+    monkeypatch.setattr(card_sort, "_sorted_indexes", lambda keys: original(keys, run=7))
+    rng = random.Random(5)
+    cards = [{"Name": str(i), "Quantity": str(rng.randint(0, 5)) if i % 9 else ""} for i in range(100)]
+
+    result = sort_cards(cards, [("Quantity", True)])
+
+    expected = sorted(cards, key=lambda card: (card["Quantity"] == "", -float(card["Quantity"] or 0)))
+    assert result == expected
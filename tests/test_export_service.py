@@ -0,0 +1,78 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from FoS_DeckPro.logic import export_service
+from FoS_DeckPro.logic.export_service import (ExportCancelled, base_extension, detect_compression, export_cards_csv,
+                                              export_cards_json, export_listings)
+
+CARDS = [{"Name": "Bolt", "Quantity": 2, "Note": "a, \"quoted\"\nline"}, {"Name": "Jötun", "Quantity": 1}]
+
+
+def test_extensions():
+    assert detect_compression("cards.csv.GZ") == "gzip"
+    assert detect_compression("cards.json.zst") == "zstd"
+    assert detect_compression("cards.csv") is None
+    assert base_extension("cards.csv.gz") == ".csv"
+    assert base_extension("cards.ndjson") == ".ndjson"
+
+
+@pytest.mark.parametrize("name", ["cards.csv", "cards.csv.gz"])
+def test_csv_export(tmp_path, name):
+    path = tmp_path / name
+    stats = export_cards_csv(str(path), CARDS, ["Name", "Note"])
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["Name", "Note"], ["Bolt", CARDS[0]["Note"]], ["Jötun", ""]]
+    assert (stats.rows, stats.bytes_written) == (2, path.stat().st_size)
+    assert stats.compression == ("gzip" if name.endswith(".gz") else None)
+
+
+@pytest.mark.parametrize("mode", ["pretty", "compact"])
+@pytest.mark.parametrize("cards", [CARDS, []])
+def test_json_export(tmp_path, mode, cards):
+    path = tmp_path / "cards.json"
+    export_cards_json(str(path), cards, mode)
+    text = path.read_text(encoding="utf-8")
+    assert json.loads(text) == cards
+    if mode == "pretty":
+        assert text == json.dumps(cards, ensure_ascii=False, indent=2)
+
+
+def test_ndjson_export(tmp_path):
+    path = tmp_path / "cards.ndjson"
+    export_cards_json(str(path), CARDS, "ndjson")
+    assert [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()] == CARDS
+    with pytest.raises(ValueError):
+        export_cards_json(str(path), CARDS, "yaml")
+
+
+def test_listings_export(tmp_path):
+    path = tmp_path / "listings.txt"
+    export_listings(str(path), CARDS, lambda card: (card["Name"], f"Qty {card['Quantity']}"), filetype="txt")
+    assert path.read_text(encoding="utf-8") == "Listing 1: Bolt\nQty 2\n\nListing 2: Jötun\nQty 1\n\n"
+
+
+def test_cancelled_export_leaves_no_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_service, "PROGRESS_INTERVAL", 1)
+    path = tmp_path / "cards.csv"
+    path.write_text("previous export", encoding="utf-8")
+    reports = []
+    with pytest.raises(ExportCancelled):
+        export_cards_csv(str(path), CARDS, ["Name"], progress=lambda done, total: reports.append(done),
+                         is_cancelled=lambda: len(reports) >= 1)
+    assert reports == [1]
+    assert path.read_text(encoding="utf-8") == "previous export"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cards.csv"]
+
+
+def test_zstd_export(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "cards.json.zst"
+    export_cards_json(str(path), CARDS, "compact")
+    with zstandard.ZstdDecompressor().stream_reader(open(path, "rb")) as raw:
+        assert json.loads(io.TextIOWrapper(raw, encoding="utf-8").read()) == CARDS
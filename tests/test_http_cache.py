@@ -0,0 +1,110 @@
+import json
+import random
+import types
+
+import pytest
+
+from FoS_DeckPro.utils import http_cache
+from FoS_DeckPro.utils.http_cache import HOUR, ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, json=None, headers=None, timeout=None):
+        self.requests.append((method, url, headers))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(http_cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_freshness_depends_on_the_data_class(cache, clock):
+    cache.put_json("card", {"name": "Bolt"})
+    clock[0] += 13 * HOUR
+    assert cache.get_json("card", "oracle") == {"name": "Bolt"}
+    assert cache.get_json("card", "prices") is None
+    assert cache.get_many_json(["card", "card", "other"], "oracle") == {"card": {"name": "Bolt"}}
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+
+
+def test_stale_entry_is_revalidated(cache, clock):
+    url = "https://api.scryfall.com/cards/abc"
+    session = FakeSession(FakeResponse(200, {"usd": "1"}, {"ETag": '"v1"'}), FakeResponse(304))
+    assert cache.fetch_json(session, url, "prices") == {"usd": "1"}
+    assert cache.fetch_json(session, url, "prices") == {"usd": "1"}
+    assert len(session.requests) == 1
+    clock[0] += 13 * HOUR
+    assert cache.fetch_json(session, url, "prices") == {"usd": "1"}
+    assert session.requests[-1][2] == {"If-None-Match": '"v1"'}
+    # The 304 made the entry fresh again
+    assert cache.check(cache.cache_key(url), "prices")[1]
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.revalidated) == (1, 2, 1)
+
+
+def test_changed_resource_replaces_the_entry(cache, clock):
+    url = "https://api.scryfall.com/cards/collection"
+    body = {"identifiers": [{"id": "abc"}]}
+    session = FakeSession(FakeResponse(200, {"v": 1}, {"Last-Modified": "Mon"}), FakeResponse(200, {"v": 2}),
+                          FakeResponse(500))
+    assert cache.fetch_json(session, url, method="POST", json_body=body) == {"v": 1}
+    clock[0] += 2 * 24 * HOUR
+    assert cache.fetch_json(session, url, method="POST", json_body=body) == {"v": 2}
+    assert session.requests[-1][2] == {"If-Modified-Since": "Mon"}
+    assert cache.cache_key(url, body) != cache.cache_key(url, {"identifiers": [{"id": "def"}]})
+    clock[0] += 2 * 24 * HOUR
+    with pytest.raises(RuntimeError):
+        cache.fetch_json(session, url, method="POST", json_body=body)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    # Random hex does not compress much, so every entry has about the same size
+    payloads = [{"data": random.Random(i).randbytes(3000).hex()} for i in range(4)]
+    probe = ResponseCache(str(tmp_path / "probe.sqlite3"))
+    probe.put_json("k", payloads[0])
+    cache = ResponseCache(path, max_bytes=int(probe.size_bytes() * 3.5))
+    probe.close()
+    for i in range(3):
+        cache.put_json(f"k{i}", payloads[i])
+        clock[0] += 1
+    cache.get_json("k0")
+    clock[0] += 1
+    cache.put_json("k3", payloads[3])
+    assert cache.lookup("k1") is None and cache.lookup("k0") is not None
+    assert cache.stats.evictions == 1
+    assert cache.size_bytes() <= cache.max_bytes
+    cache.close()
+    # The size is read back from disk
+    reopened = ResponseCache(path, max_bytes=cache.max_bytes)
+    assert reopened.size_bytes() == cache.size_bytes() and reopened.entry_count() == 3
+    reopened.clear()
+    assert reopened.size_bytes() == 0 and reopened.entry_count() == 0
+    reopened.close()
@@ -0,0 +1,37 @@
+import os
+
+from FoS_DeckPro.utils.image_disk_cache import ImageDiskCache
+
+
+def test_lru_eviction_keeps_recently_used_files(tmp_path):
+    cache = ImageDiskCache(str(tmp_path), max_bytes=300)
+    urls = [f"https://cards.example/{i}.jpg?1" for i in range(3)]
+    for url in urls:
+        cache.put(url, b"x" * 100)
+    assert cache.entry_count() == 3 and cache.size_bytes() == 300
+
+    # Going over the cap evicts least recently used files down to 90% of it; using the
+    # first file moves it to the back of that line
+    assert cache.get(urls[0]) == b"x" * 100
+    cache.put("https://cards.example/new.png", b"y" * 100)
+
+    assert not cache.contains(urls[1]) and not cache.contains(urls[2])
+    assert cache.contains(urls[0]) and cache.contains("https://cards.example/new.png")
+    assert cache.size_bytes() == 200 and cache.stats.evictions == 2
+    assert cache.get(urls[1]) is None
+    assert sorted(os.listdir(tmp_path)) == sorted(cache.file_name(u) for u in
+                                                 [urls[0], "https://cards.example/new.png"])
+
+
+def test_reopened_cache_sees_files_and_drops_deleted_ones(tmp_path):
+    url = "https://cards.example/a.webp"
+    path = ImageDiskCache(str(tmp_path)).put(url, b"image")
+    assert path.endswith(".webp")
+    assert ImageDiskCache.file_name("https://cards.example/a").endswith(".img")
+
+    cache = ImageDiskCache(str(tmp_path))
+    assert cache.size_bytes() == 5 and cache.get(url) == b"image"
+
+    os.remove(path)
+    assert cache.path(url) is None
+    assert cache.entry_count() == 0 and cache.size_bytes() == 0
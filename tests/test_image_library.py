@@ -0,0 +1,28 @@
+import os
+
+from FoS_DeckPro.models.image_library import ImageLibrary
+
+
+def test_add_stores_content_once_and_missing_skips_present_urls(tmp_path):
+    library = ImageLibrary(str(tmp_path / "library"), str(tmp_path / "library.sqlite3"))
+    try:
+        a = "https://cards.example/front/a.JPG?1"
+        b = "https://cards.example/other/b.jpg"
+        c = "https://cards.example/c.png"
+
+        assert library.missing([a, "", b, a, c]) == [a, b, c]
+
+        path = library.add(a, b"same bytes")
+        assert path.endswith(".jpg") and open(path, "rb").read() == b"same bytes"
+        # A second URL for the same image shares the stored object
+        assert library.add(b, b"same bytes") == path
+        assert library.local_path(a) == library.local_path(b) == path
+        assert library.info() == {"urls": 2, "images": 1, "bytes": len(b"same bytes")}
+
+        assert library.missing([c, a, b]) == [c]
+        # A lost object file counts as missing again
+        os.remove(path)
+        assert library.local_path(a) is None
+        assert library.missing([a, b, c]) == [a, b, c]
+    finally:
+        library.close()
@@ -0,0 +1,20 @@
+from FoS_DeckPro.logic.import_pipeline import compile_row_transformer, iter_csv_batches
+
+
+def test_row_transformer_normalizes_types():
+    header = ["Card", "Qty", "Paid", "Price"]
+    transform = compile_row_transformer(header, {"Card": "Name", "Qty": "Quantity", "Paid": "Purchase price",
+                                                 "Price": "Whatnot price "})
+    assert transform(["Bolt", " 3 ", "$1,200.50", "0.0"]) == {
+        "Name": "Bolt", "Quantity": 3, "Purchase price": 1200.5, "Whatnot price": ""}
+    assert transform(["Bolt", "", "n/a"]) == {"Name": "Bolt", "Quantity": "", "Purchase price": "n/a",
+                                              "Whatnot price": ""}
+
+
+def test_csv_batches(tmp_path):
+    path = tmp_path / "cards.csv"
+    path.write_text("﻿Name,Quantity\nA,1\nB,2\n\nC,x\n", encoding="utf-8")
+    batches = list(iter_csv_batches(str(path), {"Name": "Name", "Quantity": "Quantity"}, batch_size=2))
+    cards = [card for batch, _, _ in batches for card in batch]
+    assert cards == [{"Name": "A", "Quantity": 1}, {"Name": "B", "Quantity": 2}, {"Name": "C", "Quantity": "x"}]
+    assert batches[-1][1] == batches[-1][2] == path.stat().st_size
@@ -0,0 +1,73 @@
+from FoS_DeckPro.models.inventory import CardInventory, card_key, visible_fields
+
+
+def _card(**fields):
+    card = {"Name": "Lightning Bolt", "Set code": "M11", "Collector number": "145",
+            "Foil": "normal", "Language": "en", "Condition": "near_mint"}
+    card.update(fields)
+    return card
+
+
+def _inventory(*cards):
+    inventory = CardInventory()
+    inventory.load_cards(list(cards))
+    inventory.build_indexes()
+    return inventory
+
+
+def test_remove_one_of_two_copies_keeps_the_other_indexed():
+    first, second = _card(), _card()
+    inventory = _inventory(first, second)
+    inventory.remove_cards([first])
+    assert inventory.get_all_cards() == [second]
+    assert inventory.find_by_key(card_key(second)) is second
+    # A merge import of the same printing updates the remaining copy instead of appending
+    assert inventory.merge_by_key([_card(**{"Whatnot price": "2"})]) == (0, 1)
+    assert len(inventory.get_all_cards()) == 1
+    assert second["Whatnot price"] == "2"
+
+
+def test_remove_by_identity_keeps_equal_copies():
+    first, second = _card(), _card()
+    inventory = _inventory(first, second)
+    inventory.remove_cards([second])
+    assert len(inventory.get_all_cards()) == 1
+    assert inventory.get_all_cards()[0] is first
+
+
+def test_replace_card_keeps_other_copy_of_old_printing_indexed():
+    first, second = _card(), _card()
+    inventory = _inventory(first, second)
+    key = card_key(first)
+    inventory.replace_card(second, _card(**{"Collector number": "146"}))
+    assert inventory.find_by_key(key) is first
+    assert inventory.find_by_key(card_key(second)) is second
+    assert inventory.merge_by_key([_card()]) == (0, 1)
+    assert len(inventory.get_all_cards()) == 2
+
+
+def test_change_events():
+    changes = []
+    inventory = _inventory(_card())
+    inventory.add_listener(changes.append)
+    card = inventory.get_all_cards()[0]
+    inventory.update_fields([(card, {"Whatnot price": "3"})])
+    inventory.remove_cards([card])
+    assert [(c.kind, c.cards, c.fields) for c in changes] == [
+        ("updated", [card], {"Whatnot price"}),
+        ("removed", [card], None),
+    ]
+
+
+def test_hidden_fields_are_not_visible_and_survive_edits():
+    card = _card(_enrichment={"version": 1, "at": "2026-01-01T00:00:00"})
+    inventory = _inventory(card)
+    assert "_enrichment" in inventory.get_unique_fields()
+    assert "_enrichment" not in inventory.get_visible_fields()
+    assert "_enrichment" not in visible_fields([card])
+    # An editor only returns the visible fields
+    edited = {f: v for f, v in card.items() if not f.startswith("_")}
+    edited["Condition"] = "played"
+    inventory.replace_card(card, edited)
+    assert card["Condition"] == "played"
+    assert card["_enrichment"] == {"version": 1, "at": "2026-01-01T00:00:00"}
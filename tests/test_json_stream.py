@@ -0,0 +1,33 @@
+import io
+import json
+
+import pytest
+
+from FoS_DeckPro.utils.json_stream import JsonArrayReader, iter_json_array
+
+DATA = [
+    {"Name": "Jötun Grunt ✓", "Quantity": 12345, "Purchase price": 1.25e-3, "Foil": None, "tags": ["a, b", "]"]},
+    -7, 3.5, True, False, None, "plain", [], {}, [[1, 2], {"x": "y"}],
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+def test_reads_every_element_across_chunk_boundaries(chunk_size):
+    raw = ("﻿" + json.dumps(DATA, ensure_ascii=False, indent=1)).encode("utf-8")
+    reader = JsonArrayReader(io.BytesIO(raw), chunk_size)
+    assert list(reader) == DATA
+    assert reader.bytes_read == len(raw)
+
+
+def test_empty_list_and_file(tmp_path):
+    path = tmp_path / "cards.json"
+    path.write_text(" [ ] ", encoding="utf-8")
+    assert list(iter_json_array(str(path))) == []
+    path.write_text(json.dumps(DATA), encoding="utf-8")
+    assert list(iter_json_array(str(path), chunk_size=5)) == DATA
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', "", "[1, 2", "[1 2]", '[{"a": 1},', '[{"a": ]'])
+def test_malformed_input_raises(text):
+    with pytest.raises(ValueError):
+        list(JsonArrayReader(io.BytesIO(text.encode("utf-8")), 2))
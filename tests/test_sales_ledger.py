@@ -0,0 +1,26 @@
+from FoS_DeckPro.logic.sales_ledger import SalesLedger, ledger_record
+
+
+def _record(name, date, price="1.00"):
+    return ledger_record({"Name": name, "Set code": "abc", "Price": price, "Quantity": 1},
+                         {"title": "Show", "date": date}, {"username": "buyer"})
+
+
+def test_append_writes_new_files_and_remove_batch_undoes_it(tmp_path):
+    ledger = SalesLedger(str(tmp_path))
+    first = ledger.append([_record("A", "2026-01-05"), _record("B", "2026-02-01")])
+    before = {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+    second = ledger.append([_record("C", "2026-01-20", "2.50"), _record("D", "")])
+
+    # Earlier batches are never rewritten
+    assert all(tmp_path.joinpath(name).stat().st_mtime_ns == mtime for name, mtime in before.items())
+    assert ledger.partitions() == ["2026-01", "2026-02", "undated"]
+    assert sorted(ledger.load()["name"]) == ["A", "B", "C", "D"]
+    assert sorted(ledger.load("2026-01-01", "2026-01-31")["name"]) == ["A", "C"]
+
+    assert ledger.remove_batch(second) == 2
+    assert sorted(ledger.load()["name"]) == ["A", "B"]
+    assert ledger.partitions() == ["2026-01", "2026-02"]
+    assert ledger.remove_batch(first) == 2
+    assert ledger.partitions() == []
+    assert ledger.append([]) is None
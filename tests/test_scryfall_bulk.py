@@ -0,0 +1,84 @@
+import gzip
+import json
+
+import pytest
+
+from FoS_DeckPro.models import scryfall_bulk
+from FoS_DeckPro.models.scryfall_bulk import ScryfallBulkStore, normalize_card_name, open_bulk_store
+
+BOLT_EN = {"object": "card", "id": "aaa-1", "name": "Lightning Bolt", "lang": "en", "released_at": "2010-07-16",
+           "set": "M11", "collector_number": "146", "prices": {"usd": "1.00"}, "unused": "dropped",
+           "image_uris": {"normal": "https://img/bolt.jpg"}}
+BOLT_DE = dict(BOLT_EN, id="aaa-2", lang="de", image_uris={"normal": "https://img/bolt-de.jpg"})
+BOLT_OLD = dict(BOLT_EN, id="aaa-3", set="lea", collector_number="161", released_at="1993-08-05")
+DELVER = {"object": "card", "id": "bbb-1", "name": "Delver of Secrets // Insectile Aberration", "lang": "en",
+          "released_at": "2011-09-30", "set": "isd", "collector_number": "51",
+          "card_faces": [{"name": "Delver of Secrets", "image_uris": {"normal": "https://img/delver.jpg"},
+                          "artist": "dropped"}, {"name": "Insectile Aberration"}]}
+
+
+def _write(path, cards):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(cards, f)
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScryfallBulkStore(str(tmp_path / "bulk.sqlite3"))
+    source = _write(tmp_path / "default-cards.json.gz", [BOLT_EN, BOLT_DE, BOLT_OLD, DELVER,
+                                                         {"object": "set", "id": "x"}, {"name": "no id"}])
+    assert store.import_file(source) == 4
+    yield store
+    store.close()
+
+
+def test_lookups(store):
+    bolt = store.get_by_id(" AAA-1 ")
+    assert bolt["prices"] == {"usd": "1.00"} and "unused" not in bolt and "object" not in bolt
+    assert store.get_by_set_number("M11", "146")["lang"] == "en"
+    assert store.get_by_set_number("m11", "146", lang="de")["id"] == "aaa-2"
+    assert store.get_by_set_number("m11", "999") is None
+    assert [c["id"] for c in store.find_by_name("lightning  BOLT")] == ["aaa-1", "aaa-3", "aaa-2"]
+    assert store.find_by_name("Delver of Secrets")[0]["card_faces"][0] == {
+        "name": "Delver of Secrets", "image_uris": {"normal": "https://img/delver.jpg"}}
+    assert store.lookup({"name": "Insectile Aberration"})["id"] == "bbb-1"
+    assert sorted(store.iter_image_urls()) == ["https://img/bolt.jpg", "https://img/bolt.jpg", "https://img/delver.jpg"]
+    assert store.info()["card_count"] == "4"
+
+
+def test_lookup_many(store):
+    found, not_found = store.lookup_many([{"id": "aaa-1"}, {"id": "aaa-1"}, {"set": "isd", "collector_number": "51"},
+                                          {"id": "missing"}])
+    assert sorted(found) == [("id", "aaa-1"), ("set", "isd", "51")]
+    assert not_found == [{"id": "missing"}]
+
+
+def test_reimport_refreshes_in_place(store, tmp_path):
+    renamed = dict(BOLT_EN, name="Lightning Bolt (Renamed)", prices={"usd": "2.00"})
+    store.import_file(_write(tmp_path / "newer.json", [renamed]))
+    assert store.card_count() == 4
+    assert store.get_by_id("aaa-1")["prices"] == {"usd": "2.00"}
+    assert [c["id"] for c in store.find_by_name("Lightning Bolt")] == ["aaa-3", "aaa-2"]
+    assert store.find_by_name("Lightning Bolt Renamed")[0]["id"] == "aaa-1"
+
+
+def test_cancelled_import_keeps_previous_data(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(scryfall_bulk, "IMPORT_BATCH_SIZE", 1)
+    source = _write(tmp_path / "newer.json", [dict(BOLT_EN, prices={"usd": "9.00"}), DELVER])
+    with pytest.raises(InterruptedError):
+        store.import_file(source, is_cancelled=lambda: True)
+    assert store.get_by_id("aaa-1")["prices"] == {"usd": "1.00"}
+
+
+def test_open_bulk_store(tmp_path):
+    path = str(tmp_path / "bulk.sqlite3")
+    assert open_bulk_store(path) is None
+    assert not (tmp_path / "bulk.sqlite3").exists()
+    ScryfallBulkStore(path).close()
+    assert open_bulk_store(path) is None
+
+
+def test_normalize_card_name():
+    assert normalize_card_name("Jace, the  Mind-Sculptor") == "jace the mind sculptor"
@@ -0,0 +1,114 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from FoS_DeckPro.models.scryfall_api import (
+    COLLECTION_BATCH_SIZE, fetch_scryfall_collection, identifier_key, iter_scryfall_collection)
+from FoS_DeckPro.models.scryfall_client import ScryfallClient
+from FoS_DeckPro.utils.http_cache import ResponseCache
+
+
+class StubScryfall(BaseHTTPRequestHandler):
+    """/cards/collection stand-in: set 'zzz' does not exist; the first `throttle` requests get a 429."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        identifiers = body["identifiers"]
+        server.requests.append(identifiers)
+        if server.throttle:
+            server.throttle -= 1
+            self._reply(429, {"object": "error"}, {"Retry-After": "0"})
+            return
+        data, not_found = [], []
+        for ident in identifiers:
+            if ident.get("set") == "zzz":
+                not_found.append(ident)
+            elif "id" in ident:
+                data.append({"object": "card", "id": ident["id"], "set": "tst", "collector_number": ident["id"][-3:]})
+            else:
+                data.append({"object": "card", "id": f"id-{ident['set']}-{ident['collector_number']}",
+                             "set": ident["set"], "collector_number": ident["collector_number"]})
+        self._reply(200, {"object": "list", "data": data, "not_found": not_found})
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubScryfall)
+    server.requests = []
+    server.throttle = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub, tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    client = ScryfallClient(base_url=f"http://127.0.0.1:{stub.server_address[1]}", rate=1000, burst=1000,
+                            cache=cache)
+    yield client
+    client.close()
+    cache.close()
+
+
+def _identifiers(count):
+    return [{"set": "tst", "collector_number": str(n)} for n in range(count)]
+
+
+def test_batches_of_75(stub, client):
+    identifiers = _identifiers(160)
+    batches = list(iter_scryfall_collection(identifiers, client))
+    assert [len(request) for request in stub.requests] == [COLLECTION_BATCH_SIZE, COLLECTION_BATCH_SIZE, 10]
+    assert [done for _, _, done, _ in batches] == [75, 150, 160]
+    assert all(total == 160 for _, _, _, total in batches)
+
+
+def test_repeated_printings_are_requested_once(stub, client):
+    identifiers = _identifiers(10)
+    repeats = identifiers + [dict(ident) for ident in identifiers] + [{"set": "TST", "collector_number": "3"}]
+    found, not_found = fetch_scryfall_collection(repeats, client=client)
+    assert len(stub.requests) == 1
+    assert len(stub.requests[0]) == 10
+    assert not not_found
+    assert all(identifier_key(ident) in found for ident in repeats)
+
+
+def test_cached_printings_are_not_requested_again(stub, client):
+    fetch_scryfall_collection(_identifiers(5), client=client)
+    found, _ = fetch_scryfall_collection(_identifiers(7), client=client)
+    assert [len(request) for request in stub.requests] == [5, 2]
+    assert all(identifier_key(ident) in found for ident in _identifiers(7))
+
+
+def test_not_found(stub, client):
+    missing = {"set": "zzz", "collector_number": "1"}
+    found, not_found = fetch_scryfall_collection(_identifiers(3) + [missing], client=client)
+    assert not_found == [missing]
+    assert identifier_key(missing) not in found
+    assert all(identifier_key(ident) in found for ident in _identifiers(3))
+
+
+def test_429_is_retried(stub, client):
+    stub.throttle = 2
+    found, not_found = fetch_scryfall_collection(_identifiers(4), client=client)
+    assert len(stub.requests) == 3
+    assert all(identifier_key(ident) in found for ident in _identifiers(4))
+    assert not not_found
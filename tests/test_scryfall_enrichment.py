@@ -0,0 +1,72 @@
+import datetime
+
+from FoS_DeckPro.logic.scryfall_enrichment import (
+    ENRICHMENT_META_FIELD, ENRICHMENT_VERSION, ORACLE_FIELDS, PRICE_FIELDS, SCOPE_FULL, SCOPE_PRICES,
+    SOURCE_BULK, enrichment_fields, plan_enrichment, refresh_scope)
+
+NOW = datetime.datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _enriched(at, prices_at, **card):
+    card.update({field: "" for field in ORACLE_FIELDS + PRICE_FIELDS})
+    card[ENRICHMENT_META_FIELD] = {"version": ENRICHMENT_VERSION, "at": at.isoformat(),
+                                   "prices_at": prices_at.isoformat()}
+    return card
+
+
+def test_refresh_scope_follows_metadata_age_and_version():
+    fresh = _enriched(NOW - datetime.timedelta(days=1), NOW - datetime.timedelta(hours=1))
+    assert refresh_scope(fresh, NOW) is None
+    assert refresh_scope({}, NOW) == SCOPE_FULL
+    assert refresh_scope(dict(fresh, **{ENRICHMENT_META_FIELD: {**fresh[ENRICHMENT_META_FIELD], "version": 0}}),
+                         NOW) == SCOPE_FULL
+    assert refresh_scope(_enriched(NOW - datetime.timedelta(days=31), NOW), NOW) == SCOPE_FULL
+    assert refresh_scope({k: v for k, v in fresh.items() if k != "oracle_text"}, NOW) == SCOPE_FULL
+    assert refresh_scope(_enriched(NOW, NOW - datetime.timedelta(hours=21)), NOW) == SCOPE_PRICES
+    assert refresh_scope({k: v for k, v in fresh.items() if k != "usd"}, NOW) == SCOPE_PRICES
+
+
+def test_plan_enrichment_groups_by_printing_and_full_wins():
+    stale_prices = _enriched(NOW, NOW - datetime.timedelta(days=2), **{"Scryfall ID": "ABC"})
+    new_copy = {"Scryfall ID": "abc"}
+    by_number = _enriched(NOW, NOW - datetime.timedelta(days=2), **{"Set code": "NEO", "Collector number": "12"})
+    fresh = _enriched(NOW, NOW, **{"Scryfall ID": "def"})
+    unidentifiable = {"Name": "Mystery"}
+
+    groups, scopes = plan_enrichment([stale_prices, new_copy, by_number, fresh, unidentifiable], now=NOW)
+
+    assert set(groups) == {("id", "abc"), ("set", "neo", "12")}
+    identifier, cards = groups[("id", "abc")]
+    assert identifier == {"id": "ABC"}
+    assert cards == [stale_prices, new_copy]
+    assert groups[("set", "neo", "12")] == ({"set": "NEO", "collector_number": "12"}, [by_number])
+    assert scopes == {("id", "abc"): SCOPE_FULL, ("set", "neo", "12"): SCOPE_PRICES}
+
+    groups, scopes = plan_enrichment([fresh, unidentifiable], force=True, now=NOW)
+    assert list(groups) == [("id", "def")]
+    assert scopes == {("id", "def"): SCOPE_FULL}
+
+
+def test_enrichment_fields_limits_price_refresh_and_records_metadata():
+    data = {"id": "abc", "type_line": "Creature", "prices": {"usd": "1.50"},
+            "purchase_uris": {"tcgplayer": "https://tcg"}}
+    card = {"Name": "Bear", ENRICHMENT_META_FIELD: {"version": ENRICHMENT_VERSION, "at": "2026-02-01T00:00:00"}}
+
+    fields = enrichment_fields(card, data, SCOPE_PRICES, SOURCE_BULK, "2026-02-28T00:00:00", "v1")
+    meta = fields.pop(ENRICHMENT_META_FIELD)
+    assert set(fields) == set(PRICE_FIELDS) | {"Scryfall ID"}
+    assert fields["usd"] == "1.50" and fields["tcgplayer_url"] == "https://tcg"
+    assert fields["Scryfall ID"] == "abc"
+    assert meta["at"] == "2026-02-01T00:00:00"
+    assert meta["prices_at"] == "2026-02-28T00:00:00"
+    assert (meta["source"], meta["source_version"]) == (SOURCE_BULK, "v1")
+    assert meta["fields"] == sorted(PRICE_FIELDS)
+    # The card itself is left alone
+    assert card[ENRICHMENT_META_FIELD] == {"version": ENRICHMENT_VERSION, "at": "2026-02-01T00:00:00"}
+
+    fields = enrichment_fields(dict(card, **{"Scryfall ID": "abc"}), data, SCOPE_FULL, SOURCE_BULK, "2026-02-28")
+    meta = fields.pop(ENRICHMENT_META_FIELD)
+    assert "Scryfall ID" not in fields
+    assert fields["type_line"] == "Creature"
+    assert set(ORACLE_FIELDS) <= set(fields)
+    assert meta["version"] == ENRICHMENT_VERSION and meta["at"] != "2026-02-01T00:00:00"
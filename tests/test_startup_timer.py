@@ -0,0 +1,32 @@
+import json
+
+from FoS_DeckPro.utils import config
+from FoS_DeckPro.utils.startup_timer import StartupTimer
+
+
+def test_report_is_opt_in(tmp_path, capsys):
+    path = tmp_path / "timings.jsonl"
+    timer = StartupTimer()
+    timer.mark("window_constructed")
+    timer.write_report(path=str(path), enabled=False)
+    assert not path.exists()
+    assert capsys.readouterr().out == ""
+
+    timer.restart()
+    timer.mark("window_constructed")
+    timer.write_report(path=str(path), enabled=True, cards=3)
+    assert "STARTUP TIMINGS" in capsys.readouterr().out
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    assert entry["cards"] == 3 and "window_constructed" in entry["phases"]
+
+
+def test_timings_file_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "STARTUP_TIMINGS_MAX_BYTES", 2000)
+    path = tmp_path / "timings.jsonl"
+    for _ in range(100):
+        timer = StartupTimer()
+        timer.mark("window_constructed")
+        timer.write_report(path=str(path), enabled=True)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert path.stat().st_size <= 2000 + len(lines[-1]) + 1
+    assert all(json.loads(line) for line in lines)
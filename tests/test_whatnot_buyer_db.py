@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from FoS_DeckPro.logic import whatnot_buyer_db
+from FoS_DeckPro.logic.whatnot_buyer_db import WhatnotBuyerDB
+
+LEGACY = {
+    "alice99": {"name": "Alice", "username": "alice99", "address": "",
+                "purchases": [{"show": {"title": "Friday", "date": "2026-01-02"},
+                               "sale": {"Name": "Bolt", "Quantity": "2", "Price": "$1.50"}},
+                              {"show": {"title": "Friday", "date": "2026-01-02"},
+                               "sale": {"Name": "Bad", "Quantity": "lots", "Price": "1"}},
+                              "not a purchase"]},
+    "Bob Smith": {"name": "", "username": "", "address": "",
+                  "purchases": [{"show": {"title": "Friday", "date": "2026-01-02"},
+                                 "sale": {"Name": "Bolt", "Quantity": 1, "Price": 3}}]},
+    "broken": ["not", "a", "buyer"],
+}
+
+
+@pytest.fixture
+def legacy_json(tmp_path):
+    path = tmp_path / "buyers.json"
+    path.write_text(json.dumps(LEGACY), encoding="utf-8")
+    return str(path)
+
+
+def _open(tmp_path, legacy_json):
+    return WhatnotBuyerDB(str(tmp_path / "buyers.sqlite3"), legacy_json)
+
+
+def test_legacy_import_skips_bad_records_and_runs_once(tmp_path, legacy_json, capsys):
+    db = _open(tmp_path, legacy_json)
+    alice = db.get_buyer("alice99")
+    assert (alice["name"], alice["total_cards"], alice["total_spent"]) == ("Alice", 2, 3.0)
+    # Buyers without a username were keyed by their name, which is not a username
+    bob = db.get_buyer("Bob Smith")
+    assert (bob["name"], bob["username"]) == ("Bob Smith", "")
+    assert len(db.get_all_buyers()) == 2
+    assert capsys.readouterr().out.count("WARNING") == 3
+    db.close()
+    db = _open(tmp_path, legacy_json)
+    assert db.get_buyer("alice99")["total_cards"] == 2
+    db.close()
+
+
+def test_failed_legacy_import_is_retried(tmp_path, legacy_json, monkeypatch):
+    def fail(self, purchases):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(WhatnotBuyerDB, "_insert_purchases", fail)
+    with pytest.raises(RuntimeError):
+        _open(tmp_path, legacy_json)
+    monkeypatch.undo()
+    db = _open(tmp_path, legacy_json)
+    assert db.get_buyer("alice99")["total_cards"] == 2
+    db.close()
+
+
+def test_database_from_before_the_meta_table_is_not_reimported(tmp_path, legacy_json):
+    db = WhatnotBuyerDB(str(tmp_path / "buyers.sqlite3"), None)
+    db.add_purchase({"name": "Alice", "username": "alice99", "address": ""},
+                    {"Name": "Bolt", "Quantity": 1, "Price": 1}, {"title": "Friday", "date": "2026-01-02"})
+    db.close()
+    db = _open(tmp_path, legacy_json)
+    assert db.get_buyer("alice99")["total_cards"] == 1
+    assert db._get_meta(whatnot_buyer_db._LEGACY_IMPORTED) == legacy_json
+    db.close()
+
+
+def _snapshot(db):
+    return {table: sorted(tuple(row) for row in db.conn.execute(f"SELECT * FROM {table}"))
+            for table in ("buyers", "show_stats", "show_buyers", "card_stats", "card_buyers")}
+
+
+def test_remove_batch_rolls_the_aggregates_back(tmp_path):
+    db = WhatnotBuyerDB(str(tmp_path / "buyers.sqlite3"), None)
+    alice = {"name": "Alice", "username": "alice99", "address": ""}
+    bob = {"name": "Bob", "username": "bob", "address": ""}
+    friday = {"title": "Friday", "date": "2026-01-02"}
+    saturday = {"title": "Saturday", "date": "2026-01-03"}
+    db.bulk_add_purchases([(alice, {"Name": "Bolt", "Quantity": 1, "Price": 2}, friday)], batch="first")
+    before = _snapshot(db)
+    db.bulk_add_purchases([(alice, {"Name": "Bolt", "Quantity": "2", "Price": "1.5"}, saturday),
+                           (bob, {"Name": "Bolt", "Quantity": 1, "Price": 1}, saturday),
+                           (bob, {"Name": "Opt", "Quantity": 1, "Price": 1}, friday)], batch="second")
+    assert db.get_card_stats("Bolt")["repeat_buyers"] == 1
+    assert db.get_buyer("alice99")["shows"] == 2
+
+    assert db.remove_batch("second") == 3
+    assert _snapshot(db) == before
+    db.rebuild_aggregates()
+    assert _snapshot(db) == before
+    assert db.remove_batch("second") == 0
+    db.close()
+
+
+def test_aggregates_match_a_rebuild_from_purchase_history(tmp_path):
+    db = WhatnotBuyerDB(str(tmp_path / "buyers.sqlite3"), None)
+    alice = {"name": "Alice", "username": "alice99", "address": ""}
+    bob = {"name": "Bob", "username": "", "address": ""}
+    friday = {"title": "Friday", "date": "2026-01-02"}
+    saturday = {"title": "Saturday", "date": "2026-01-03"}
+    db.bulk_add_purchases([(alice, {"Name": "Bolt", "Quantity": 2, "Price": "1.50"}, friday),
+                           (bob, {"Name": "Bolt", "Quantity": 1, "Price": 4}, friday)])
+    db.add_purchase(alice, {"Name": "Bolt", "Quantity": 1, "Price": 1}, saturday)
+    db.add_purchase(alice, {"Name": "Opt", "Quantity": 3, "Price": 0.25}, saturday)
+
+    assert db.get_show_stats("Friday", "2026-01-02") == {
+        "show_title": "Friday", "show_date": "2026-01-02", "revenue": 7.0, "units": 3, "sales": 2, "buyers": 2}
+    assert [s["show_title"] for s in db.get_shows_by_date("2026-01-01", "2026-01-02")] == ["Friday"]
+    assert [s["show_title"] for s in db.get_top_shows(1)] == ["Friday"]
+    bolt = db.get_card_stats("Bolt")
+    assert (bolt["units"], bolt["sales"], bolt["buyers"], bolt["repeat_buyers"]) == (4, 3, 2, 1)
+    assert bolt["repeat_buyer_rate"] == 0.5
+    assert [c["card_name"] for c in db.get_top_cards(2, by="revenue")] == ["Bolt", "Opt"]
+    assert db.get_repeat_buyer_rate() == 0.5
+    report = db.report(top_n=1)
+    assert (report["buyers"], report["revenue"], report["units"]) == (2, 8.75, 7)
+    assert report["top_buyers"][0]["username"] == "alice99"
+
+    maintained = _snapshot(db)
+    db.rebuild_aggregates()
+    assert _snapshot(db) == maintained
+    # The triggers dropped while rebuilding are back
+    db.add_purchase(bob, {"Name": "Opt", "Quantity": 1, "Price": 1}, saturday)
+    assert db.get_card_stats("Opt")["buyers"] == 2
+    assert db.get_buyer("Bob")["shows"] == 2
+    db.close()
+
+
+def test_get_top_cards_rejects_unknown_ordering(tmp_path):
+    db = WhatnotBuyerDB(str(tmp_path / "buyers.sqlite3"), None)
+    with pytest.raises(ValueError):
+        db.get_top_cards(by="units; DROP TABLE buyers")
+    db.close()
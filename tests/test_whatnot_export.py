@@ -0,0 +1,62 @@
+from FoS_DeckPro.logic import whatnot_export
+from FoS_DeckPro.logic.whatnot_export import (WHATNOT_DEFAULT_COLUMNS, WHATNOT_DEFAULT_VALUES, WhatnotExportState,
+                                              WhatnotRowBuilder, compute_delta, export_whatnot)
+
+
+def _builder():
+    return WhatnotRowBuilder(WHATNOT_DEFAULT_COLUMNS, WHATNOT_DEFAULT_VALUES, ["Name"], ["Set code"])
+
+
+def _card(name, price="2"):
+    return {"Name": name, "Set code": "M11", "Collector number": "1", "Quantity": 1, "Whatnot price": price}
+
+
+def test_fingerprint_memo_ignores_a_reused_card_id():
+    builder = _builder()
+    card = _card("Bolt")
+    [(_, digest)] = builder.fingerprints([card])
+    # A memo entry for the same id left by another card with identical values
+    other = dict(card)
+    values = tuple(map(card.get, builder._memo_fields))
+    whatnot_export._fingerprint_memo = (builder.signature, {id(card): (other, values, "stale", "stale")})
+    assert builder.fingerprints([card]) == [("bolt|m11|1", digest)]
+
+
+def test_compute_delta():
+    builder = _builder()
+    kept, edited, gone = _card("Kept"), _card("Edited"), _card("Gone")
+    previous = {listing_id: {"hash": digest, "title": "", "price": "2"}
+                for listing_id, digest in builder.fingerprints([kept, edited, gone])}
+    edited["Whatnot price"] = "3"
+    added = _card("Added")
+    delta = compute_delta([kept, edited, added], builder, previous)
+    assert [card for _, _, card in delta.new] == [added]
+    assert [card for _, _, card in delta.changed] == [edited]
+    assert delta.price_changed == 1
+    assert list(delta.unchanged) == ["kept|m11|1"]
+    assert [listing_id for listing_id, _ in delta.removed] == ["gone|m11|1"]
+
+
+def test_repeated_printings_get_separate_listings():
+    ids = [listing_id for listing_id, _ in _builder().fingerprints([_card("Bolt"), _card("Bolt")])]
+    assert ids == ["bolt|m11|1", "bolt|m11|1#2"]
+
+
+def test_export_state_round_trip_and_delta_export(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    out = str(tmp_path / "whatnot.csv")
+    builder = _builder()
+    cards = [_card("A"), _card("B")]
+    state = WhatnotExportState(state_path)
+    assert not state.matches(builder)
+    # Without a previous export a delta export falls back to a full one
+    assert export_whatnot(out, cards, builder, state=state).full
+
+    state = WhatnotExportState(state_path)
+    assert state.matches(builder) and set(state.listings) == {"a|m11|1", "b|m11|1"}
+    assert not state.matches(WhatnotRowBuilder(WHATNOT_DEFAULT_COLUMNS, WHATNOT_DEFAULT_VALUES, ["Name"], []))
+    cards[1]["Quantity"] = 4
+    result = export_whatnot(out, cards + [_card("C")], builder, state=state)
+    assert (result.full, result.new, result.changed, result.unchanged) == (False, 1, 1, 1)
+    assert (tmp_path / "whatnot_new.csv").exists() and (tmp_path / "whatnot_changed.csv").exists()
+    assert not (tmp_path / "whatnot_removed.csv").exists()